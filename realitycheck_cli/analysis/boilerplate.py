@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+import random
+import threading
+
+from realitycheck_cli.analysis.schemas import Clause, ClauseAnalysis
+from realitycheck_cli.clauses.normalizer import normalize_clause_text
+
+_NUM_PERMUTATIONS = 64
+_BANDS = 16
+_ROWS_PER_BAND = _NUM_PERMUTATIONS // _BANDS
+_SHINGLE_WORDS = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+_HASH_MASK = (1 << 32) - 1
+_REGISTRY_VERSION = 1
+
+_rng = random.Random(20240611)
+_PERMUTATIONS: tuple[tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(_NUM_PERMUTATIONS)
+)
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _shingles(normalized: str) -> set[str]:
+    words = normalized.split()
+    if len(words) <= _SHINGLE_WORDS:
+        return {normalized}
+    return {
+        " ".join(words[idx : idx + _SHINGLE_WORDS])
+        for idx in range(len(words) - _SHINGLE_WORDS + 1)
+    }
+
+
+def minhash_signature(normalized: str) -> tuple[int, ...]:
+    hashes = [_stable_hash(shingle) & _HASH_MASK for shingle in _shingles(normalized)]
+    return tuple(
+        min(((a * value + b) % _MERSENNE_PRIME) & _HASH_MASK for value in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    equal = sum(1 for a, b in zip(left, right) if a == b)
+    return equal / _NUM_PERMUTATIONS
+
+
+def _band_keys(signature: tuple[int, ...]) -> list[tuple[int, int]]:
+    return [
+        (band, hash(signature[band * _ROWS_PER_BAND : (band + 1) * _ROWS_PER_BAND]))
+        for band in range(_BANDS)
+    ]
+
+
+@dataclass
+class _Cluster:
+    exact_hash: str
+    signature: tuple[int, ...]
+    enriched: bool
+    analysis: ClauseAnalysis
+    members: int = 1
+
+
+@dataclass
+class BoilerplateStats:
+    clusters: int = 0
+    members: int = 0
+    lookups: int = 0
+    exact_hits: int = 0
+    near_hits: int = 0
+    llm_calls_saved: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.near_hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class BoilerplateRegistry:
+    def __init__(self, threshold: float = 0.9, rules_version: str | None = None) -> None:
+        self.threshold = threshold
+        self.rules_version = rules_version
+        self._clusters: list[_Cluster] = []
+        self._exact: dict[tuple[str, bool], int] = {}
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self._lookups = 0
+        self._exact_hits = 0
+        self._near_hits = 0
+        self._llm_calls_saved = 0
+        self._last_keys: tuple[str, str, tuple[int, ...]] | None = None
+        # Lookups and registrations may come from several analyzer threads.
+        self._lock = threading.Lock()
+
+    def _keys(self, text: str) -> tuple[str, tuple[int, ...]]:
+        if self._last_keys is not None and self._last_keys[0] == text:
+            return self._last_keys[1], self._last_keys[2]
+        normalized = normalize_clause_text(text)
+        exact_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        signature = minhash_signature(normalized)
+        self._last_keys = (text, exact_hash, signature)
+        return exact_hash, signature
+
+    def _add_cluster(self, cluster: _Cluster) -> None:
+        index = len(self._clusters)
+        self._clusters.append(cluster)
+        self._exact.setdefault((cluster.exact_hash, cluster.enriched), index)
+        for key in _band_keys(cluster.signature):
+            self._buckets.setdefault(key, []).append(index)
+
+    def lookup(self, clause: Clause, enriched: bool) -> ClauseAnalysis | None:
+        with self._lock:
+            return self._lookup(clause, enriched)
+
+    def _lookup(self, clause: Clause, enriched: bool) -> ClauseAnalysis | None:
+        self._lookups += 1
+        exact_hash, signature = self._keys(clause.text)
+        index = self._exact.get((exact_hash, enriched))
+        if index is not None:
+            self._exact_hits += 1
+        else:
+            index = self._nearest(signature, enriched)
+            if index is None:
+                return None
+            self._near_hits += 1
+        cluster = self._clusters[index]
+        cluster.members += 1
+        if enriched:
+            self._llm_calls_saved += 1
+        return cluster.analysis
+
+    def _nearest(self, signature: tuple[int, ...], enriched: bool) -> int | None:
+        candidates = {
+            index
+            for key in _band_keys(signature)
+            for index in self._buckets.get(key, ())
+            if self._clusters[index].enriched == enriched
+        }
+        best_index = None
+        best_score = 0.0
+        for index in sorted(candidates):
+            score = estimate_similarity(signature, self._clusters[index].signature)
+            if score > best_score:
+                best_score = score
+                best_index = index
+        if best_index is None or best_score < self.threshold:
+            return None
+        return best_index
+
+    def register(self, clause: Clause, analysis: ClauseAnalysis, enriched: bool) -> None:
+        with self._lock:
+            exact_hash, signature = self._keys(clause.text)
+            self._add_cluster(
+                _Cluster(
+                    exact_hash=exact_hash,
+                    signature=signature,
+                    enriched=enriched,
+                    analysis=analysis,
+                )
+            )
+
+    def enriched_analyses(self) -> list[ClauseAnalysis]:
+        return [cluster.analysis for cluster in self._clusters if cluster.enriched]
+
+    def stats(self) -> BoilerplateStats:
+        return BoilerplateStats(
+            clusters=len(self._clusters),
+            members=sum(cluster.members for cluster in self._clusters),
+            lookups=self._lookups,
+            exact_hits=self._exact_hits,
+            near_hits=self._near_hits,
+            llm_calls_saved=self._llm_calls_saved,
+        )
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": _REGISTRY_VERSION,
+            "threshold": self.threshold,
+            "rules_version": self.rules_version,
+            "clusters": [
+                {
+                    "exact_hash": cluster.exact_hash,
+                    "signature": list(cluster.signature),
+                    "enriched": cluster.enriched,
+                    "members": cluster.members,
+                    "analysis": cluster.analysis.model_dump(mode="json"),
+                }
+                for cluster in self._clusters
+            ],
+        }
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: Path, threshold: float | None = None) -> "BoilerplateRegistry":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != _REGISTRY_VERSION:
+            raise ValueError(f"Unsupported boilerplate registry version in {path}.")
+        registry = cls(
+            threshold=threshold or float(payload.get("threshold", 0.9)),
+            rules_version=payload.get("rules_version"),
+        )
+        for raw in payload.get("clusters", []):
+            registry._add_cluster(
+                _Cluster(
+                    exact_hash=raw["exact_hash"],
+                    signature=tuple(raw["signature"]),
+                    enriched=bool(raw["enriched"]),
+                    analysis=ClauseAnalysis.model_validate(raw["analysis"]),
+                    members=int(raw.get("members", 1)),
+                )
+            )
+        return registry
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+import random
+import tempfile
+import time
+import zlib
+
+from realitycheck_cli.analysis.heuristics import detect_category
+from realitycheck_cli.analysis.schemas import ClauseAnalysis, ClauseCategory
+from realitycheck_cli.clauses.normalizer import canonical_title, normalize_clause_text
+
+_MODEL_FORMAT = 1
+_DEFAULT_FEATURES = 1 << 18
+_WEIGHT_DIGITS = 5
+
+DEFAULT_CATEGORY_MODEL_PATH = Path("artifacts") / "category-model.json"
+
+
+@dataclass(frozen=True)
+class LabelledClause:
+    title: str
+    text: str
+    category: ClauseCategory
+
+
+def _hashed_features(title: str, text: str, n_features: int) -> dict[int, float]:
+    # Title words, text words and text bigrams, hashed into a fixed space and
+    # L2-normalised; crc32 keeps the hashing stable across processes.
+    words = normalize_clause_text(text).split()
+    tokens = [f"t:{word}" for word in canonical_title(title).split()]
+    tokens += words
+    tokens += [f"{first} {second}" for first, second in zip(words, words[1:])]
+    features: dict[int, float] = {}
+    for token in tokens:
+        index = zlib.crc32(token.encode("utf-8")) % n_features
+        features[index] = 1.0
+    if not features:
+        return {}
+    scale = 1 / math.sqrt(len(features))
+    return {index: scale for index in features}
+
+
+def _softmax(logits: list[float]) -> list[float]:
+    peak = max(logits)
+    exps = [math.exp(value - peak) for value in logits]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class CategoryModel:
+    def __init__(
+        self,
+        classes: Sequence[ClauseCategory],
+        n_features: int = _DEFAULT_FEATURES,
+        bias: Sequence[float] | None = None,
+        weights: dict[int, list[float]] | None = None,
+    ) -> None:
+        self.classes = tuple(classes)
+        self.n_features = n_features
+        self.bias = list(bias) if bias is not None else [0.0] * len(self.classes)
+        # Sparse rows: only hashed features seen in training carry weights.
+        self.weights: dict[int, list[float]] = weights or {}
+        self._version: str | None = None
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            payload = json.dumps(self._payload(), sort_keys=True).encode("utf-8")
+            self._version = "category-model+" + hashlib.sha256(payload).hexdigest()[:12]
+        return self._version
+
+    def _logits(self, features: dict[int, float]) -> list[float]:
+        logits = list(self.bias)
+        for index, value in features.items():
+            row = self.weights.get(index)
+            if row is None:
+                continue
+            for label, weight in enumerate(row):
+                logits[label] += weight * value
+        return logits
+
+    def predict_batch(
+        self, documents: Sequence[tuple[str, str]]
+    ) -> list[tuple[ClauseCategory, float]]:
+        # Hash every clause first, then score each sparse feature row against
+        # the weights in turn; only the nonzero features are visited.
+        matrix = [_hashed_features(title, text, self.n_features) for title, text in documents]
+        predictions: list[tuple[ClauseCategory, float]] = []
+        for features in matrix:
+            probabilities = _softmax(self._logits(features))
+            best = max(range(len(probabilities)), key=probabilities.__getitem__)
+            predictions.append((self.classes[best], probabilities[best]))
+        return predictions
+
+    def _payload(self) -> dict[str, object]:
+        return {
+            "format": _MODEL_FORMAT,
+            "n_features": self.n_features,
+            "classes": [category.value for category in self.classes],
+            "bias": [round(value, _WEIGHT_DIGITS) for value in self.bias],
+            "weights": {
+                str(index): [round(value, _WEIGHT_DIGITS) for value in row]
+                for index, row in sorted(self.weights.items())
+            },
+        }
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+        )
+        with handle:
+            json.dump(self._payload(), handle, separators=(",", ":"))
+        os.chmod(handle.name, 0o644)
+        os.replace(handle.name, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "CategoryModel":
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise ValueError(f"Cannot read category model {path}: {exc}") from exc
+        if payload.get("format") != _MODEL_FORMAT:
+            raise ValueError(f"Unsupported category model format in {path}.")
+        return cls(
+            classes=[ClauseCategory(value) for value in payload["classes"]],
+            n_features=int(payload["n_features"]),
+            bias=[float(value) for value in payload["bias"]],
+            weights={
+                int(index): [float(value) for value in row]
+                for index, row in payload["weights"].items()
+            },
+        )
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int) -> CategoryModel:
+    return CategoryModel.load(Path(path))
+
+
+def load_category_model(path: Path) -> CategoryModel:
+    # Cached per file version so batch runs load the model once per process.
+    if not path.exists():
+        raise ValueError(f"Category model not found: {path}")
+    return _load_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+
+def train_category_model(
+    samples: Sequence[LabelledClause],
+    epochs: int = 12,
+    learning_rate: float = 2.0,
+    l2: float = 1e-5,
+    n_features: int = _DEFAULT_FEATURES,
+    seed: int = 13,
+) -> CategoryModel:
+    if not samples:
+        raise ValueError("No labelled clauses to train the category model on.")
+    classes = sorted({sample.category for sample in samples}, key=list(ClauseCategory).index)
+    label_of = {category: idx for idx, category in enumerate(classes)}
+    model = CategoryModel(classes, n_features=n_features)
+    data = [
+        (_hashed_features(sample.title, sample.text, n_features), label_of[sample.category])
+        for sample in samples
+    ]
+    rng = random.Random(seed)
+    step = 0
+    for _ in range(epochs):
+        rng.shuffle(data)
+        for features, label in data:
+            step += 1
+            rate = learning_rate / math.sqrt(step)
+            probabilities = _softmax(model._logits(features))
+            gradient = [
+                probability - (1.0 if idx == label else 0.0)
+                for idx, probability in enumerate(probabilities)
+            ]
+            for idx, value in enumerate(gradient):
+                model.bias[idx] -= rate * value
+            # Plain SGD with L2 shrinkage applied only to the active rows keeps
+            # every update proportional to the clause length.
+            for index, value in features.items():
+                row = model.weights.setdefault(index, [0.0] * len(classes))
+                for idx, grad in enumerate(gradient):
+                    row[idx] -= rate * (grad * value + l2 * row[idx])
+    return model
+
+
+def agreement(predicted: Sequence[ClauseCategory], expected: Sequence[ClauseCategory]) -> float:
+    if not expected:
+        return 0.0
+    return sum(a == b for a, b in zip(predicted, expected)) / len(expected)
+
+
+def labelled_from_analyses(analyses: Sequence[ClauseAnalysis]) -> list[LabelledClause]:
+    # Only clauses the LLM actually classified carry its label; fallbacks,
+    # budget skips and analyses that do not record a source are heuristic.
+    return [
+        LabelledClause(analysis.title, analysis.text, analysis.category)
+        for analysis in analyses
+        if analysis.source == "llm"
+    ]
+
+
+def split_holdout(
+    samples: Sequence[LabelledClause], fraction: float
+) -> tuple[list[LabelledClause], list[LabelledClause]]:
+    # Split by a hash of the clause so the same clause always lands on the
+    # same side, whatever order the sources were read in.
+    train: list[LabelledClause] = []
+    holdout: list[LabelledClause] = []
+    for sample in samples:
+        digest = hashlib.sha256(normalize_clause_text(sample.text).encode("utf-8")).digest()
+        bucket = int.from_bytes(digest[:4], "big") / (1 << 32)
+        (holdout if bucket < fraction else train).append(sample)
+    return train, holdout
+
+
+@dataclass(frozen=True)
+class CategoryModelEvaluation:
+    train_size: int
+    holdout_size: int
+    heuristic_agreement: float
+    model_agreement: float
+    heuristic_clauses_per_second: float
+    model_clauses_per_second: float
+
+
+def evaluate_category_model(
+    model: CategoryModel,
+    train_size: int,
+    holdout: Sequence[LabelledClause],
+) -> CategoryModelEvaluation:
+    expected = [sample.category for sample in holdout]
+
+    started = time.perf_counter()
+    heuristic = [detect_category(sample.text)[0] for sample in holdout]
+    heuristic_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    learned = [
+        category
+        for category, _ in model.predict_batch([(sample.title, sample.text) for sample in holdout])
+    ]
+    model_seconds = time.perf_counter() - started
+
+    def rate(seconds: float) -> float:
+        return len(holdout) / seconds if seconds > 0 else 0.0
+
+    return CategoryModelEvaluation(
+        train_size=train_size,
+        holdout_size=len(holdout),
+        heuristic_agreement=agreement(heuristic, expected),
+        model_agreement=agreement(learned, expected),
+        heuristic_clauses_per_second=rate(heuristic_seconds),
+        model_clauses_per_second=rate(model_seconds),
+    )
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
 
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.category_model import CategoryModel
 from realitycheck_cli.analysis.heuristics import (
     detect_benefits_party,
     detect_category,
@@ -10,7 +16,13 @@ from realitycheck_cli.analysis.heuristics import (
     estimate_risk_score,
     risk_level_from_score,
 )
-from realitycheck_cli.analysis.llm_client import LLMClient
+from realitycheck_cli.analysis.llm_client import (
+    LLMBudgetExhaustedError,
+    LLMClient,
+    LLMMalformedReplyError,
+)
+from realitycheck_cli.analysis.llm_transport import LLMUnavailableError
+from realitycheck_cli.analysis.rules import RuleSet
 from realitycheck_cli.analysis.schemas import (
     Clause,
     ClauseAnalysis,
@@ -20,7 +32,17 @@ from realitycheck_cli.analysis.schemas import (
     SignalType,
     Severity,
     BenefitsParty,
+    ClauseTerm,
+    LLMUsage,
+)
+from realitycheck_cli.analysis.terms import extract_terms
+from realitycheck_cli.analysis.windows import (
+    ClauseWindow,
+    analyze_windows,
+    combine_window_payloads,
+    split_into_windows,
 )
+from realitycheck_cli.clauses.normalizer import clause_fingerprint
 from realitycheck_cli.config.settings import Settings
 from realitycheck_cli.negotiation.rewrite_suggester import (
     suggest_negotiation_points,
@@ -28,10 +50,45 @@ from realitycheck_cli.negotiation.rewrite_suggester import (
 )
 
 
-def _heuristic_analysis(clause: Clause) -> ClauseAnalysis:
-    category, confidence = detect_category(clause.text)
-    signals = detect_signals(clause.text)
-    risk_score = estimate_risk_score(category, signals)
+# Concurrent LLM calls for the windows of one oversized clause.
+_WINDOW_LLM_CONCURRENCY = 4
+# Concurrent LLM calls per contract on the asyncio path.
+ASYNC_LLM_CONCURRENCY = 8
+# Threads for blocking LLM calls on the asyncio path, across every contract
+# one analyzer has in flight. Calls sleep through retries and wait on hedges,
+# so they run on a pool of their own rather than on the CPU executor.
+ASYNC_LLM_THREADS = 16
+
+_T = TypeVar("_T")
+# Runs a blocking function off the event loop and awaits its result.
+CpuRunner = Callable[..., Awaitable[Any]]
+
+
+def _heuristic_analysis(
+    clause: Clause,
+    rules: RuleSet | None = None,
+    predicted: tuple[ClauseCategory, float] | None = None,
+    terms: list[ClauseTerm] | None = None,
+    windows: Sequence[ClauseWindow] = (),
+) -> ClauseAnalysis:
+    if windows:
+        # Oversized clauses are scanned window by window; see windows.py.
+        windowed = analyze_windows(windows, rules)
+        category, confidence = windowed.category, windowed.category_confidence
+        signals, benefits_party = windowed.signals, windowed.benefits_party
+    else:
+        if predicted is None:
+            category, confidence = detect_category(clause.text, rules)
+        signals = detect_signals(clause.text, rules)
+        benefits_party = detect_benefits_party(clause.text, rules)
+    if predicted is None:
+        explanation = "Pattern-based legal risk classification."
+    else:
+        category, confidence = predicted
+        explanation = "Learned category with pattern-based risk signals."
+    if windows:
+        explanation += f" Analyzed as {len(windows)} overlapping windows."
+    risk_score = estimate_risk_score(category, signals, rules)
     return ClauseAnalysis(
         contract_id=clause.contract_id,
         clause_id=clause.clause_id,
@@ -42,12 +99,13 @@ def _heuristic_analysis(clause: Clause) -> ClauseAnalysis:
         category_confidence=confidence,
         risk_level=risk_level_from_score(risk_score),
         risk_score=risk_score,
-        benefits_party=detect_benefits_party(clause.text),
+        benefits_party=benefits_party,
         signals=signals,
         missing_protections=[],
         rewrite_suggestion="",
         negotiation_points=[],
-        explanation="Pattern-based legal risk classification.",
+        explanation=explanation,
+        terms=terms if terms is not None else extract_terms(clause.text),
     )
 
 
@@ -95,6 +153,10 @@ def _merge_llm_payload(
         if not isinstance(raw_signal, dict):
             raise ValueError("LLM signal must be a JSON object.")
         parsed_signal = _parse_signal(raw_signal)
+        start = analysis.text.find(parsed_signal.evidence) if parsed_signal.evidence else -1
+        if start >= 0:
+            parsed_signal.start = start
+            parsed_signal.end = start + len(parsed_signal.evidence)
         signal_key = (
             parsed_signal.type.value,
             parsed_signal.label.lower(),
@@ -121,31 +183,433 @@ def _merge_llm_payload(
     )
 
 
+def _apply_llm_payload(
+    analysis: ClauseAnalysis, llm_payload: dict[str, Any]
+) -> ClauseAnalysis:
+    # A reply that parses but does not fit the schema is as unusable as one
+    # that does not parse; either way the clause keeps its heuristic reading.
+    try:
+        return _merge_llm_payload(analysis, llm_payload)
+    except ValueError as exc:
+        raise LLMMalformedReplyError(f"Gemini response did not fit the schema: {exc}") from exc
+
+
+def index_analyses(analyses: list[ClauseAnalysis]) -> dict[str, ClauseAnalysis]:
+    return {
+        clause_fingerprint(analysis.title, analysis.text): analysis
+        for analysis in analyses
+    }
+
+
+def _read_wording(
+    clause: Clause, rules: RuleSet | None, window_chars: int | None
+) -> tuple[list[ClauseSignal], BenefitsParty]:
+    windows = split_into_windows(clause, window_chars) if window_chars else []
+    if windows:
+        windowed = analyze_windows(windows, rules)
+        return windowed.signals, windowed.benefits_party
+    return detect_signals(clause.text, rules), detect_benefits_party(clause.text, rules)
+
+
+def _reuse_analysis(
+    clause: Clause,
+    previous: ClauseAnalysis,
+    terms: list[ClauseTerm],
+    rules: RuleSet | None = None,
+    use_llm: bool = False,
+    window_chars: int | None = None,
+) -> ClauseAnalysis:
+    # Near-duplicate boilerplate can differ in exactly the figures the terms
+    # hold, so they always come from this clause's own text.
+    update: dict[str, Any] = {
+        "contract_id": clause.contract_id,
+        "clause_id": clause.clause_id,
+        "title": clause.title,
+        "page": clause.page,
+        "text": clause.text,
+        "terms": terms,
+    }
+    if previous.text != clause.text:
+        # Signals, their offsets and the party reading belong to the wording
+        # they were read from ("Each party" is not "Either party"), so they
+        # are read again from this text. Model-added signals are kept only
+        # where their evidence occurs here too, and the model's party and
+        # score stand unless the patterns read the two wordings differently.
+        signals, benefits_party = _read_wording(clause, rules, window_chars)
+        seen = {(signal.type, signal.label.lower()) for signal in signals}
+        for signal in previous.signals:
+            start = clause.text.find(signal.evidence) if signal.evidence else -1
+            if start < 0 or (signal.type, signal.label.lower()) in seen:
+                continue
+            signals.append(
+                signal.model_copy(update={"start": start, "end": start + len(signal.evidence)})
+            )
+        update["signals"] = signals
+        if use_llm:
+            previous_clause = clause.model_copy(update={"text": previous.text})
+            _, previous_party = _read_wording(previous_clause, rules, window_chars)
+            if previous_party == benefits_party:
+                benefits_party = previous.benefits_party
+        else:
+            risk_score = estimate_risk_score(previous.category, signals, rules)
+            update["risk_score"] = risk_score
+            update["risk_level"] = risk_level_from_score(risk_score)
+        update["benefits_party"] = benefits_party
+        reread = previous.model_copy(update=update)
+        return reread.model_copy(
+            update={
+                "rewrite_suggestion": suggest_rewrite(reread),
+                "negotiation_points": suggest_negotiation_points(reread),
+            }
+        )
+    return previous.model_copy(update=update)
+
+
+@dataclass(frozen=True)
+class ClauseProgress:
+    analysis: ClauseAnalysis
+    completed: int
+    total: int
+    source: str
+    missing_protections: tuple[str, ...]
+
+
+def _classify_windows(
+    llm_client: LLMClient, windows: Sequence[ClauseWindow], snapshot: dict[str, Any]
+) -> dict[str, Any]:
+    # Each window is its own prompt, so the payload stays within the model's
+    # context however long the clause is; the prompts go out concurrently.
+    with ThreadPoolExecutor(
+        max_workers=min(_WINDOW_LLM_CONCURRENCY, len(windows)),
+        thread_name_prefix="llm-window",
+    ) as executor:
+        futures = [
+            executor.submit(llm_client.classify_clause, window.clause, snapshot)
+            for window in windows
+        ]
+        try:
+            payloads = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return combine_window_payloads(windows, payloads)
+
+
+def _llm_failure(
+    heuristic: ClauseAnalysis, llm_client: LLMClient, exc: LLMUnavailableError
+) -> tuple[ClauseAnalysis, str]:
+    if isinstance(exc, LLMBudgetExhaustedError):
+        return (
+            heuristic.model_copy(
+                update={
+                    "explanation": f"{heuristic.explanation} LLM enrichment skipped: {exc}"
+                }
+            ),
+            "budget",
+        )
+    # A degraded service costs this clause its enrichment, not the whole run.
+    llm_client.usage.fallbacks += 1
+    return (
+        heuristic.model_copy(
+            update={"explanation": f"{heuristic.explanation} LLM unavailable: {exc}"}
+        ),
+        "fallback",
+    )
+
+
+def _finish_clause(
+    clause: Clause,
+    enriched: ClauseAnalysis,
+    source: str,
+    registry: BoilerplateRegistry | None,
+    use_llm: bool,
+) -> tuple[ClauseAnalysis, str]:
+    enriched = enriched.model_copy(
+        update={
+            "rewrite_suggestion": suggest_rewrite(enriched),
+            "negotiation_points": suggest_negotiation_points(enriched),
+            "source": source,
+        }
+    )
+    if registry is not None and source in ("heuristic", "llm"):
+        registry.register(clause, enriched, enriched=use_llm)
+    return enriched, source
+
+
+def _enrich_clause(
+    clause: Clause,
+    use_llm: bool,
+    llm_client: LLMClient | None,
+    registry: BoilerplateRegistry | None,
+    rules: RuleSet | None,
+    predicted: tuple[ClauseCategory, float] | None = None,
+    terms: list[ClauseTerm] | None = None,
+    window_chars: int | None = None,
+) -> tuple[ClauseAnalysis, str]:
+    windows = split_into_windows(clause, window_chars) if window_chars else []
+    heuristic = _heuristic_analysis(clause, rules, predicted, terms, windows)
+    if llm_client is None:
+        return _finish_clause(clause, heuristic, "heuristic", registry, use_llm)
+    try:
+        if windows:
+            payload = _classify_windows(llm_client, windows, _serialize_heuristic(heuristic))
+        else:
+            payload = llm_client.classify_clause(
+                clause,
+                heuristic_snapshot=_serialize_heuristic(heuristic),
+            )
+        enriched, source = _apply_llm_payload(heuristic, payload), "llm"
+    except LLMUnavailableError as exc:
+        enriched, source = _llm_failure(heuristic, llm_client, exc)
+    return _finish_clause(clause, enriched, source, registry, use_llm)
+
+
+def _prepare_clauses(
+    clauses: list[Clause],
+    previous_analyses: list[ClauseAnalysis] | None,
+    rules: RuleSet | None,
+    category_model: CategoryModel | None,
+) -> tuple[
+    list[ClauseAnalysis | None],
+    list[tuple[ClauseCategory, float] | None],
+    list[list[ClauseTerm]],
+    list[str],
+]:
+    previous_index = index_analyses(previous_analyses or [])
+    reused = [
+        previous_index.get(clause_fingerprint(clause.title, clause.text))
+        for clause in clauses
+    ]
+    # The learned tier classifies every clause it may be asked about in one
+    # batch, before the per-clause loop.
+    predictions: list[tuple[ClauseCategory, float] | None] = [None] * len(clauses)
+    if category_model is not None:
+        pending = [idx for idx, previous in enumerate(reused) if previous is None]
+        batch = category_model.predict_batch(
+            [(clauses[idx].title, clauses[idx].text) for idx in pending]
+        )
+        for idx, predicted in zip(pending, batch):
+            predictions[idx] = predicted
+    # Terms are extracted once per clause; missing protections are answered
+    # from them before any clause is classified so progress events carry them.
+    clause_terms = [extract_terms(clause.text) for clause in clauses]
+    missing_protections = detect_missing_protections(clauses, rules, clause_terms)
+    return reused, predictions, clause_terms, missing_protections
+
+
+def _contract_llm_client(
+    settings: Settings,
+    needs_llm: bool,
+    llm_client: LLMClient | None,
+    usage: LLMUsage | None,
+    llm_budget_tokens: int | None,
+) -> LLMClient | None:
+    # A long-lived client (see engine.Analyzer) is shared through a
+    # per-contract view; otherwise the contract gets, and closes, its own.
+    if not needs_llm:
+        return None
+    if llm_client is not None:
+        return llm_client.for_contract(usage or LLMUsage(), llm_budget_tokens)
+    return LLMClient(settings, usage=usage, budget_tokens=llm_budget_tokens)
+
+
 def analyze_clauses(
     contract_id: str,
     clauses: list[Clause],
     settings: Settings,
     use_llm: bool = False,
+    previous_analyses: list[ClauseAnalysis] | None = None,
+    registry: BoilerplateRegistry | None = None,
+    rules: RuleSet | None = None,
+    usage: LLMUsage | None = None,
+    llm_budget_tokens: int | None = None,
+    on_clause: Callable[[ClauseProgress], None] | None = None,
+    category_model: CategoryModel | None = None,
+    llm_client: LLMClient | None = None,
 ) -> tuple[list[ClauseAnalysis], list[str]]:
-    llm_client = LLMClient(settings) if use_llm else None
+    reused, predictions, clause_terms, missing_protections = _prepare_clauses(
+        clauses, previous_analyses, rules, category_model
+    )
+    needs_llm = use_llm and any(previous is None for previous in reused)
+    owns_client = needs_llm and llm_client is None
+    llm_client = _contract_llm_client(
+        settings, needs_llm, llm_client, usage, llm_budget_tokens
+    )
     analyses: list[ClauseAnalysis] = []
-    for clause in clauses:
-        heuristic = _heuristic_analysis(clause)
-        enriched = heuristic
-        if llm_client is not None:
-            payload = llm_client.classify_clause(
-                clause,
-                heuristic_snapshot=_serialize_heuristic(heuristic),
+    try:
+        for clause, previous, predicted, terms in zip(
+            clauses, reused, predictions, clause_terms
+        ):
+            canonical = None
+            if previous is None and registry is not None:
+                canonical = registry.lookup(clause, enriched=use_llm)
+            if previous is not None:
+                analysis = _reuse_analysis(
+                    clause, previous, terms, rules, use_llm, settings.clause_window_chars
+                )
+                source = "previous"
+            elif canonical is not None:
+                analysis = _reuse_analysis(
+                    clause, canonical, terms, rules, use_llm, settings.clause_window_chars
+                )
+                source = "boilerplate"
+            else:
+                analysis, source = _enrich_clause(
+                    clause,
+                    use_llm,
+                    llm_client,
+                    registry,
+                    rules,
+                    predicted,
+                    terms,
+                    settings.clause_window_chars,
+                )
+            analyses.append(analysis)
+            if on_clause is not None:
+                on_clause(
+                    ClauseProgress(
+                        analysis=analysis,
+                        completed=len(analyses),
+                        total=len(clauses),
+                        source=source,
+                        missing_protections=tuple(missing_protections),
+                    )
+                )
+    finally:
+        if owns_client and llm_client is not None:
+            llm_client.close()
+
+    return analyses, missing_protections
+
+
+async def _gather_or_cancel(coroutines: Sequence[Awaitable[_T]]) -> list[_T]:
+    # Unlike a bare gather, a failure or cancellation also cancels the
+    # siblings, so no clause keeps calling the LLM for an abandoned contract.
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _classify_async(
+    llm_client: LLMClient,
+    clause: Clause,
+    windows: Sequence[ClauseWindow],
+    snapshot: dict[str, Any],
+    slots: asyncio.Semaphore,
+    llm_executor: ThreadPoolExecutor,
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+
+    async def call(prompt_clause: Clause) -> dict[str, Any]:
+        async with slots:
+            return await loop.run_in_executor(
+                llm_executor, llm_client.classify_clause, prompt_clause, snapshot
             )
-            enriched = _merge_llm_payload(heuristic, payload)
-        enriched = enriched.model_copy(
-            update={
-                "rewrite_suggestion": suggest_rewrite(enriched),
-                "negotiation_points": suggest_negotiation_points(enriched),
-            }
+
+    if not windows:
+        return await call(clause)
+    payloads = await _gather_or_cancel([call(window.clause) for window in windows])
+    return combine_window_payloads(windows, payloads)
+
+
+async def analyze_clauses_async(
+    contract_id: str,
+    clauses: list[Clause],
+    settings: Settings,
+    run_cpu: CpuRunner,
+    use_llm: bool = False,
+    previous_analyses: list[ClauseAnalysis] | None = None,
+    registry: BoilerplateRegistry | None = None,
+    rules: RuleSet | None = None,
+    usage: LLMUsage | None = None,
+    llm_budget_tokens: int | None = None,
+    on_clause: Callable[[ClauseProgress], None] | None = None,
+    category_model: CategoryModel | None = None,
+    llm_client: LLMClient | None = None,
+    llm_concurrency: int = ASYNC_LLM_CONCURRENCY,
+    llm_executor: ThreadPoolExecutor | None = None,
+) -> tuple[list[ClauseAnalysis], list[str]]:
+    # Same results as analyze_clauses, except that identical clauses of one
+    # contract may both be classified before either reaches the registry.
+    # LLM calls run on llm_executor, or on a pool of llm_concurrency threads
+    # owned by this call; never on run_cpu's executor.
+    reused, predictions, clause_terms, missing_protections = await run_cpu(
+        _prepare_clauses, clauses, previous_analyses, rules, category_model
+    )
+    needs_llm = use_llm and any(previous is None for previous in reused)
+    owns_client = needs_llm and llm_client is None
+    llm_client = _contract_llm_client(
+        settings, needs_llm, llm_client, usage, llm_budget_tokens
+    )
+    slots = asyncio.Semaphore(max(1, llm_concurrency))
+    owns_executor = llm_client is not None and llm_executor is None
+    if owns_executor:
+        llm_executor = ThreadPoolExecutor(
+            max_workers=max(1, llm_concurrency), thread_name_prefix="llm"
         )
-        analyses.append(enriched)
+    completed = 0
 
-    missing_protections = detect_missing_protections(clauses)
-    return analyses, missing_protections
+    def local(idx: int) -> tuple[ClauseAnalysis, str, list[ClauseWindow] | None]:
+        clause, previous, terms = clauses[idx], reused[idx], clause_terms[idx]
+        window_chars = settings.clause_window_chars
+        if previous is not None:
+            reused_analysis = _reuse_analysis(
+                clause, previous, terms, rules, use_llm, window_chars
+            )
+            return reused_analysis, "previous", None
+        canonical = registry.lookup(clause, enriched=use_llm) if registry is not None else None
+        if canonical is not None:
+            reused_analysis = _reuse_analysis(
+                clause, canonical, terms, rules, use_llm, window_chars
+            )
+            return reused_analysis, "boilerplate", None
+        windows = split_into_windows(clause, window_chars) if window_chars else []
+        heuristic = _heuristic_analysis(clause, rules, predictions[idx], terms, windows)
+        return heuristic, "heuristic", windows
 
+    async def one(idx: int) -> ClauseAnalysis:
+        nonlocal completed
+        clause = clauses[idx]
+        analysis, source, windows = await run_cpu(local, idx)
+        if windows is not None:
+            if llm_client is not None and llm_executor is not None:
+                try:
+                    payload = await _classify_async(
+                        llm_client,
+                        clause,
+                        windows,
+                        _serialize_heuristic(analysis),
+                        slots,
+                        llm_executor,
+                    )
+                    analysis, source = _apply_llm_payload(analysis, payload), "llm"
+                except LLMUnavailableError as exc:
+                    analysis, source = _llm_failure(analysis, llm_client, exc)
+            analysis, source = _finish_clause(clause, analysis, source, registry, use_llm)
+        completed += 1
+        if on_clause is not None:
+            on_clause(
+                ClauseProgress(
+                    analysis=analysis,
+                    completed=completed,
+                    total=len(clauses),
+                    source=source,
+                    missing_protections=tuple(missing_protections),
+                )
+            )
+        return analysis
+
+    try:
+        analyses = await _gather_or_cancel([one(idx) for idx in range(len(clauses))])
+    finally:
+        if owns_executor and llm_executor is not None:
+            llm_executor.shutdown(wait=False, cancel_futures=True)
+        if owns_client and llm_client is not None:
+            llm_client.close()
+    return analyses, missing_protections
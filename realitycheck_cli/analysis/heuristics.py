@@ -1,109 +1,61 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from dataclasses import dataclass
 import re
 
+from realitycheck_cli.analysis.phrase_matcher import PhraseHit, PhraseScan
+from realitycheck_cli.analysis.rules import (
+    CLIENT_RIGHT_MARKERS,
+    DEFAULT_RULES,
+    MUTUALITY_MARKERS,
+    VENDOR_RIGHT_MARKERS,
+    RuleSet,
+    SignalRule,
+)
 from realitycheck_cli.analysis.schemas import (
     BenefitsParty,
     Clause,
     ClauseCategory,
     ClauseSignal,
+    ClauseTerm,
     RiskLevel,
     Severity,
-    SignalType,
-)
-
-_CATEGORY_PATTERNS: dict[ClauseCategory, tuple[str, ...]] = {
-    ClauseCategory.NON_COMPETE: (
-        r"\bnon[- ]?compete\b",
-        r"\bnon[- ]?solicit(?:ation)?\b",
-        r"\brestrict(?:ion|ed)?\s+from\s+working\b",
-    ),
-    ClauseCategory.IP_TRANSFER: (
-        r"\bintellectual property\b",
-        r"\bwork product\b",
-        r"\bassign(?:ment|ed|s)?\b",
-        r"\bownership rights\b",
-    ),
-    ClauseCategory.LIABILITY: (
-        r"\bliabilit(?:y|ies)\b",
-        r"\bindemnif(?:y|ication)\b",
-        r"\bconsequential damages\b",
-        r"\blimit(?:ation)? of liability\b",
-    ),
-    ClauseCategory.TERMINATION: (
-        r"\bterminat(?:e|ion)\b",
-        r"\bcure period\b",
-        r"\bmaterial breach\b",
-        r"\bnotice period\b",
-    ),
-    ClauseCategory.FINANCIAL_RISK: (
-        r"\bpayment\b",
-        r"\binvoice\b",
-        r"\blate fee\b",
-        r"\bfee(?:s)?\b",
-        r"\bnet\s*\d+\b",
-    ),
-    ClauseCategory.PRIVACY: (
-        r"\bconfidential(?:ity)?\b",
-        r"\bpersonal data\b",
-        r"\bprivacy\b",
-        r"\bdata protection\b",
-        r"\bbreach notification\b",
-    ),
-    ClauseCategory.NEUTRAL: (),
-}
-
-_VAGUE_PATTERNS: tuple[tuple[str, str, Severity], ...] = (
-    (r"\bsole\s+discretion\b", "sole discretion", Severity.HIGH),
-    (r"\bwithout\s+notice\b", "without notice", Severity.HIGH),
-    (r"\bas\s+deemed\s+necessary\b", "as deemed necessary", Severity.MEDIUM),
-    (
-        r"\bat\s+any\s+time\s+for\s+any\s+reason\b",
-        "at any time for any reason",
-        Severity.HIGH,
-    ),
+    TermKind,
 )
-
-_ONE_SIDED_PATTERNS: tuple[tuple[str, str, Severity], ...] = (
-    (
-        r"\bmay\s+terminate\b.{0,60}\bwithout\s+notice\b",
-        "termination without notice",
-        Severity.HIGH,
-    ),
-    (r"\bunilateral(?:ly)?\b", "unilateral rights", Severity.HIGH),
-    (r"\bfor any reason\b", "for any reason", Severity.MEDIUM),
-)
-
-_LIABILITY_EXPANSION_PATTERNS: tuple[tuple[str, str, Severity], ...] = (
-    (r"\bunlimited liability\b", "unlimited liability", Severity.HIGH),
-    (r"\bliability shall not be limited\b", "liability not limited", Severity.HIGH),
-    (r"\ball damages\b", "all damages", Severity.MEDIUM),
-    (r"\bconsequential damages\b", "consequential damages exposure", Severity.MEDIUM),
-)
-
-_CATEGORY_BASE_RISK: dict[ClauseCategory, int] = {
-    ClauseCategory.NON_COMPETE: 60,
-    ClauseCategory.IP_TRANSFER: 57,
-    ClauseCategory.LIABILITY: 62,
-    ClauseCategory.TERMINATION: 55,
-    ClauseCategory.FINANCIAL_RISK: 58,
-    ClauseCategory.PRIVACY: 52,
-    ClauseCategory.NEUTRAL: 35,
-}
+from realitycheck_cli.analysis.terms import extract_terms
 
 _SEVERITY_POINTS = {
     Severity.LOW: 4,
     Severity.MEDIUM: 8,
     Severity.HIGH: 14,
 }
+# Text kept on either side of an extracted term when confirming a protection;
+# wide enough for the bounded gaps in the built-in protection patterns.
+_TERM_CONTEXT_CHARS = 200
 
 
-def detect_category(text: str) -> tuple[ClauseCategory, float]:
+def match_category_patterns(
+    text: str, rules: RuleSet | None = None
+) -> dict[ClauseCategory, set[int]]:
+    # Indices of the category patterns found in the text; sets from separate
+    # windows of one clause union into the hits for the whole clause.
+    rules = rules or DEFAULT_RULES
     lowered = text.lower()
+    return {
+        category: {idx for idx, pattern in enumerate(patterns) if pattern.search(lowered)}
+        for category, patterns in rules.category_patterns
+    }
+
+
+def category_from_matches(
+    matches: dict[ClauseCategory, set[int]], rules: RuleSet | None = None
+) -> tuple[ClauseCategory, float]:
+    rules = rules or DEFAULT_RULES
     best_category = ClauseCategory.NEUTRAL
     best_score = 0
-    for category, patterns in _CATEGORY_PATTERNS.items():
-        score = sum(1 for pattern in patterns if re.search(pattern, lowered))
+    for category, _ in rules.category_patterns:
+        score = len(matches.get(category, ()))
         if score > best_score:
             best_score = score
             best_category = category
@@ -113,61 +65,91 @@ def detect_category(text: str) -> tuple[ClauseCategory, float]:
     return best_category, confidence
 
 
-def _signal_from_match(
-    signal_type: SignalType,
-    label: str,
-    severity: Severity,
-    text: str,
-    match: re.Match[str],
-) -> ClauseSignal:
-    start = max(0, match.start() - 30)
-    end = min(len(text), match.end() + 30)
-    evidence = text[start:end].strip()
-    return ClauseSignal(
-        type=signal_type,
-        label=label,
-        severity=severity,
-        evidence=evidence,
-    )
+def detect_category(
+    text: str, rules: RuleSet | None = None
+) -> tuple[ClauseCategory, float]:
+    return category_from_matches(match_category_patterns(text, rules), rules)
 
 
-def detect_signals(text: str) -> list[ClauseSignal]:
-    lowered = text.lower()
-    signals: list[ClauseSignal] = []
+def scan_markers(text: str, rules: RuleSet | None = None) -> PhraseScan:
+    return (rules or DEFAULT_RULES).matcher.scan(text)
 
-    for pattern, label, severity in _VAGUE_PATTERNS:
-        match = re.search(pattern, lowered, flags=re.DOTALL)
-        if match:
-            signals.append(
-                _signal_from_match(SignalType.VAGUE_LANGUAGE, label, severity, text, match)
-            )
 
-    for pattern, label, severity in _ONE_SIDED_PATTERNS:
-        match = re.search(pattern, lowered, flags=re.DOTALL)
-        if match:
-            signals.append(
-                _signal_from_match(SignalType.ONE_SIDED_RIGHT, label, severity, text, match)
-            )
+def _rule_match(rule: SignalRule, scan: PhraseScan, text: str) -> PhraseHit | None:
+    if rule.pattern is None:
+        return scan.first(rule.phrases)
+    if not all(scan.has(phrase) for phrase in rule.phrases):
+        return None
+    match = rule.pattern.search(text.lower())
+    if match is None:
+        return None
+    return PhraseHit(phrase=rule.label, start=match.start(), end=match.end())
+
+
+def locate_signals(
+    text: str, rules: RuleSet | None = None
+) -> list[tuple[SignalRule, PhraseHit]]:
+    rules = rules or DEFAULT_RULES
+    scan = scan_markers(text, rules)
+    located: list[tuple[SignalRule, PhraseHit]] = []
+    for rule in rules.signal_rules:
+        hit = _rule_match(rule, scan, text)
+        if hit is not None:
+            located.append((rule, hit))
+    return located
 
-    for pattern, label, severity in _LIABILITY_EXPANSION_PATTERNS:
-        match = re.search(pattern, lowered, flags=re.DOTALL)
-        if match:
-            signals.append(
-                _signal_from_match(
-                    SignalType.LIABILITY_EXPANSION, label, severity, text, match
-                )
-            )
 
+def detect_signals(text: str, rules: RuleSet | None = None) -> list[ClauseSignal]:
+    signals: list[ClauseSignal] = []
+    for rule, hit in locate_signals(text, rules):
+        start = max(0, hit.start - 30)
+        end = min(len(text), hit.end + 30)
+        evidence = text[start:end]
+        start += len(evidence) - len(evidence.lstrip())
+        evidence = evidence.strip()
+        signals.append(
+            ClauseSignal(
+                type=rule.signal_type,
+                label=rule.label,
+                severity=rule.severity,
+                evidence=evidence,
+                start=start,
+                end=start + len(evidence),
+            )
+        )
     return signals
 
 
-def detect_benefits_party(text: str) -> BenefitsParty:
+@dataclass(frozen=True)
+class PartyMarkers:
+    mutual: bool
+    client: bool
+    vendor: bool
+
+    def __or__(self, other: "PartyMarkers") -> "PartyMarkers":
+        return PartyMarkers(
+            self.mutual or other.mutual,
+            self.client or other.client,
+            self.vendor or other.vendor,
+        )
+
+
+def detect_party_markers(text: str, rules: RuleSet | None = None) -> PartyMarkers:
+    scan = scan_markers(text, rules)
     lowered = text.lower()
-    if any(marker in lowered for marker in ("mutual", "both parties", "each party")):
-        return BenefitsParty.MUTUAL
+    return PartyMarkers(
+        # Mutuality is a plain substring of the raw text, as it always was.
+        mutual=any(marker in lowered for marker in MUTUALITY_MARKERS),
+        client=scan.has_any(CLIENT_RIGHT_MARKERS),
+        vendor=scan.has_any(VENDOR_RIGHT_MARKERS),
+    )
+
 
-    client_has_right = bool(re.search(r"\b(client|company|customer)\s+may\b", lowered))
-    vendor_has_right = bool(re.search(r"\b(vendor|provider|contractor)\s+may\b", lowered))
+def benefits_party_from_markers(markers: PartyMarkers) -> BenefitsParty:
+    if markers.mutual:
+        return BenefitsParty.MUTUAL
+    client_has_right = markers.client
+    vendor_has_right = markers.vendor
     if client_has_right and not vendor_has_right:
         return BenefitsParty.CLIENT
     if vendor_has_right and not client_has_right:
@@ -177,8 +159,16 @@ def detect_benefits_party(text: str) -> BenefitsParty:
     return BenefitsParty.UNKNOWN
 
 
-def estimate_risk_score(category: ClauseCategory, signals: list[ClauseSignal]) -> int:
-    base = _CATEGORY_BASE_RISK[category]
+def detect_benefits_party(text: str, rules: RuleSet | None = None) -> BenefitsParty:
+    return benefits_party_from_markers(detect_party_markers(text, rules))
+
+
+def estimate_risk_score(
+    category: ClauseCategory,
+    signals: list[ClauseSignal],
+    rules: RuleSet | None = None,
+) -> int:
+    base = (rules or DEFAULT_RULES).category_base_risk[category]
     signal_points = sum(_SEVERITY_POINTS[signal.severity] for signal in signals)
     score = base + signal_points
     return max(1, min(100, score))
@@ -194,35 +184,44 @@ def risk_level_from_score(score: int) -> RiskLevel:
     return RiskLevel.LOW
 
 
-def detect_missing_protections(clauses: list[Clause]) -> list[str]:
-    text = " ".join(clause.text.lower() for clause in clauses)
+def _term_confirms(
+    pattern: re.Pattern[str],
+    clauses: list[Clause],
+    terms: Sequence[list[ClauseTerm]],
+    kind: TermKind,
+) -> bool:
+    # The protection's own pattern must match around the term: that text is a
+    # substring of what the full scan reads, so a hit here is a hit there and
+    # the shortcut can never report a protection the pattern would not.
+    for clause, clause_terms in zip(clauses, terms):
+        for term in clause_terms:
+            if term.kind != kind:
+                continue
+            start = max(0, term.start - _TERM_CONTEXT_CHARS)
+            if pattern.search(clause.text[start : term.end + _TERM_CONTEXT_CHARS].lower()):
+                return True
+    return False
+
+
+def detect_missing_protections(
+    clauses: list[Clause],
+    rules: RuleSet | None = None,
+    terms: Sequence[list[ClauseTerm]] | None = None,
+) -> list[str]:
+    rules = rules or DEFAULT_RULES
+    if terms is None:
+        terms = [extract_terms(clause.text) for clause in clauses]
+    found = {term.kind for clause_terms in terms for term in clause_terms}
+    # Protections confirmed next to an extracted term never touch the joined
+    # text; the DOTALL patterns only run over it for those still unresolved.
+    text: str | None = None
     missing: list[str] = []
-
-    payment_pattern = r"(payment|invoice).{0,40}(due|within|days|net\s*\d+)"
-    if not re.search(payment_pattern, text, flags=re.DOTALL):
-        missing.append("payment_timeline")
-
-    termination_notice_pattern = (
-        r"((terminate|termination).{0,80}(written\s+notice|notice\s+period|days?\s+notice|notice\s+of|(\d+|\w+)\s+days))"
-        r"|((written\s+notice|notice\s+period|days?\s+notice|notice\s+of|(\d+|\w+)\s+days).{0,80}(terminate|termination))"
-    )
-    if not re.search(termination_notice_pattern, text, flags=re.DOTALL):
-        missing.append("termination_notice")
-
-    if not re.search(r"(cure\s+period|opportunity\s+to\s+cure)", text, flags=re.DOTALL):
-        missing.append("cure_period")
-
-    liability_cap_pattern = r"(liability).{0,80}(cap|limit|shall not exceed|maximum)"
-    if not re.search(liability_cap_pattern, text, flags=re.DOTALL):
-        missing.append("liability_cap")
-
-    breach_notification_pattern = r"(data breach|breach).{0,80}(notify|notification).{0,40}(hours|days)"
-    if not re.search(breach_notification_pattern, text, flags=re.DOTALL):
-        missing.append("breach_notification_window")
-
-    ip_retained_pattern = r"(pre-existing|background)\s+ip|retain(?:s|ed)?\s+(?:all\s+)?(rights?|title|interest)"
-    if not re.search(ip_retained_pattern, text, flags=re.DOTALL):
-        missing.append("ip_retained")
-
+    for name, pattern in rules.protections:
+        kind = rules.term_protections.get(name)
+        if kind is not None and kind in found and _term_confirms(pattern, clauses, terms, kind):
+            continue
+        if text is None:
+            text = " ".join(clause.text.lower() for clause in clauses)
+        if not pattern.search(text):
+            missing.append(name)
     return missing
-
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import copy
 import json
+import threading
 from typing import Any
 
 import google.generativeai as genai
 
-from realitycheck_cli.analysis.schemas import Clause
+from realitycheck_cli.analysis.llm_transport import (
+    CircuitBreaker,
+    LLMReply,
+    LLMTransport,
+    LLMUnavailableError,
+    RetryPolicy,
+)
+from realitycheck_cli.analysis.schemas import Clause, LLMUsage
 from realitycheck_cli.config.settings import Settings
 
 _SYSTEM_PROMPT = """You are a legal contract clause analyzer.
@@ -24,6 +33,58 @@ Required JSON keys:
 """
 
 
+# Rough characters-per-token ratio for English prose, used when the model does
+# not report usage so the budget still has something to count against.
+_CHARS_PER_TOKEN = 4
+_SNAPSHOT_KEYS = (
+    "category",
+    "category_confidence",
+    "risk_level",
+    "risk_score",
+    "benefits_party",
+)
+
+
+# Attempts at a usable reply before the clause falls back to heuristics.
+_REPLY_ATTEMPTS = 2
+
+
+class LLMBudgetExhaustedError(LLMUnavailableError):
+    pass
+
+
+class LLMMalformedReplyError(LLMUnavailableError):
+    pass
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_clause_prompt(clause: Clause, heuristic_snapshot: dict[str, Any]) -> str:
+    # Identifiers and the fixed heuristic explanation tell the model nothing,
+    # and signal evidence is a verbatim excerpt of the clause text it already
+    # gets, so only the fields that inform the classification are sent.
+    snapshot = {key: heuristic_snapshot[key] for key in _SNAPSHOT_KEYS if key in heuristic_snapshot}
+    signals = [
+        [signal["type"], signal["label"], signal["severity"]]
+        for signal in heuristic_snapshot.get("signals", [])
+    ]
+    if signals:
+        snapshot["signals"] = signals
+    return (
+        "Classify this clause. Heuristic baseline signals are [type,label,severity]; "
+        "use them as reference, but improve if needed.\n"
+        f"Title: {clause.title}\n"
+        f"Baseline: {_compact_json(snapshot)}\n"
+        f"Text:\n{clause.text}"
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, -(-len(text) // _CHARS_PER_TOKEN))
+
+
 def _extract_text(response: Any) -> str | None:
     text = getattr(response, "text", None)
     if isinstance(text, str) and text.strip():
@@ -43,26 +104,61 @@ def _extract_text(response: Any) -> str | None:
     return None
 
 
+def _parse_reply(text: str) -> dict[str, Any]:
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise LLMMalformedReplyError("Gemini response was not valid JSON.") from exc
+    if not isinstance(parsed, dict):
+        raise LLMMalformedReplyError("Gemini response JSON must be an object.")
+    return parsed
+
+
 class LLMClient:
-    def __init__(self, settings: Settings) -> None:
-        if not settings.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY is required when LLM classification is enabled.")
-        genai.configure(api_key=settings.gemini_api_key)
-        self._timeout_seconds = settings.llm_timeout_seconds
-        self._model = genai.GenerativeModel(
-            model_name=settings.gemini_model,
-            system_instruction=_SYSTEM_PROMPT,
-        )
+    def __init__(
+        self,
+        settings: Settings,
+        transport: LLMTransport | None = None,
+        usage: LLMUsage | None = None,
+        budget_tokens: int | None = None,
+    ) -> None:
+        if transport is None:
+            if not settings.gemini_api_key:
+                raise ValueError(
+                    "GEMINI_API_KEY is required when LLM classification is enabled."
+                )
+            genai.configure(api_key=settings.gemini_api_key)
+            self._timeout_seconds = settings.llm_timeout_seconds
+            self._model = genai.GenerativeModel(
+                model_name=settings.gemini_model,
+                system_instruction=_SYSTEM_PROMPT,
+            )
+            transport = LLMTransport(
+                self._generate,
+                retry=RetryPolicy(max_retries=settings.llm_max_retries),
+                breaker=CircuitBreaker(),
+                hedge=settings.llm_hedge,
+            )
+        self.transport = transport
+        self.usage = usage if usage is not None else LLMUsage()
+        self.budget_tokens = budget_tokens
+        # Windows of one oversized clause are classified from several threads.
+        self._usage_lock = threading.Lock()
+        self._input_cost = settings.llm_input_cost_per_mtok
+        self._output_cost = settings.llm_output_cost_per_mtok
 
-    def classify_clause(self, clause: Clause, heuristic_snapshot: dict[str, Any]) -> dict[str, Any]:
-        user_prompt = (
-            "Classify this clause.\n\n"
-            f"Clause:\n{clause.model_dump_json(indent=2)}\n\n"
-            f"Heuristic baseline (use as reference, but improve if needed):\n"
-            f"{json.dumps(heuristic_snapshot, indent=2)}"
-        )
+    def for_contract(self, usage: LLMUsage, budget_tokens: int | None = None) -> "LLMClient":
+        # Shares the configured model and the transport, with its retry state
+        # and circuit breaker; only usage and budget are counted per contract.
+        view = copy.copy(self)
+        view.usage = usage
+        view.budget_tokens = budget_tokens
+        view._usage_lock = threading.Lock()
+        return view
+
+    def _generate(self, prompt: str) -> LLMReply:
         response = self._model.generate_content(
-            user_prompt,
+            prompt,
             generation_config={
                 "temperature": 0.1,
                 "response_mime_type": "application/json",
@@ -71,11 +167,63 @@ class LLMClient:
         )
         content = _extract_text(response)
         if content is None:
-            raise ValueError("Gemini returned empty content.")
-        try:
-            parsed = json.loads(content)
-        except json.JSONDecodeError as exc:
-            raise ValueError("Gemini response was not valid JSON.") from exc
-        if not isinstance(parsed, dict):
-            raise ValueError("Gemini response JSON must be an object.")
-        return parsed
+            raise LLMMalformedReplyError("Gemini returned empty content.")
+        metadata = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(metadata, "prompt_token_count", None)
+        output_tokens = getattr(metadata, "candidates_token_count", None)
+        return LLMReply(
+            text=content,
+            prompt_tokens=prompt_tokens if isinstance(prompt_tokens, int) else None,
+            output_tokens=output_tokens if isinstance(output_tokens, int) else None,
+        )
+
+    def _record(self, prompt: str, reply: LLMReply) -> None:
+        usage = self.usage
+        usage.requests += 1
+        usage.prompt_chars += len(prompt)
+        usage.response_chars += len(reply.text)
+        if reply.prompt_tokens is None or reply.output_tokens is None:
+            usage.estimated_requests += 1
+        prompt_tokens = (
+            reply.prompt_tokens if reply.prompt_tokens is not None else _estimate_tokens(prompt)
+        )
+        output_tokens = (
+            reply.output_tokens
+            if reply.output_tokens is not None
+            else _estimate_tokens(reply.text)
+        )
+        usage.prompt_tokens += prompt_tokens
+        usage.output_tokens += output_tokens
+        if self._input_cost is not None or self._output_cost is not None:
+            cost = (
+                prompt_tokens * (self._input_cost or 0.0)
+                + output_tokens * (self._output_cost or 0.0)
+            ) / 1_000_000
+            usage.estimated_cost_usd = round((usage.estimated_cost_usd or 0.0) + cost, 6)
+
+    def classify_clause(self, clause: Clause, heuristic_snapshot: dict[str, Any]) -> dict[str, Any]:
+        with self._usage_lock:
+            if self.budget_tokens is not None and self.usage.total_tokens >= self.budget_tokens:
+                self.usage.budget_skipped += 1
+                raise LLMBudgetExhaustedError(
+                    f"LLM budget of {self.budget_tokens} tokens is spent."
+                )
+        user_prompt = encode_clause_prompt(clause, heuristic_snapshot)
+        last_error: LLMMalformedReplyError | None = None
+        for _ in range(_REPLY_ATTEMPTS):
+            try:
+                reply = self.transport.request(user_prompt)
+            except LLMMalformedReplyError as exc:
+                last_error = exc
+                continue
+            with self._usage_lock:
+                self._record(user_prompt, reply)
+            try:
+                return _parse_reply(reply.text)
+            except LLMMalformedReplyError as exc:
+                last_error = exc
+        assert last_error is not None
+        raise last_error
+
+    def close(self) -> None:
+        self.transport.close()
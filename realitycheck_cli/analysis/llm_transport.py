@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import math
+import random
+import threading
+import time
+
+from google.api_core import exceptions as google_exceptions
+
+# Failures worth retrying: the same request may well succeed a moment later.
+# Anything else (bad key, invalid argument, blocked prompt) is raised as is.
+RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.TooManyRequests,
+    google_exceptions.RetryError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class LLMUnavailableError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class LLMReply:
+    text: str
+    # Token counts as reported by the model, when it reports them.
+    prompt_tokens: int | None = None
+    output_tokens: int | None = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 2
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+    jitter: float = 0.2
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * (2**retry))
+        return delay * (1 + rng.uniform(-self.jitter, self.jitter))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                # One trial request probes whether the service has recovered.
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        # The call ended without saying anything about the service's health
+        # (a rejected prompt, an empty reply); let the next request probe.
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 8) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+    rejected: int = 0
+
+
+class LLMTransport:
+    def __init__(
+        self,
+        send: Callable[[str], LLMReply],
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        latency: LatencyTracker | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: int | None = None,
+    ) -> None:
+        self._send = send
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.latency = latency or LatencyTracker()
+        self.stats = TransportStats()
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._executor: ThreadPoolExecutor | None = None
+        # One transport serves every thread of a shared analyzer.
+        self._executor_lock = threading.Lock()
+
+    def _timed_send(self, prompt: str) -> LLMReply:
+        started = time.perf_counter()
+        reply = self._send(prompt)
+        self.latency.record(time.perf_counter() - started)
+        return reply
+
+    def _hedged_send(self, prompt: str) -> LLMReply:
+        hedge_delay = self.latency.percentile(self.hedge_percentile)
+        if hedge_delay is None:
+            # Not enough samples for a meaningful p95 yet.
+            return self._timed_send(prompt)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="llm-hedge"
+                )
+            executor = self._executor
+        primary = executor.submit(self._timed_send, prompt)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self.stats.hedges += 1
+        backup = executor.submit(self._timed_send, prompt)
+        pending: set[Future[LLMReply]] = {primary, backup}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower duplicate cannot be cancelled mid-flight; its
+                    # result is simply dropped when it arrives.
+                    if future is backup:
+                        self.stats.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        assert error is not None
+        raise error
+
+    def request(self, prompt: str) -> LLMReply:
+        self.stats.requests += 1
+        last_error: BaseException | None = None
+        for attempt in range(self.retry.max_retries + 1):
+            if not self.breaker.allow():
+                self.stats.rejected += 1
+                raise LLMUnavailableError(
+                    "LLM circuit breaker is open after repeated failures."
+                ) from last_error
+            if attempt:
+                self.stats.retries += 1
+                self._sleep(self.retry.delay(attempt - 1, self._rng))
+            self.stats.attempts += 1
+            try:
+                reply = self._hedged_send(prompt) if self.hedge else self._timed_send(prompt)
+            except RETRYABLE_ERRORS as exc:
+                self.breaker.record_failure()
+                last_error = exc
+                continue
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return reply
+        self.stats.failures += 1
+        raise LLMUnavailableError(
+            f"LLM request failed after {self.retry.max_retries + 1} attempts: {last_error}"
+        ) from last_error
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import re
+import threading
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class PhraseHit:
+    phrase: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class PhraseScan:
+    hits: tuple[PhraseHit, ...] = ()
+    _by_phrase: dict[str, tuple[PhraseHit, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        by_phrase: dict[str, list[PhraseHit]] = {}
+        for hit in self.hits:
+            by_phrase.setdefault(hit.phrase, []).append(hit)
+        object.__setattr__(
+            self,
+            "_by_phrase",
+            {phrase: tuple(found) for phrase, found in by_phrase.items()},
+        )
+
+    def has(self, phrase: str) -> bool:
+        return phrase in self._by_phrase
+
+    def has_any(self, phrases: Iterable[str]) -> bool:
+        return any(phrase in self._by_phrase for phrase in phrases)
+
+    def first(self, phrases: Iterable[str]) -> PhraseHit | None:
+        candidates = [
+            self._by_phrase[phrase][0] for phrase in phrases if phrase in self._by_phrase
+        ]
+        return min(candidates, key=lambda hit: (hit.start, -hit.end), default=None)
+
+    def count(self, phrase: str) -> int:
+        return len(self._by_phrase.get(phrase, ()))
+
+
+def normalize_phrase(phrase: str) -> str:
+    return _WHITESPACE_RE.sub(" ", phrase.lower()).strip()
+
+
+class _OffsetMap:
+    # Maps positions in the lowercased, whitespace-collapsed text back to the
+    # original. Most clauses have few or no hits, so the whitespace runs are
+    # only walked the first time a position is actually needed.
+    def __init__(self, text: str, lowered: str) -> None:
+        self._text = text
+        self._lowered = lowered
+        self._positions: list[int] | None = None
+        self._shifts: list[int] = []
+        self._per_char: list[int] | None = None
+
+    def _build(self) -> list[int]:
+        if len(self._lowered) != len(self._text):
+            # A few characters lowercase to more than one code point; keep a
+            # per-character map so offsets still point into the original text.
+            self._per_char = [
+                idx for idx, char in enumerate(self._text) for _ in char.lower()
+            ]
+        positions: list[int] = []
+        removed = 0
+        for match in _WHITESPACE_RE.finditer(self._lowered):
+            start, end = match.span()
+            if end - start > 1:
+                positions.append(start - removed + 1)
+                removed += end - start - 1
+                self._shifts.append(removed)
+        self._positions = positions
+        return positions
+
+    def __call__(self, index: int) -> int:
+        positions = self._positions if self._positions is not None else self._build()
+        slot = bisect_right(positions, index) - 1
+        shifted = index + (self._shifts[slot] if slot >= 0 else 0)
+        return self._per_char[shifted] if self._per_char is not None else shifted
+
+
+def _normalize_with_offsets(text: str) -> tuple[str, _OffsetMap]:
+    lowered = text.lower()
+    return _WHITESPACE_RE.sub(" ", lowered), _OffsetMap(text, lowered)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class _ScanCache:
+    # Bounded by the characters of the texts it keeps alive rather than by
+    # entry count: a clause may be one line or several megabytes, and the
+    # matcher lives as long as the process-wide analyzer that owns it.
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self._entries: OrderedDict[str, PhraseScan] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> PhraseScan | None:
+        with self._lock:
+            scan = self._entries.get(text)
+            if scan is not None:
+                self._entries.move_to_end(text)
+            return scan
+
+    def put(self, text: str, scan: PhraseScan) -> None:
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            if text in self._entries:
+                return
+            self._entries[text] = scan
+            self._chars += len(text)
+            while self._chars > self.max_chars:
+                evicted, _ = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+
+class PhraseMatcher:
+    def __init__(
+        self,
+        word_phrases: Iterable[str] = (),
+        substring_phrases: Iterable[str] = (),
+        cache_chars: int = 2_000_000,
+    ) -> None:
+        self._whole_word: dict[str, bool] = {}
+        for phrase in substring_phrases:
+            self._whole_word[normalize_phrase(phrase)] = False
+        for phrase in word_phrases:
+            self._whole_word[normalize_phrase(phrase)] = True
+        self._whole_word.pop("", None)
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+        for phrase in self._whole_word:
+            self._insert(phrase)
+        self._link_failures()
+        self._cache_chars = cache_chars
+        self._cache = _ScanCache(cache_chars)
+
+    def __getstate__(self) -> dict[str, object]:
+        # The automaton pickles as plain lists and dicts; the per-instance scan
+        # cache is rebuilt empty on load.
+        state = dict(self.__dict__)
+        del state["_cache"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._cache = _ScanCache(self._cache_chars)
+
+    @property
+    def phrases(self) -> frozenset[str]:
+        return frozenset(self._whole_word)
+
+    def _insert(self, phrase: str) -> None:
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (phrase,)
+
+    def _link_failures(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def scan(self, text: str) -> PhraseScan:
+        scan = self._cache.get(text)
+        if scan is None:
+            scan = self._scan(text)
+            self._cache.put(text, scan)
+        return scan
+
+    def _scan(self, text: str) -> PhraseScan:
+        normalized, offset_of = _normalize_with_offsets(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        whole_word = self._whole_word
+        length = len(normalized)
+
+        hits: list[PhraseHit] = []
+        state = 0
+        for idx, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for phrase in output[state]:
+                start = idx - len(phrase) + 1
+                if whole_word[phrase] and (
+                    (start > 0 and _is_word_char(normalized[start - 1]))
+                    or (idx + 1 < length and _is_word_char(normalized[idx + 1]))
+                ):
+                    continue
+                hits.append(PhraseHit(phrase, offset_of(start), offset_of(idx) + 1))
+        return PhraseScan(hits=tuple(hits))
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+import re
+import threading
+import tomllib
+from typing import Any
+
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+
+from realitycheck_cli.analysis.phrase_matcher import PhraseMatcher, normalize_phrase
+from realitycheck_cli.analysis.schemas import ClauseCategory, Severity, SignalType, TermKind
+
+# Bump whenever the compiler's semantics change so rules_version changes and
+# results built under the old compiler are not reused.
+_COMPILER_VERSION = 2
+# Compiling a pack takes a few milliseconds, so compiled packs are only kept
+# in memory; nothing is ever deserialized from disk.
+_COMPILED_PACKS_MAX = 32
+
+MUTUALITY_MARKERS = ("mutual", "both parties", "each party")
+NOTICE_MARKERS = ("written notice", "notice period", "days notice")
+INDEMNITY_MARKERS = ("indemnify", "indemnification")
+CLIENT_RIGHT_MARKERS = ("client may", "company may", "customer may")
+VENDOR_RIGHT_MARKERS = ("vendor may", "provider may", "contractor may")
+# Built-in protections an extracted clause term can confirm without scanning
+# the whole contract (the pattern still has to match around the term).
+_TERM_PROTECTIONS = {
+    "payment_timeline": TermKind.PAYMENT_TERM,
+    "termination_notice": TermKind.TERMINATION_NOTICE,
+    "cure_period": TermKind.CURE_PERIOD,
+    "liability_cap": TermKind.LIABILITY_CAP,
+    "breach_notification_window": TermKind.BREACH_NOTICE_WINDOW,
+}
+
+
+def _check_regex(pattern: str) -> str:
+    try:
+        re.compile(pattern)
+    except re.error as exc:
+        raise ValueError(f"invalid regular expression {pattern!r}: {exc}") from exc
+    return pattern
+
+
+class CategoryRuleSpec(BaseModel):
+    category: ClauseCategory
+    patterns: list[str] = Field(default_factory=list)
+    base_risk: int | None = Field(default=None, ge=1, le=100)
+
+    @field_validator("patterns")
+    @classmethod
+    def _validate_patterns(cls, patterns: list[str]) -> list[str]:
+        return [_check_regex(pattern) for pattern in patterns]
+
+
+class SignalRuleSpec(BaseModel):
+    type: SignalType
+    label: str = Field(min_length=1)
+    severity: Severity
+    phrases: list[str] = Field(default_factory=list)
+    # When set, every phrase must be present and the pattern then confirms and
+    # locates the match; otherwise the earliest phrase hit is the evidence.
+    pattern: str | None = None
+
+    @field_validator("pattern")
+    @classmethod
+    def _validate_pattern(cls, pattern: str | None) -> str | None:
+        return None if pattern is None else _check_regex(pattern)
+
+    @model_validator(mode="after")
+    def _require_matcher(self) -> "SignalRuleSpec":
+        if not any(phrase.strip() for phrase in self.phrases) and self.pattern is None:
+            raise ValueError(f"signal {self.label!r} needs at least one phrase or a pattern")
+        return self
+
+
+class ProtectionRuleSpec(BaseModel):
+    name: str = Field(pattern=r"^[a-z][a-z0-9_]*$")
+    pattern: str
+
+    @field_validator("pattern")
+    @classmethod
+    def _validate_pattern(cls, pattern: str) -> str:
+        return _check_regex(pattern)
+
+
+class RulePackSpec(BaseModel):
+    name: str = Field(min_length=1)
+    version: str = Field(min_length=1)
+    extends_defaults: bool = True
+    categories: list[CategoryRuleSpec] = Field(default_factory=list)
+    signals: list[SignalRuleSpec] = Field(default_factory=list)
+    protections: list[ProtectionRuleSpec] = Field(default_factory=list)
+    liability_expansion_phrases: list[str] = Field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SignalRule:
+    signal_type: SignalType
+    label: str
+    severity: Severity
+    phrases: tuple[str, ...]
+    pattern: re.Pattern[str] | None = None
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    version: str
+    category_patterns: tuple[tuple[ClauseCategory, tuple[re.Pattern[str], ...]], ...]
+    category_base_risk: dict[ClauseCategory, int]
+    signal_rules: tuple[SignalRule, ...]
+    protections: tuple[tuple[str, re.Pattern[str]], ...]
+    liability_expansion_markers: tuple[str, ...]
+    matcher: PhraseMatcher
+    term_protections: dict[str, TermKind] = field(default_factory=dict)
+
+
+_DEFAULT_SPEC = RulePackSpec(
+    name="builtin",
+    version="1",
+    extends_defaults=False,
+    categories=[
+        CategoryRuleSpec(
+            category=ClauseCategory.NON_COMPETE,
+            base_risk=60,
+            patterns=[
+                r"\bnon[- ]?compete\b",
+                r"\bnon[- ]?solicit(?:ation)?\b",
+                r"\brestrict(?:ion|ed)?\s+from\s+working\b",
+            ],
+        ),
+        CategoryRuleSpec(
+            category=ClauseCategory.IP_TRANSFER,
+            base_risk=57,
+            patterns=[
+                r"\bintellectual property\b",
+                r"\bwork product\b",
+                r"\bassign(?:ment|ed|s)?\b",
+                r"\bownership rights\b",
+            ],
+        ),
+        CategoryRuleSpec(
+            category=ClauseCategory.LIABILITY,
+            base_risk=62,
+            patterns=[
+                r"\bliabilit(?:y|ies)\b",
+                r"\bindemnif(?:y|ication)\b",
+                r"\bconsequential damages\b",
+                r"\blimit(?:ation)? of liability\b",
+            ],
+        ),
+        CategoryRuleSpec(
+            category=ClauseCategory.TERMINATION,
+            base_risk=55,
+            patterns=[
+                r"\bterminat(?:e|ion)\b",
+                r"\bcure period\b",
+                r"\bmaterial breach\b",
+                r"\bnotice period\b",
+            ],
+        ),
+        CategoryRuleSpec(
+            category=ClauseCategory.FINANCIAL_RISK,
+            base_risk=58,
+            patterns=[
+                r"\bpayment\b",
+                r"\binvoice\b",
+                r"\blate fee\b",
+                r"\bfee(?:s)?\b",
+                r"\bnet\s*\d+\b",
+            ],
+        ),
+        CategoryRuleSpec(
+            category=ClauseCategory.PRIVACY,
+            base_risk=52,
+            patterns=[
+                r"\bconfidential(?:ity)?\b",
+                r"\bpersonal data\b",
+                r"\bprivacy\b",
+                r"\bdata protection\b",
+                r"\bbreach notification\b",
+            ],
+        ),
+        CategoryRuleSpec(category=ClauseCategory.NEUTRAL, base_risk=35),
+    ],
+    signals=[
+        SignalRuleSpec(
+            type=SignalType.VAGUE_LANGUAGE,
+            label="sole discretion",
+            severity=Severity.HIGH,
+            phrases=["sole discretion"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.VAGUE_LANGUAGE,
+            label="without notice",
+            severity=Severity.HIGH,
+            phrases=["without notice"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.VAGUE_LANGUAGE,
+            label="as deemed necessary",
+            severity=Severity.MEDIUM,
+            phrases=["as deemed necessary"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.VAGUE_LANGUAGE,
+            label="at any time for any reason",
+            severity=Severity.HIGH,
+            phrases=["at any time for any reason"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.ONE_SIDED_RIGHT,
+            label="termination without notice",
+            severity=Severity.HIGH,
+            phrases=["may terminate", "without notice"],
+            pattern=r"\bmay\s+terminate\b.{0,60}\bwithout\s+notice\b",
+        ),
+        SignalRuleSpec(
+            type=SignalType.ONE_SIDED_RIGHT,
+            label="unilateral rights",
+            severity=Severity.HIGH,
+            phrases=["unilateral", "unilaterally"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.ONE_SIDED_RIGHT,
+            label="for any reason",
+            severity=Severity.MEDIUM,
+            phrases=["for any reason"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.LIABILITY_EXPANSION,
+            label="unlimited liability",
+            severity=Severity.HIGH,
+            phrases=["unlimited liability"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.LIABILITY_EXPANSION,
+            label="liability not limited",
+            severity=Severity.HIGH,
+            phrases=["liability shall not be limited"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.LIABILITY_EXPANSION,
+            label="all damages",
+            severity=Severity.MEDIUM,
+            phrases=["all damages"],
+        ),
+        SignalRuleSpec(
+            type=SignalType.LIABILITY_EXPANSION,
+            label="consequential damages exposure",
+            severity=Severity.MEDIUM,
+            phrases=["consequential damages"],
+        ),
+    ],
+    protections=[
+        ProtectionRuleSpec(
+            name="payment_timeline",
+            pattern=r"(payment|invoice).{0,40}(due|within|days|net\s*\d+)",
+        ),
+        ProtectionRuleSpec(
+            name="termination_notice",
+            pattern=(
+                r"((terminate|termination).{0,80}(written\s+notice|notice\s+period|days?\s+notice|notice\s+of|(\d+|\w+)\s+days))"
+                r"|((written\s+notice|notice\s+period|days?\s+notice|notice\s+of|(\d+|\w+)\s+days).{0,80}(terminate|termination))"
+            ),
+        ),
+        ProtectionRuleSpec(
+            name="cure_period",
+            pattern=r"(cure\s+period|opportunity\s+to\s+cure)",
+        ),
+        ProtectionRuleSpec(
+            name="liability_cap",
+            pattern=r"(liability).{0,80}(cap|limit|shall not exceed|maximum)",
+        ),
+        ProtectionRuleSpec(
+            name="breach_notification_window",
+            pattern=(
+                r"(data breach|breach).{0,80}(notify|notification).{0,40}(hours|days)"
+            ),
+        ),
+        ProtectionRuleSpec(
+            name="ip_retained",
+            pattern=(
+                r"(pre-existing|background)\s+ip"
+                r"|retain(?:s|ed)?\s+(?:all\s+)?(rights?|title|interest)"
+            ),
+        ),
+    ],
+    liability_expansion_phrases=["unlimited liability", "liability shall not be limited"],
+)
+
+
+def _merge_with_defaults(pack: RulePackSpec) -> RulePackSpec:
+    if not pack.extends_defaults:
+        return pack
+    categories = {spec.category: spec.model_copy(deep=True) for spec in _DEFAULT_SPEC.categories}
+    for spec in pack.categories:
+        current = categories.get(spec.category)
+        if current is None:
+            categories[spec.category] = spec
+            continue
+        current.patterns.extend(spec.patterns)
+        if spec.base_risk is not None:
+            current.base_risk = spec.base_risk
+
+    # Pack entries with the same key replace the default in place so the
+    # evaluation order of everything else is unchanged.
+    signals = {(spec.type, spec.label): spec for spec in _DEFAULT_SPEC.signals}
+    signals.update({(spec.type, spec.label): spec for spec in pack.signals})
+    protections = {spec.name: spec for spec in _DEFAULT_SPEC.protections}
+    protections.update({spec.name: spec for spec in pack.protections})
+    return pack.model_copy(
+        update={
+            "categories": list(categories.values()),
+            "signals": list(signals.values()),
+            "protections": list(protections.values()),
+            "liability_expansion_phrases": [
+                *_DEFAULT_SPEC.liability_expansion_phrases,
+                *pack.liability_expansion_phrases,
+            ],
+        }
+    )
+
+
+def compile_rule_pack(pack: RulePackSpec) -> RuleSet:
+    spec = _merge_with_defaults(pack)
+    fingerprint = hashlib.sha256(
+        f"{_COMPILER_VERSION}:{spec.model_dump_json()}".encode("utf-8")
+    ).hexdigest()
+
+    default_patterns = {
+        protection.name: protection.pattern for protection in _DEFAULT_SPEC.protections
+    }
+    base_risk = {
+        category.category: category.base_risk
+        for category in _DEFAULT_SPEC.categories
+        if category.base_risk is not None
+    }
+    base_risk.update(
+        {
+            category.category: category.base_risk
+            for category in spec.categories
+            if category.base_risk is not None
+        }
+    )
+    signal_rules = tuple(
+        SignalRule(
+            signal_type=signal.type,
+            label=signal.label,
+            severity=signal.severity,
+            # The matcher reports hits under the normalised phrase, so rules must
+            # look them up the same way.
+            phrases=tuple(
+                dict.fromkeys(
+                    normalize_phrase(phrase) for phrase in signal.phrases if phrase.strip()
+                )
+            ),
+            pattern=re.compile(signal.pattern, re.DOTALL) if signal.pattern else None,
+        )
+        for signal in spec.signals
+    )
+    liability_markers = tuple(
+        dict.fromkeys(
+            normalize_phrase(phrase)
+            for phrase in spec.liability_expansion_phrases
+            if phrase.strip()
+        )
+    )
+    return RuleSet(
+        version=f"{spec.name}@{spec.version}+{fingerprint[:12]}",
+        category_patterns=tuple(
+            (category.category, tuple(re.compile(pattern) for pattern in category.patterns))
+            for category in spec.categories
+        ),
+        category_base_risk=base_risk,
+        signal_rules=signal_rules,
+        protections=tuple(
+            (protection.name, re.compile(protection.pattern, re.DOTALL))
+            for protection in spec.protections
+        ),
+        liability_expansion_markers=liability_markers,
+        # Every literal marker the heuristics, power-imbalance score and delta
+        # engine look for is found in a single pass over each clause.
+        matcher=PhraseMatcher(
+            word_phrases=(
+                *(phrase for rule in signal_rules for phrase in rule.phrases),
+                *CLIENT_RIGHT_MARKERS,
+                *VENDOR_RIGHT_MARKERS,
+                *liability_markers,
+            ),
+            substring_phrases=INDEMNITY_MARKERS,
+        ),
+        # A pack that rewrites one of these patterns has changed what counts as
+        # present, so only the untouched built-ins may be answered from terms.
+        term_protections={
+            protection.name: _TERM_PROTECTIONS[protection.name]
+            for protection in spec.protections
+            if protection.name in _TERM_PROTECTIONS
+            and protection.pattern == default_patterns.get(protection.name)
+        },
+    )
+
+
+DEFAULT_RULES = compile_rule_pack(_DEFAULT_SPEC)
+
+
+def parse_rule_pack(raw: bytes, source: Path) -> RulePackSpec:
+    try:
+        if source.suffix.lower() == ".toml":
+            payload: Any = tomllib.loads(raw.decode("utf-8"))
+        else:
+            payload = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError, tomllib.TOMLDecodeError) as exc:
+        raise ValueError(f"Could not parse rule pack {source}: {exc}") from exc
+    try:
+        return RulePackSpec.model_validate(payload)
+    except ValidationError as exc:
+        raise ValueError(f"Invalid rule pack {source}: {exc}") from exc
+
+
+_compiled_packs: OrderedDict[str, RuleSet] = OrderedDict()
+_compiled_packs_lock = threading.Lock()
+
+
+def load_rule_pack(path: Path) -> RuleSet:
+    if not path.exists():
+        raise FileNotFoundError(f"Rule pack not found: {path}")
+    raw = path.read_bytes()
+    key = hashlib.sha256(raw).hexdigest()
+    with _compiled_packs_lock:
+        cached = _compiled_packs.get(key)
+        if cached is not None:
+            _compiled_packs.move_to_end(key)
+            return cached
+
+    rules = compile_rule_pack(parse_rule_pack(raw, path))
+    with _compiled_packs_lock:
+        _compiled_packs[key] = rules
+        while len(_compiled_packs) > _COMPILED_PACKS_MAX:
+            _compiled_packs.popitem(last=False)
+    return rules
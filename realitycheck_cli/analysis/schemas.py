@@ -46,6 +46,9 @@ class ClauseSignal(BaseModel):
     label: str
     severity: Severity
     evidence: str
+    # Offsets of the evidence in the clause text, when the analyzer knows them.
+    start: int | None = Field(default=None, ge=0)
+    end: int | None = Field(default=None, ge=0)
 
 
 class Clause(BaseModel):
@@ -56,6 +59,28 @@ class Clause(BaseModel):
     text: str
 
 
+class TermKind(str, Enum):
+    DURATION = "DURATION"
+    NOTICE_PERIOD = "NOTICE_PERIOD"
+    TERMINATION_NOTICE = "TERMINATION_NOTICE"
+    CURE_PERIOD = "CURE_PERIOD"
+    PAYMENT_TERM = "PAYMENT_TERM"
+    BREACH_NOTICE_WINDOW = "BREACH_NOTICE_WINDOW"
+    MONEY = "MONEY"
+    LIABILITY_CAP = "LIABILITY_CAP"
+
+
+class ClauseTerm(BaseModel):
+    kind: TermKind
+    # Periods carry a unit such as "days"; amounts carry a currency code. Caps
+    # stated without a figure have neither.
+    value: float | None = None
+    unit: str | None = None
+    text: str
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+
+
 class ClauseAnalysis(BaseModel):
     contract_id: str
     clause_id: str
@@ -72,6 +97,12 @@ class ClauseAnalysis(BaseModel):
     rewrite_suggestion: str = ""
     negotiation_points: list[str] = Field(default_factory=list)
     explanation: str = ""
+    # None when the analysis predates term extraction (or was built by hand).
+    terms: list[ClauseTerm] | None = None
+    # Where the classification came from: "heuristic", "llm", "fallback" (the
+    # LLM call failed) or "budget" (the LLM budget was spent). Reused analyses
+    # keep the source of the one they copy; None when it predates the field.
+    source: str | None = None
 
 
 class ContractRiskSummary(BaseModel):
@@ -87,12 +118,55 @@ class ContractRiskSummary(BaseModel):
     missing_protections: list[str] = Field(default_factory=list)
 
 
+class LLMUsage(BaseModel):
+    requests: int = Field(default=0, ge=0)
+    prompt_chars: int = Field(default=0, ge=0)
+    response_chars: int = Field(default=0, ge=0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    output_tokens: int = Field(default=0, ge=0)
+    estimated_requests: int = Field(default=0, ge=0)
+    fallbacks: int = Field(default=0, ge=0)
+    budget_skipped: int = Field(default=0, ge=0)
+    estimated_cost_usd: float | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    @classmethod
+    def combine(cls, usages: list["LLMUsage | None"]) -> "LLMUsage | None":
+        present = [usage for usage in usages if usage is not None]
+        if not present:
+            return None
+        costs = [usage.estimated_cost_usd for usage in present]
+        totals = {
+            name: sum(getattr(usage, name) for usage in present)
+            for name in cls.model_fields
+            if name != "estimated_cost_usd"
+        }
+        return cls(
+            **totals,
+            estimated_cost_usd=(
+                round(sum(cost for cost in costs if cost is not None), 6)
+                if any(cost is not None for cost in costs)
+                else None
+            ),
+        )
+
+
 class ContractAnalysisResult(BaseModel):
     contract_id: str
     source_path: str
+    # sha256 of the PDF bytes the analysis was read from.
+    content_hash: str | None = None
     clauses: list[ClauseAnalysis] = Field(default_factory=list)
     summary: ContractRiskSummary
     negotiation_email: str
+    rules_version: str | None = None
+    category_model_version: str | None = None
+    # Whether clauses were sent for LLM enrichment; None in older artifacts.
+    use_llm: bool | None = None
+    llm_usage: LLMUsage | None = None
 
 
 class DeltaType(str, Enum):
@@ -102,12 +176,28 @@ class DeltaType(str, Enum):
     UNCHANGED = "UNCHANGED"
 
 
+class RedlineOp(str, Enum):
+    INSERT = "INSERT"
+    DELETE = "DELETE"
+
+
+class RedlineSpan(BaseModel):
+    op: RedlineOp
+    # Character offsets into the baseline clause text for DELETE spans and
+    # into the revised clause text for INSERT spans.
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str
+    triggers: list[str] = Field(default_factory=list)
+
+
 class ClauseDelta(BaseModel):
     delta_type: DeltaType
     baseline_clause_id: str | None = None
     revised_clause_id: str | None = None
     risk_delta: int
     reason: str
+    redline: list[RedlineSpan] = Field(default_factory=list)
 
 
 class ComparisonFlag(BaseModel):
@@ -129,3 +219,67 @@ class ComparisonResult(BaseModel):
     deltas: list[ClauseDelta] = Field(default_factory=list)
     flags: list[ComparisonFlag] = Field(default_factory=list)
 
+
+class FailureReason(str, Enum):
+    TIMEOUT = "TIMEOUT"
+    ERROR = "ERROR"
+    CRASHED = "CRASHED"
+
+
+class BatchFailure(BaseModel):
+    contract_id: str
+    source_path: str
+    # The pipeline stage that overran or raised; None if it never started one.
+    stage: str | None = None
+    reason: FailureReason
+    message: str = ""
+    elapsed_seconds: float = Field(default=0.0, ge=0.0)
+    degraded: bool = False
+    retried: bool = False
+
+
+class MultiComparisonResult(BaseModel):
+    baseline_contract_id: str
+    comparisons: list[ComparisonResult] = Field(default_factory=list)
+    flag_matrix: dict[str, dict[str, int]] = Field(default_factory=dict)
+    llm_usage: LLMUsage | None = None
+    failures: list[BatchFailure] = Field(default_factory=list)
+
+
+class LineagePoint(BaseModel):
+    version_index: int = Field(ge=0)
+    contract_id: str
+    clause_id: str | None = None
+    title: str | None = None
+    risk_score: int | None = Field(default=None, ge=0, le=100)
+    delta_type: DeltaType | None = None
+
+
+class ClauseLineage(BaseModel):
+    lineage_id: str
+    points: list[LineagePoint] = Field(default_factory=list)
+    risk_trajectory: list[int | None] = Field(default_factory=list)
+    flags: list[ComparisonFlag] = Field(default_factory=list)
+
+
+class RevisionChainResult(BaseModel):
+    contract_ids: list[str] = Field(default_factory=list)
+    comparisons: list[ComparisonResult] = Field(default_factory=list)
+    lineages: list[ClauseLineage] = Field(default_factory=list)
+    llm_usage: LLMUsage | None = None
+    failures: list[BatchFailure] = Field(default_factory=list)
+
+
+class TriageResult(BaseModel):
+    contract_id: str
+    source_path: str
+    content_hash: str | None = None
+    page_count: int = Field(ge=0)
+    pages_examined: list[int] = Field(default_factory=list)
+    # Heuristic-only score over the examined pages; a ranking, not a verdict.
+    approximate_risk_score: int = Field(ge=0, le=100)
+    confidence: float = Field(ge=0.0, le=1.0)
+    high_risk_clause_ids: list[str] = Field(default_factory=list)
+    missing_protections: list[str] = Field(default_factory=list)
+    queued_for_full_analysis: bool = False
+    elapsed_seconds: float = Field(default=0.0, ge=0.0)
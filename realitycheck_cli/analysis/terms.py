@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+
+from realitycheck_cli.analysis.schemas import ClauseAnalysis, ClauseTerm, TermKind
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14,
+    "fifteen": 15, "eighteen": 18, "twenty": 20, "twenty-four": 24, "thirty": 30,
+    "thirty-six": 36, "forty-five": 45, "sixty": 60, "seventy-two": 72, "ninety": 90,
+}
+_UNITS = {"hour": "hours", "day": "days", "week": "weeks", "month": "months", "year": "years"}
+
+# Units are rare, so periods are found from the unit backwards: "30 days",
+# "thirty (30) days", "a 12-month", "five business days".
+_UNIT_RE = re.compile(r"\b(?P<unit>hour|day|week|month|year)s?\b")
+_QUANTITY_BEFORE_RE = re.compile(
+    r"\b(?:(?P<digits>\d+(?:\.\d+)?)|(?P<word>"
+    + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True))
+    + r"))(?:\s*\((?P<paren>\d+)\))?[\s-]*(?:(?:business|calendar|working)\s+)?$"
+)
+_QUANTITY_LOOKBEHIND = 40
+_NET_TERMS_RE = re.compile(r"\bnet\s*(?P<days>\d+)\b", re.IGNORECASE)
+_MONEY_RE = re.compile(
+    r"(?P<currency>US\$|\$|€|£|\b(?:USD|EUR|GBP)\s?)\s?(?P<amount>\d[\d,]*(?:\.\d+)?)"
+    r"(?:\s*(?P<scale>million|thousand|[mk])\b)?",
+    re.IGNORECASE,
+)
+_CURRENCIES = {
+    "$": "USD", "us$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR", "£": "GBP", "gbp": "GBP",
+}
+_SCALES = {"million": 1_000_000, "m": 1_000_000, "thousand": 1_000, "k": 1_000}
+_LIABILITY_CAP_RE = re.compile(
+    r"liabilit\w*.{0,80}?(?:cap\w*|limit\w*|shall not exceed|maximum)", re.IGNORECASE | re.DOTALL
+)
+
+# Keywords that say what a period is for, checked nearest-first around it.
+_CONTEXT_KEYWORDS: tuple[tuple[TermKind, re.Pattern[str]], ...] = (
+    (TermKind.CURE_PERIOD, re.compile(r"\bcure\b|\bremed(?:y|ied)\b")),
+    (TermKind.BREACH_NOTICE_WINDOW, re.compile(r"\bnotif(?:y|ication)\b")),
+    (TermKind.NOTICE_PERIOD, re.compile(r"\bnotice\b")),
+    (TermKind.PAYMENT_TERM, re.compile(r"\bpayments?\b|\binvoic")),
+)
+# Cheap substring checks that let clauses without any figure skip the patterns.
+_PERIOD_HINTS = tuple(_UNITS)
+_MONEY_HINTS = ("$", "€", "£", "usd", "eur", "gbp")
+_CONTEXT_BEFORE = 80
+_CONTEXT_AFTER = 40
+
+
+def _classify_period(lowered: str, start: int, end: int) -> TermKind:
+    window_start = max(0, start - _CONTEXT_BEFORE)
+    before = lowered[window_start:start]
+    after = lowered[end : end + _CONTEXT_AFTER]
+    best_kind = TermKind.DURATION
+    best_distance = None
+    for kind, pattern in _CONTEXT_KEYWORDS:
+        distances = [len(before) - match.end() for match in pattern.finditer(before)]
+        distances += [match.start() for match in pattern.finditer(after)]
+        if distances and (best_distance is None or min(distances) < best_distance):
+            best_kind, best_distance = kind, min(distances)
+    window = lowered[window_start : end + _CONTEXT_AFTER]
+    if best_kind == TermKind.BREACH_NOTICE_WINDOW and "breach" not in window:
+        best_kind = TermKind.NOTICE_PERIOD
+    if best_kind == TermKind.NOTICE_PERIOD and "terminat" in window:
+        best_kind = TermKind.TERMINATION_NOTICE
+    return best_kind
+
+
+def _money_value(match: re.Match[str]) -> float:
+    value = float(match.group("amount").replace(",", ""))
+    scale = match.group("scale")
+    return value * _SCALES[scale.lower()] if scale else value
+
+
+def extract_terms(text: str) -> list[ClauseTerm]:
+    lowered = text.lower()
+    terms: list[ClauseTerm] = []
+    units = _UNIT_RE.finditer(lowered) if any(h in lowered for h in _PERIOD_HINTS) else ()
+    for unit in units:
+        window_start = max(0, unit.start() - _QUANTITY_LOOKBEHIND)
+        match = _QUANTITY_BEFORE_RE.search(lowered, window_start, unit.start())
+        if match is None:
+            continue
+        if match.group("paren"):
+            value = float(match.group("paren"))
+        elif match.group("digits"):
+            value = float(match.group("digits"))
+        else:
+            value = float(_NUMBER_WORDS[match.group("word")])
+        start, end = match.start(), unit.end()
+        terms.append(
+            ClauseTerm(
+                kind=_classify_period(lowered, start, end),
+                value=value,
+                unit=_UNITS[unit.group("unit")],
+                text=text[start:end],
+                start=start,
+                end=end,
+            )
+        )
+    for match in _NET_TERMS_RE.finditer(text) if "net" in lowered else ():
+        terms.append(
+            ClauseTerm(
+                kind=TermKind.PAYMENT_TERM,
+                value=float(match.group("days")),
+                unit="days",
+                text=match.group(),
+                start=match.start(),
+                end=match.end(),
+            )
+        )
+    cap = _LIABILITY_CAP_RE.search(text) if "liabilit" in lowered else None
+    amounts = _MONEY_RE.finditer(text) if any(h in lowered for h in _MONEY_HINTS) else ()
+    for match in amounts:
+        # An amount inside the liability-cap sentence is the cap itself.
+        is_cap = cap is not None and cap.start() <= match.start() <= cap.end() + _CONTEXT_AFTER
+        terms.append(
+            ClauseTerm(
+                kind=TermKind.LIABILITY_CAP if is_cap else TermKind.MONEY,
+                value=_money_value(match),
+                unit=_CURRENCIES[match.group("currency").strip().lower()],
+                text=match.group().strip(),
+                start=match.start(),
+                end=match.end(),
+            )
+        )
+    if cap is not None and not any(term.kind == TermKind.LIABILITY_CAP for term in terms):
+        # Caps stated without an amount ("capped at fees paid") still count.
+        terms.append(
+            ClauseTerm(
+                kind=TermKind.LIABILITY_CAP,
+                text=cap.group(),
+                start=cap.start(),
+                end=cap.end(),
+            )
+        )
+    terms.sort(key=lambda term: term.start)
+    return terms
+
+
+def duration_in_months(term: ClauseTerm) -> int:
+    if term.value is None:
+        return 0
+    amount = int(term.value)
+    if term.unit == "days":
+        return max(1, amount // 30)
+    if term.unit == "weeks":
+        return max(1, amount // 4)
+    if term.unit == "months":
+        return amount
+    if term.unit == "years":
+        return amount * 12
+    return 0
+
+
+def clause_terms(clause: ClauseAnalysis) -> list[ClauseTerm]:
+    # Analyses saved before extraction existed are scanned on demand.
+    return clause.terms if clause.terms is not None else extract_terms(clause.text)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, RuleSet
+from realitycheck_cli.analysis.schemas import ClauseAnalysis
+from realitycheck_cli.ingest.pdf_parser import PageText
+
+DEFAULT_TRIAGE_PAGES = 3
+
+
+def page_hits_keywords(text: str, rules: RuleSet | None = None) -> bool:
+    rules = rules or DEFAULT_RULES
+    lowered = text.lower()
+    if any(
+        pattern.search(lowered) for _, patterns in rules.category_patterns for pattern in patterns
+    ):
+        return True
+    return any(pattern.search(lowered) for _, pattern in rules.protections)
+
+
+def select_triage_pages(
+    pages: Sequence[PageText], first_pages: int, rules: RuleSet | None = None
+) -> list[PageText]:
+    # The opening pages carry the parties and the commercial terms; after
+    # that only pages that mention a risk category or a protection count.
+    return [
+        page
+        for idx, page in enumerate(pages)
+        if page.text.strip() and (idx < first_pages or page_hits_keywords(page.text, rules))
+    ]
+
+
+def triage_confidence(
+    pages: Sequence[PageText],
+    examined: Sequence[PageText],
+    analyses: Sequence[ClauseAnalysis],
+) -> float:
+    # Half from how much of the contract's text was read, half from how sure
+    # the patterns were about the clauses that were.
+    total_chars = sum(len(page.text.strip()) for page in pages)
+    examined_chars = sum(len(page.text.strip()) for page in examined)
+    coverage = examined_chars / total_chars if total_chars else 0.0
+    certainty = (
+        sum(analysis.category_confidence for analysis in analyses) / len(analyses)
+        if analyses
+        else 0.0
+    )
+    return round(0.5 * coverage + 0.5 * certainty, 2)
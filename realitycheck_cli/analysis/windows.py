@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from realitycheck_cli.analysis.heuristics import (
+    PartyMarkers,
+    benefits_party_from_markers,
+    category_from_matches,
+    detect_party_markers,
+    detect_signals,
+    match_category_patterns,
+)
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, RuleSet
+from realitycheck_cli.analysis.schemas import (
+    BenefitsParty,
+    Clause,
+    ClauseCategory,
+    ClauseSignal,
+)
+
+DEFAULT_WINDOW_CHARS = 12_000
+# Wide enough for the longest bounded pattern (".{0,80}" between two phrases)
+# to fall entirely inside at least one window.
+WINDOW_OVERLAP_CHARS = 400
+# How far a cut may move back to land on whitespace instead of mid-word.
+_BOUNDARY_SLACK = 200
+
+
+@dataclass(frozen=True)
+class ClauseWindow:
+    index: int
+    start: int
+    end: int
+    clause: Clause
+
+
+@dataclass(frozen=True)
+class WindowedHeuristics:
+    category: ClauseCategory
+    category_confidence: float
+    signals: list[ClauseSignal]
+    benefits_party: BenefitsParty
+
+
+def _cut_at_whitespace(text: str, position: int, floor: int) -> int:
+    cut = text.rfind(" ", max(floor, position - _BOUNDARY_SLACK), position)
+    return cut if cut > floor else position
+
+
+def split_into_windows(
+    clause: Clause,
+    window_chars: int = DEFAULT_WINDOW_CHARS,
+    overlap_chars: int = WINDOW_OVERLAP_CHARS,
+) -> list[ClauseWindow]:
+    text = clause.text
+    if len(text) <= window_chars:
+        return []
+    overlap = min(overlap_chars, window_chars // 4)
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    while True:
+        end = len(text)
+        if start + window_chars < len(text):
+            end = _cut_at_whitespace(text, start + window_chars, start + overlap)
+        bounds.append((start, end))
+        if end == len(text):
+            break
+        start = _cut_at_whitespace(text, end - overlap, bounds[-1][0]) + 1
+    return [
+        ClauseWindow(
+            index=idx,
+            start=window_start,
+            end=window_end,
+            clause=clause.model_copy(
+                update={
+                    "title": f"{clause.title} (part {idx + 1}/{len(bounds)})",
+                    "text": text[window_start:window_end],
+                }
+            ),
+        )
+        for idx, (window_start, window_end) in enumerate(bounds)
+    ]
+
+
+def _shift(signal: ClauseSignal, offset: int) -> ClauseSignal:
+    if signal.start is None or signal.end is None:
+        return signal
+    return signal.model_copy(
+        update={"start": signal.start + offset, "end": signal.end + offset}
+    )
+
+
+def analyze_windows(
+    windows: Sequence[ClauseWindow], rules: RuleSet | None = None
+) -> WindowedHeuristics:
+    # Every rule only asks whether (and where first) something occurs, so the
+    # per-window answers union into the answer for the whole clause while each
+    # scan stays bounded by the window size.
+    matches: dict[ClauseCategory, set[int]] = {}
+    markers = PartyMarkers(mutual=False, client=False, vendor=False)
+    signals: dict[tuple[str, str], ClauseSignal] = {}
+    for window in windows:
+        for category, hits in match_category_patterns(window.clause.text, rules).items():
+            matches.setdefault(category, set()).update(hits)
+        markers = markers | detect_party_markers(window.clause.text, rules)
+        for signal in detect_signals(window.clause.text, rules):
+            signals.setdefault((signal.type.value, signal.label), _shift(signal, window.start))
+    category, confidence = category_from_matches(matches, rules)
+    rule_order = {
+        (rule.signal_type.value, rule.label): idx
+        for idx, rule in enumerate((rules or DEFAULT_RULES).signal_rules)
+    }
+    return WindowedHeuristics(
+        category=category,
+        category_confidence=confidence,
+        signals=sorted(
+            signals.values(), key=lambda signal: rule_order[signal.type.value, signal.label]
+        ),
+        benefits_party=benefits_party_from_markers(markers),
+    )
+
+
+def combine_window_payloads(
+    windows: Sequence[ClauseWindow], payloads: Sequence[dict[str, Any]]
+) -> dict[str, Any]:
+    # The riskiest window speaks for the clause; signals from every window are
+    # kept and located in the whole clause when merged.
+    riskiest = max(
+        range(len(payloads)), key=lambda idx: int(payloads[idx].get("risk_score", 0))
+    )
+    combined = {key: value for key, value in payloads[riskiest].items() if key != "signals"}
+    combined["explanation"] = (
+        f"Part {riskiest + 1}/{len(windows)}: {payloads[riskiest].get('explanation', '')}"
+    ).strip()
+    combined["signals"] = [raw for payload in payloads for raw in payload.get("signals", [])]
+    return combined
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+import os
+import time
+from typing import Any
+
+from realitycheck_cli.analysis.schemas import BatchFailure, FailureReason
+
+PIPELINE_STAGES = ("parse", "split", "classify", "score", "compare")
+DEFAULT_DEGRADED_CLAUSE_CHARS = 20_000
+
+StageCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class Deadlines:
+    contract_seconds: float | None = None
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    retry_degraded: bool = False
+    degraded_clause_chars: int = DEFAULT_DEGRADED_CLAUSE_CHARS
+
+    @property
+    def enabled(self) -> bool:
+        return self.contract_seconds is not None or bool(self.stage_seconds)
+
+
+def parse_stage_timeouts(values: Sequence[str]) -> dict[str, float]:
+    timeouts: dict[str, float] = {}
+    for value in values:
+        stage, separator, seconds_raw = value.partition("=")
+        stage = stage.strip().lower()
+        if not separator or stage not in PIPELINE_STAGES:
+            raise ValueError(
+                f"Stage timeout {value!r} must look like STAGE=SECONDS with STAGE one of "
+                f"{', '.join(PIPELINE_STAGES)}."
+            )
+        try:
+            seconds = float(seconds_raw)
+        except ValueError as exc:
+            raise ValueError(f"Stage timeout {value!r} needs a number of seconds.") from exc
+        if seconds <= 0:
+            raise ValueError(f"Stage timeout {value!r} must be positive.")
+        timeouts[stage] = seconds
+    return timeouts
+
+
+def deadlines_from_options(
+    timeout: float | None,
+    stage_timeouts: Sequence[str] | None,
+    retry_degraded: bool,
+) -> Deadlines | None:
+    deadlines = Deadlines(
+        contract_seconds=timeout,
+        stage_seconds=parse_stage_timeouts(stage_timeouts or []),
+        retry_degraded=retry_degraded,
+    )
+    if retry_degraded and not deadlines.enabled:
+        raise ValueError("--retry-degraded needs --timeout or --stage-timeout.")
+    return deadlines if deadlines.enabled else None
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    key: int
+    contract_id: str
+    source_path: str
+    function: Callable[..., Any]
+    kwargs: dict[str, Any]
+    # Overrides applied to kwargs for the single degraded retry, if any.
+    degraded_kwargs: dict[str, Any] | None = None
+    degraded: bool = False
+
+
+@dataclass(frozen=True)
+class BatchOutcome:
+    key: int
+    value: Any = None
+    failures: tuple[BatchFailure, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.value is not None
+
+
+def _worker_main(connection: Connection) -> None:
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        key, function, kwargs = message
+
+        def on_stage(stage: str, key: int = key) -> None:
+            connection.send(("stage", key, stage))
+
+        try:
+            value = function(on_stage=on_stage, **kwargs)
+        except Exception as exc:  # reported to the parent, which records it
+            connection.send(("error", key, f"{type(exc).__name__}: {exc}"))
+        else:
+            connection.send(("done", key, value))
+
+
+class _Worker:
+    def __init__(self, context: Any) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.task: BatchTask | None = None
+        self.stage: str | None = None
+        self.task_started = 0.0
+        self.stage_started = 0.0
+
+    def assign(self, task: BatchTask) -> None:
+        self.task = task
+        self.stage = None
+        self.task_started = self.stage_started = time.monotonic()
+        self.connection.send((task.key, task.function, task.kwargs))
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def _overrun(worker: _Worker, deadlines: Deadlines, now: float) -> str | None:
+    if (
+        deadlines.contract_seconds is not None
+        and now - worker.task_started > deadlines.contract_seconds
+    ):
+        return f"contract budget of {deadlines.contract_seconds:g}s exceeded"
+    budget = deadlines.stage_seconds.get(worker.stage or "")
+    if budget is not None and now - worker.stage_started > budget:
+        return f"{worker.stage} stage budget of {budget:g}s exceeded"
+    return None
+
+
+def _next_check(workers: list[_Worker], deadlines: Deadlines, now: float) -> float | None:
+    waits: list[float] = []
+    for worker in workers:
+        if worker.task is None:
+            continue
+        if deadlines.contract_seconds is not None:
+            waits.append(worker.task_started + deadlines.contract_seconds - now)
+        budget = deadlines.stage_seconds.get(worker.stage or "")
+        if budget is not None:
+            waits.append(worker.stage_started + budget - now)
+    return max(0.0, min(waits)) if waits else None
+
+
+def run_with_deadlines(
+    tasks: Sequence[BatchTask],
+    deadlines: Deadlines,
+    max_workers: int | None = None,
+) -> list[BatchOutcome]:
+    # ProcessPoolExecutor cannot cancel a running call, so each task runs in
+    # a dedicated worker process the parent can kill; a killed worker is
+    # replaced straight away and the rest of the batch keeps its throughput.
+    context = multiprocessing.get_context()
+    size = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+    pending: deque[BatchTask] = deque(tasks)
+    failures: dict[int, list[BatchFailure]] = {task.key: [] for task in tasks}
+    values: dict[int, Any] = {}
+    workers = [_Worker(context) for _ in range(size)] if tasks else []
+
+    def fail(worker: _Worker, reason: FailureReason, message: str, retry: bool) -> None:
+        task = worker.task
+        assert task is not None
+        retried = retry and task.degraded_kwargs is not None and not task.degraded
+        failures[task.key].append(
+            BatchFailure(
+                contract_id=task.contract_id,
+                source_path=task.source_path,
+                stage=worker.stage,
+                reason=reason,
+                message=message,
+                elapsed_seconds=round(time.monotonic() - worker.task_started, 3),
+                degraded=task.degraded,
+                retried=retried,
+            )
+        )
+        if retried:
+            pending.append(
+                BatchTask(
+                    key=task.key,
+                    contract_id=task.contract_id,
+                    source_path=task.source_path,
+                    function=task.function,
+                    kwargs={**task.kwargs, **(task.degraded_kwargs or {})},
+                    degraded=True,
+                )
+            )
+        worker.task = None
+
+    try:
+        while pending or any(worker.task is not None for worker in workers):
+            for worker in workers:
+                if worker.task is None and pending:
+                    worker.assign(pending.popleft())
+            busy = {worker.connection: worker for worker in workers if worker.task is not None}
+            timeout = _next_check(workers, deadlines, time.monotonic())
+            for connection in wait(list(busy), timeout=timeout):
+                worker = busy[connection]
+                try:
+                    kind, _, payload = connection.recv()
+                except (EOFError, OSError):
+                    fail(
+                        worker,
+                        FailureReason.CRASHED,
+                        "Worker process exited unexpectedly.",
+                        retry=False,
+                    )
+                    workers[workers.index(worker)] = _Worker(context)
+                    worker.stop(kill=True)
+                    continue
+                if kind == "stage":
+                    worker.stage = payload
+                    worker.stage_started = time.monotonic()
+                elif kind == "done":
+                    values[worker.task.key] = payload  # type: ignore[union-attr]
+                    worker.task = None
+                else:
+                    fail(worker, FailureReason.ERROR, payload, retry=False)
+            now = time.monotonic()
+            for idx, worker in enumerate(workers):
+                if worker.task is None:
+                    continue
+                message = _overrun(worker, deadlines, now)
+                if message is not None:
+                    worker.stop(kill=True)
+                    fail(worker, FailureReason.TIMEOUT, message, retry=deadlines.retry_degraded)
+                    workers[idx] = _Worker(context)
+    finally:
+        for worker in workers:
+            worker.stop(kill=worker.task is not None)
+
+    return [
+        BatchOutcome(key=task.key, value=values.get(task.key), failures=tuple(failures[task.key]))
+        for task in tasks
+    ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from difflib import SequenceMatcher
 
@@ -17,3 +18,7 @@ def canonical_title(title: str) -> str:
 def similarity(a: str, b: str) -> float:
     return SequenceMatcher(None, normalize_clause_text(a), normalize_clause_text(b)).ratio()
 
+
+def clause_fingerprint(title: str, text: str) -> str:
+    payload = f"{canonical_title(title)}\n{normalize_clause_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
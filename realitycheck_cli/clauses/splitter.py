@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 import re
 
 from realitycheck_cli.analysis.schemas import Clause
 from realitycheck_cli.ingest.pdf_parser import PageText
+from realitycheck_cli.ingest.structure import normalize_line
 
 _HEADING_RE = re.compile(r"^\s*(\d+(?:\.\d+)*)[\).:-]?\s+(.+)$")
 _ALL_CAPS_HEADING_RE = re.compile(r"^[A-Z][A-Z\s/&-]{3,80}$")
@@ -25,9 +27,31 @@ def _heading_title(line: str) -> str:
     return line.strip().title()
 
 
-def split_into_clauses(contract_id: str, pages: list[PageText]) -> list[Clause]:
+def _regex_heading(_page: PageText, line: str) -> bool:
+    return _is_heading(line)
+
+
+def _structural_heading_matcher(pages: Sequence[PageText]) -> Callable[[PageText, str], bool]:
+    headings = {
+        page.page_number: {normalize_line(heading) for heading in page.headings}
+        for page in pages
+    }
+
+    def is_heading(page: PageText, line: str) -> bool:
+        return normalize_line(line) in headings[page.page_number]
+
+    return is_heading
+
+
+def split_into_clauses(contract_id: str, pages: Sequence[PageText]) -> list[Clause]:
     if not pages:
         return []
+    # Headings found from the PDF outline or font metadata are authoritative;
+    # the line regexes are only a fallback for documents without structure.
+    if any(page.headings for page in pages):
+        is_heading = _structural_heading_matcher(pages)
+    else:
+        is_heading = _regex_heading
 
     clauses: list[Clause] = []
     buffer: list[str] = []
@@ -56,7 +80,7 @@ def split_into_clauses(contract_id: str, pages: list[PageText]) -> list[Clause]:
             line = raw_line.strip()
             if not line:
                 continue
-            if _is_heading(line):
+            if is_heading(page, line):
                 flush_clause()
                 buffer.clear()
                 active_title = _heading_title(line)
@@ -4,6 +4,12 @@ import typer
 
 from realitycheck_cli.cli.commands.analyze import analyze_contract_command
 from realitycheck_cli.cli.commands.compare import compare_contract_command
+from realitycheck_cli.cli.commands.compare_chain import compare_chain_command
+from realitycheck_cli.cli.commands.compare_many import compare_many_command
+from realitycheck_cli.cli.commands.query import query_portfolio_command
+from realitycheck_cli.cli.commands.search import search_clauses_command
+from realitycheck_cli.cli.commands.train_classifier import train_classifier_command
+from realitycheck_cli.cli.commands.triage import triage_command
 
 app = typer.Typer(
     help=(
@@ -16,4 +22,10 @@ app = typer.Typer(
 
 app.command("analyze")(analyze_contract_command)
 app.command("compare")(compare_contract_command)
+app.command("compare-many")(compare_many_command)
+app.command("compare-chain")(compare_chain_command)
+app.command("query")(query_portfolio_command)
+app.command("search")(search_clauses_command)
+app.command("triage")(triage_command)
+app.command("train-classifier")(train_classifier_command)
 
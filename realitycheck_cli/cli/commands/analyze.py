@@ -1,14 +1,191 @@
 from __future__ import annotations
 
 from pathlib import Path
+import time
+from typing import Any
 
 import typer
 from google.api_core.exceptions import GoogleAPICallError
+from pdfplumber.utils.exceptions import PdfminerException
+from rich.live import Live
+from rich.table import Table
 
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.classifier import ClauseProgress
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, RuleSet, load_rule_pack
+from realitycheck_cli.analysis.schemas import ContractAnalysisResult
+from realitycheck_cli.clauses.normalizer import clause_fingerprint
 from realitycheck_cli.config.settings import Settings
-from realitycheck_cli.output.json_writer import write_json_output
-from realitycheck_cli.output.rich_renderer import render_analysis
-from realitycheck_cli.pipeline import analyze_contract_file
+from realitycheck_cli.engine import Analyzer, shared_analyzer
+from realitycheck_cli.ingest.pdf_parser import PageTextCache
+from realitycheck_cli.ingest.watcher import DirectoryWatcher, WatchEntry
+from realitycheck_cli.output.json_writer import (
+    OutputFormat,
+    iter_analysis_records,
+    write_json_output,
+    write_ndjson_output,
+)
+from realitycheck_cli.output.rich_renderer import (
+    build_progress_table,
+    build_watch_table,
+    console,
+    render_analysis,
+    render_llm_usage,
+)
+from realitycheck_cli.pipeline import analyze_contract_file, load_analysis_result
+from realitycheck_cli.portfolio.store import PortfolioStore, load_portfolio_artifact
+from realitycheck_cli.scoring.risk_engine import compute_contract_scores
+
+
+def _default_output_path(pdf_path: Path, output_format: OutputFormat) -> Path:
+    return Path("artifacts") / f"{pdf_path.stem}.analysis.{output_format.value}"
+
+
+def _write_artifact(
+    result: ContractAnalysisResult,
+    output_path: Path,
+    output_format: OutputFormat,
+) -> Path:
+    if output_format == OutputFormat.NDJSON:
+        return write_ndjson_output(iter_analysis_records(result), output_path)
+    return write_json_output(result, output_path)
+
+
+def _count_reused_clauses(
+    result: ContractAnalysisResult,
+    previous: ContractAnalysisResult | None,
+) -> int:
+    if previous is None:
+        return 0
+    known = {clause_fingerprint(clause.title, clause.text) for clause in previous.clauses}
+    return sum(
+        1 for clause in result.clauses if clause_fingerprint(clause.title, clause.text) in known
+    )
+
+
+def _analyze_with_progress(
+    pdf_path: Path,
+    settings: Settings,
+    **options: Any,
+) -> ContractAnalysisResult:
+    events: list[ClauseProgress] = []
+    started = time.perf_counter()
+
+    def table() -> Table:
+        estimate = None
+        if events:
+            estimate = compute_contract_scores(
+                [event.analysis for event in events],
+                list(events[-1].missing_protections),
+                settings.high_risk_threshold,
+            )[0]
+        return build_progress_table(
+            pdf_path.name, list(events), estimate, time.perf_counter() - started
+        )
+
+    # The table only reads the events collected so far; the result is built
+    # by the same pipeline call as the non-interactive path.
+    with Live(console=console, transient=True, get_renderable=table):
+        return analyze_contract_file(
+            pdf_path=pdf_path, settings=settings, on_clause=events.append, **options
+        )
+
+
+def _watch_directory(
+    directory: Path,
+    settings: Settings,
+    use_llm: bool,
+    output_format: OutputFormat,
+    registry: BoilerplateRegistry | None,
+    boilerplate: Path | None,
+    portfolio_db: Path | None,
+    interval: float,
+    debounce: float,
+    rules: RuleSet,
+    llm_budget: int | None,
+) -> None:
+    watcher = DirectoryWatcher(directory, debounce_seconds=debounce)
+    page_cache = PageTextCache()
+    # One analyzer for the whole session keeps the LLM client and caches warm
+    # between saves.
+    analyzer = Analyzer(
+        settings, rules=rules, use_llm=use_llm, registry=registry, page_cache=page_cache
+    )
+    previous_results: dict[Path, ContractAnalysisResult] = {}
+    entries: dict[Path, WatchEntry] = {}
+
+    def load_previous(pdf_path: Path) -> ContractAnalysisResult | None:
+        if pdf_path in previous_results:
+            return previous_results[pdf_path]
+        # Read back whatever this session writes, JSON or NDJSON.
+        artifact = _default_output_path(pdf_path, output_format)
+        if not artifact.exists():
+            return None
+        try:
+            results = load_portfolio_artifact(artifact)
+        except ValueError:
+            return None
+        return results[0] if len(results) == 1 else None
+
+    def analyze(pdf_path: Path) -> WatchEntry:
+        started = time.perf_counter()
+        previous = load_previous(pdf_path)
+        try:
+            result = analyzer.analyze(
+                pdf_path, previous_result=previous, llm_budget_tokens=llm_budget
+            )
+        except (GoogleAPICallError, OSError, PdfminerException, ValueError) as exc:
+            # Forget the content hash so the next save retries the file.
+            watcher.forget(pdf_path)
+            return WatchEntry(
+                path=pdf_path,
+                status="failed",
+                result=previous_results.get(pdf_path),
+                elapsed_seconds=time.perf_counter() - started,
+                error=str(exc),
+            )
+        _write_artifact(result, _default_output_path(pdf_path, output_format), output_format)
+        if registry is not None and boilerplate is not None:
+            registry.save(boilerplate)
+        if portfolio_db is not None:
+            with PortfolioStore(portfolio_db) as store:
+                store.ingest([result])
+        previous_results[pdf_path] = result
+        return WatchEntry(
+            path=pdf_path,
+            status=f"updated {time.strftime('%H:%M:%S')}",
+            result=result,
+            reused_clauses=_count_reused_clauses(
+                result, previous if previous and analyzer.can_reuse(previous) else None
+            ),
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+    def table() -> Table:
+        return build_watch_table(
+            [entries[path] for path in sorted(entries) if path.exists()],
+            directory,
+            caption=(
+                f"Page cache {page_cache.hits} hits / {page_cache.misses} misses; "
+                f"{watcher.skipped_unchanged} unchanged saves skipped. Ctrl+C to stop."
+            ),
+        )
+
+    with analyzer, Live(table(), console=console, auto_refresh=False) as live:
+        try:
+            while True:
+                for pdf_path in watcher.poll():
+                    entries[pdf_path] = WatchEntry(
+                        path=pdf_path,
+                        status="analyzing",
+                        result=previous_results.get(pdf_path),
+                    )
+                    live.update(table(), refresh=True)
+                    entries[pdf_path] = analyze(pdf_path)
+                    live.update(table(), refresh=True)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
 
 
 def analyze_contract_command(
@@ -16,9 +193,9 @@ def analyze_contract_command(
         ...,
         exists=True,
         file_okay=True,
-        dir_okay=False,
+        dir_okay=True,
         readable=True,
-        help="Path to a contract PDF file.",
+        help="Path to a contract PDF file, or a directory of PDFs with --watch.",
     ),
     json_output: Path | None = typer.Option(
         None,
@@ -26,12 +203,95 @@ def analyze_contract_command(
         "-j",
         help="Path to write structured JSON output.",
     ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.JSON,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Artifact format: pretty JSON document or NDJSON (one record per line).",
+    ),
     use_llm: bool = typer.Option(
         False,
         "--use-llm/--no-llm",
         help="Enable LLM-assisted classification.",
     ),
+    previous: Path | None = typer.Option(
+        None,
+        "--previous",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help=(
+            "Prior analysis JSON artifact; unchanged clauses reuse its results "
+            "instead of being re-analyzed."
+        ),
+    ),
+    portfolio_db: Path | None = typer.Option(
+        None,
+        "--portfolio-db",
+        dir_okay=False,
+        help="Also ingest results into this portfolio database (store + search index).",
+    ),
+    boilerplate: Path | None = typer.Option(
+        None,
+        "--boilerplate",
+        dir_okay=False,
+        help=(
+            "Boilerplate registry JSON; identical and near-identical clauses reuse "
+            "a cluster's canonical analysis. Created if missing and updated after the run."
+        ),
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help=(
+            "Watch PDF_PATH (a directory) and re-analyze PDFs whose content changes; "
+            "artifacts and a live summary table update in place."
+        ),
+    ),
+    interval: float = typer.Option(
+        1.0,
+        "--interval",
+        min=0.1,
+        help="Seconds between directory polls in --watch mode.",
+    ),
+    debounce: float = typer.Option(
+        2.0,
+        "--debounce",
+        min=0.0,
+        help="Seconds a file must stay unchanged before it is re-analyzed in --watch mode.",
+    ),
+    progress: bool = typer.Option(
+        True,
+        "--progress/--no-progress",
+        help="Show clause results in a live table as they complete (terminal only).",
+    ),
+    llm_budget: int | None = typer.Option(
+        None,
+        "--llm-budget",
+        min=1,
+        help="Stop LLM enrichment once this many tokens (prompt + output) are spent.",
+    ),
+    rules_path: Path | None = typer.Option(
+        None,
+        "--rules",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Rule pack (JSON or TOML) adding or overriding the built-in patterns.",
+    ),
 ) -> None:
+    if watch and not pdf_path.is_dir():
+        raise typer.BadParameter("--watch expects PDF_PATH to be a directory.")
+    if not watch and pdf_path.is_dir():
+        raise typer.BadParameter("PDF_PATH is a directory; pass --watch to monitor it.")
+    if watch and (json_output is not None or previous is not None):
+        raise typer.BadParameter(
+            "--json-output and --previous cannot be combined with --watch; artifacts "
+            "are written to artifacts/ and reused automatically."
+        )
     settings = Settings.from_env()
     if use_llm and not settings.gemini_api_key:
         raise typer.BadParameter(
@@ -44,16 +304,77 @@ def analyze_contract_command(
         )
 
     try:
-        result = analyze_contract_file(
-            pdf_path=pdf_path,
-            settings=settings,
-            use_llm=use_llm,
-        )
+        rules = load_rule_pack(rules_path) if rules_path else DEFAULT_RULES
+        # The analyzer the analysis below runs on, or one configured the same.
+        analyzer = shared_analyzer(settings, rules=rules, use_llm=use_llm)
+        previous_result = load_analysis_result(previous) if previous else None
+        mismatches = analyzer.reuse_mismatches(previous_result) if previous_result else []
+        if mismatches:
+            typer.echo(
+                "Previous analysis was produced with " + "; ".join(mismatches)
+                + "; re-analyzing every clause."
+            )
+            previous_result = None
+        registry = None
+        if boilerplate is not None:
+            registry = (
+                BoilerplateRegistry.load(boilerplate)
+                if boilerplate.exists()
+                else BoilerplateRegistry()
+            )
+            expected_version = analyzer.registry_version
+            if registry.rules_version not in (None, expected_version):
+                typer.echo(
+                    f"Boilerplate registry was built with rules {registry.rules_version}; "
+                    f"starting a fresh registry for {expected_version}."
+                )
+                registry = BoilerplateRegistry(threshold=registry.threshold)
+        if watch:
+            _watch_directory(
+                directory=pdf_path,
+                settings=settings,
+                use_llm=use_llm,
+                output_format=output_format,
+                registry=registry,
+                boilerplate=boilerplate,
+                portfolio_db=portfolio_db,
+                interval=interval,
+                debounce=debounce,
+                rules=rules,
+                llm_budget=llm_budget,
+            )
+            return
+        options: dict[str, Any] = {
+            "use_llm": use_llm,
+            "previous_result": previous_result,
+            "registry": registry,
+            "rules": rules,
+            "llm_budget_tokens": llm_budget,
+        }
+        if progress and console.is_terminal:
+            result = _analyze_with_progress(pdf_path, settings, **options)
+        else:
+            result = analyze_contract_file(pdf_path=pdf_path, settings=settings, **options)
     except GoogleAPICallError as exc:
         raise typer.BadParameter(f"LLM request failed: {exc}") from exc
     except ValueError as exc:
         raise typer.BadParameter(str(exc)) from exc
-    output_path = json_output or Path("artifacts") / f"{pdf_path.stem}.analysis.json"
-    output_path = write_json_output(result, output_path)
+    output_path = _write_artifact(
+        result,
+        json_output or _default_output_path(pdf_path, output_format),
+        output_format,
+    )
+    if registry is not None and boilerplate is not None:
+        registry.save(boilerplate)
+        stats = registry.stats()
+        typer.echo(
+            f"Boilerplate registry: {stats.clusters} clusters, {stats.members} members; "
+            f"hit rate {stats.hit_rate:.0%} ({stats.exact_hits} exact, "
+            f"{stats.near_hits} near); LLM calls saved {stats.llm_calls_saved}."
+        )
+    if portfolio_db is not None:
+        with PortfolioStore(portfolio_db) as store:
+            store.ingest([result])
     render_analysis(result, output_path)
+    render_llm_usage(result.llm_usage)
 
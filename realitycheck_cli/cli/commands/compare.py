@@ -4,10 +4,18 @@ from pathlib import Path
 
 import typer
 
+from realitycheck_cli.analysis.rules import load_rule_pack
+from realitycheck_cli.analysis.schemas import LLMUsage
 from realitycheck_cli.config.settings import Settings
-from realitycheck_cli.output.json_writer import write_json_output
-from realitycheck_cli.output.rich_renderer import render_comparison
+from realitycheck_cli.output.json_writer import (
+    OutputFormat,
+    iter_comparison_records,
+    write_json_output,
+    write_ndjson_output,
+)
+from realitycheck_cli.output.rich_renderer import render_comparison, render_llm_usage
 from realitycheck_cli.pipeline import compare_contract_files
+from realitycheck_cli.portfolio.store import PortfolioStore
 
 
 def compare_contract_command(
@@ -33,11 +41,39 @@ def compare_contract_command(
         "-j",
         help="Path to write structured comparison JSON output.",
     ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.JSON,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Artifact format: pretty JSON document or NDJSON (one record per line).",
+    ),
     use_llm: bool = typer.Option(
         False,
         "--use-llm/--no-llm",
         help="Enable LLM-assisted classification during comparison.",
     ),
+    portfolio_db: Path | None = typer.Option(
+        None,
+        "--portfolio-db",
+        dir_okay=False,
+        help="Also ingest results into this portfolio database (store + search index).",
+    ),
+    llm_budget: int | None = typer.Option(
+        None,
+        "--llm-budget",
+        min=1,
+        help="Stop LLM enrichment once this many tokens (prompt + output) are spent.",
+    ),
+    rules_path: Path | None = typer.Option(
+        None,
+        "--rules",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Rule pack (JSON or TOML) adding or overriding the built-in patterns.",
+    ),
 ) -> None:
     settings = Settings.from_env()
     if use_llm and not settings.gemini_api_key:
@@ -45,30 +81,49 @@ def compare_contract_command(
             "GEMINI_API_KEY must be set when --use-llm is enabled."
         )
 
+    try:
+        rules = load_rule_pack(rules_path) if rules_path else None
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
     baseline_result, revised_result, comparison = compare_contract_files(
         baseline_path=baseline_pdf,
         revised_path=revised_pdf,
         settings=settings,
         use_llm=use_llm,
+        rules=rules,
+        llm_budget_tokens=llm_budget,
     )
 
     output_path = (
         json_output
         or Path("artifacts")
-        / f"{baseline_pdf.stem}_vs_{revised_pdf.stem}.comparison.json"
-    )
-    output_path = write_json_output(
-        {
-            "baseline": baseline_result,
-            "revised": revised_result,
-            "comparison": comparison,
-        },
-        output_path,
+        / f"{baseline_pdf.stem}_vs_{revised_pdf.stem}.comparison.{output_format.value}"
     )
+    if output_format == OutputFormat.NDJSON:
+        output_path = write_ndjson_output(
+            iter_comparison_records(baseline_result, revised_result, comparison),
+            output_path,
+        )
+    else:
+        output_path = write_json_output(
+            {
+                "baseline": baseline_result,
+                "revised": revised_result,
+                "comparison": comparison,
+            },
+            output_path,
+        )
+    if portfolio_db is not None:
+        with PortfolioStore(portfolio_db) as store:
+            store.ingest([baseline_result, revised_result])
     render_comparison(
         comparison=comparison,
         baseline_name=baseline_pdf.name,
         revised_name=revised_pdf.name,
         json_output_path=output_path,
     )
+    render_llm_usage(
+        LLMUsage.combine([baseline_result.llm_usage, revised_result.llm_usage])
+    )
 
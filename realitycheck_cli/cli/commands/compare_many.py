@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from realitycheck_cli.analysis.rules import load_rule_pack
+from realitycheck_cli.batch import deadlines_from_options
+from realitycheck_cli.config.settings import Settings
+from realitycheck_cli.output.json_writer import (
+    OutputFormat,
+    iter_multi_comparison_records,
+    write_json_output,
+    write_ndjson_output,
+)
+from realitycheck_cli.output.rich_renderer import (
+    render_batch_failures,
+    render_llm_usage,
+    render_multi_comparison,
+)
+from realitycheck_cli.pipeline import compare_many_contract_files
+
+
+def compare_many_command(
+    baseline_pdf: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Path to the baseline/standard contract PDF.",
+    ),
+    revised_pdfs: list[Path] = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Counterparty revision PDFs to compare against the baseline.",
+    ),
+    json_output: Path | None = typer.Option(
+        None,
+        "--json-output",
+        "-j",
+        help="Path to write the consolidated comparison output.",
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.JSON,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Artifact format: pretty JSON document or NDJSON (one record per line).",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Worker processes for revisions (default: one per CPU).",
+    ),
+    use_llm: bool = typer.Option(
+        False,
+        "--use-llm/--no-llm",
+        help="Enable LLM-assisted classification during comparison.",
+    ),
+    llm_budget: int | None = typer.Option(
+        None,
+        "--llm-budget",
+        min=1,
+        help="Stop LLM enrichment once this many tokens (prompt + output) are spent.",
+    ),
+    rules_path: Path | None = typer.Option(
+        None,
+        "--rules",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Rule pack (JSON or TOML) adding or overriding the built-in patterns.",
+    ),
+    timeout: float | None = typer.Option(
+        None,
+        "--timeout",
+        min=0.1,
+        help="Per-contract time budget in seconds; an overrunning worker is killed and replaced.",
+    ),
+    stage_timeouts: list[str] | None = typer.Option(
+        None,
+        "--stage-timeout",
+        help="Per-stage budget as STAGE=SECONDS (parse, split, classify, score, compare).",
+    ),
+    retry_degraded: bool = typer.Option(
+        False,
+        "--retry-degraded/--no-retry-degraded",
+        help="Retry a timed-out contract once, heuristic-only with clause text capped.",
+    ),
+) -> None:
+    settings = Settings.from_env()
+    if use_llm and not settings.gemini_api_key:
+        raise typer.BadParameter(
+            "GEMINI_API_KEY must be set when --use-llm is enabled."
+        )
+
+    try:
+        rules = load_rule_pack(rules_path) if rules_path else None
+        deadlines = deadlines_from_options(timeout, stage_timeouts, retry_degraded)
+        baseline_result, revised_results, multi = compare_many_contract_files(
+            baseline_path=baseline_pdf,
+            revised_paths=revised_pdfs,
+            settings=settings,
+            use_llm=use_llm,
+            max_workers=workers,
+            rules=rules,
+            llm_budget_tokens=llm_budget,
+            deadlines=deadlines,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    default_name = (
+        f"{baseline_pdf.stem}_vs_{len(revised_pdfs)}_revisions"
+        f".comparison.{output_format.value}"
+    )
+    output_path = json_output or Path("artifacts") / default_name
+    if output_format == OutputFormat.NDJSON:
+        output_path = write_ndjson_output(
+            iter_multi_comparison_records(baseline_result, revised_results, multi),
+            output_path,
+        )
+    else:
+        output_path = write_json_output(
+            {
+                "baseline": baseline_result,
+                "revised": revised_results,
+                "comparison": multi,
+            },
+            output_path,
+        )
+    render_multi_comparison(
+        multi=multi,
+        baseline_name=baseline_pdf.name,
+        json_output_path=output_path,
+    )
+    render_batch_failures(multi.failures)
+    render_llm_usage(multi.llm_usage)
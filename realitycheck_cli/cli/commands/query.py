@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from realitycheck_cli.analysis.schemas import ClauseCategory, SignalType
+from realitycheck_cli.output.rich_renderer import render_portfolio_rows
+from realitycheck_cli.portfolio.store import (
+    DEFAULT_PORTFOLIO_DB,
+    PortfolioQuery,
+    PortfolioStore,
+    load_portfolio_artifact,
+)
+
+
+def query_portfolio_command(
+    db: Path = typer.Option(
+        DEFAULT_PORTFOLIO_DB,
+        "--db",
+        dir_okay=False,
+        help="Path to the portfolio SQLite database.",
+    ),
+    ingest: list[Path] = typer.Option(
+        [],
+        "--ingest",
+        "-i",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help=(
+            "Analyze, compare, compare-many, compare-chain or triage artifact "
+            "(JSON or NDJSON) to load before querying (repeatable)."
+        ),
+    ),
+    missing: list[str] = typer.Option(
+        [],
+        "--missing",
+        help="Only contracts missing this protection, e.g. liability_cap (repeatable).",
+    ),
+    category: ClauseCategory | None = typer.Option(
+        None,
+        "--category",
+        help="Only contracts containing a clause of this category.",
+    ),
+    signal: SignalType | None = typer.Option(
+        None,
+        "--signal",
+        help="Only contracts containing a clause with this signal type.",
+    ),
+    min_risk: int | None = typer.Option(None, "--min-risk", help="Minimum overall risk score."),
+    max_risk: int | None = typer.Option(None, "--max-risk", help="Maximum overall risk score."),
+    min_leverage: int | None = typer.Option(
+        None, "--min-leverage", help="Minimum leverage index."
+    ),
+    max_leverage: int | None = typer.Option(
+        None, "--max-leverage", help="Maximum leverage index."
+    ),
+    limit: int = typer.Option(100, "--limit", min=1, help="Maximum rows to return."),
+) -> None:
+    try:
+        artifacts = [result for path in ingest for result in load_portfolio_artifact(path)]
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    with PortfolioStore(db) as store:
+        if artifacts:
+            ingested = store.ingest(artifacts)
+            typer.echo(f"Ingested {ingested} contract(s) into {db}.")
+        rows = store.query(
+            PortfolioQuery(
+                missing_protections=tuple(missing),
+                category=category.value if category else None,
+                signal_type=signal.value if signal else None,
+                min_risk=min_risk,
+                max_risk=max_risk,
+                min_leverage=min_leverage,
+                max_leverage=max_leverage,
+                limit=limit,
+            )
+        )
+
+    render_portfolio_rows(rows)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from realitycheck_cli.output.rich_renderer import render_search_hits
+from realitycheck_cli.portfolio.search import build_match_expression
+from realitycheck_cli.portfolio.store import (
+    DEFAULT_PORTFOLIO_DB,
+    PortfolioStore,
+    load_portfolio_artifact,
+)
+
+
+def search_clauses_command(
+    phrase: str = typer.Argument(
+        ...,
+        help="Phrase to search for, or a full FTS5 expression with --raw.",
+    ),
+    near: str | None = typer.Option(
+        None,
+        "--near",
+        help="Only match clauses where this term appears near the phrase.",
+    ),
+    distance: int = typer.Option(
+        10,
+        "--distance",
+        min=0,
+        help="Maximum number of tokens between the phrase and --near term.",
+    ),
+    raw: bool = typer.Option(
+        False,
+        "--raw",
+        help="Treat PHRASE as a raw SQLite FTS5 query expression.",
+    ),
+    db: Path = typer.Option(
+        DEFAULT_PORTFOLIO_DB,
+        "--db",
+        dir_okay=False,
+        help="Path to the portfolio SQLite database.",
+    ),
+    ingest: list[Path] = typer.Option(
+        [],
+        "--ingest",
+        "-i",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help=(
+            "Analyze, compare, compare-many, compare-chain or triage artifact "
+            "(JSON or NDJSON) to index before searching (repeatable)."
+        ),
+    ),
+    limit: int = typer.Option(20, "--limit", min=1, help="Maximum hits to return."),
+) -> None:
+    try:
+        artifacts = [result for path in ingest for result in load_portfolio_artifact(path)]
+        match_expression = (
+            phrase if raw else build_match_expression(phrase, near=near, distance=distance)
+        )
+        with PortfolioStore(db) as store:
+            if artifacts:
+                store.ingest(artifacts)
+            hits = store.search(match_expression, limit=limit)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    render_search_hits(match_expression, hits)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from pydantic import ValidationError
+import typer
+
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.category_model import (
+    DEFAULT_CATEGORY_MODEL_PATH,
+    LabelledClause,
+    evaluate_category_model,
+    labelled_from_analyses,
+    split_holdout,
+    train_category_model,
+)
+from realitycheck_cli.clauses.normalizer import clause_fingerprint
+from realitycheck_cli.output.rich_renderer import render_category_model_evaluation
+from realitycheck_cli.portfolio.store import load_portfolio_artifact
+
+
+def _load_labelled(path: Path) -> list[LabelledClause]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"{path} is not a JSON registry or artifact: {exc}") from exc
+    # A boilerplate registry caches LLM-enriched canonical analyses; analysis
+    # and comparison artifacts count only when produced with --use-llm.
+    if isinstance(payload, dict) and "clusters" in payload:
+        return labelled_from_analyses(BoilerplateRegistry.load(path).enriched_analyses())
+    return [
+        sample
+        for result in load_portfolio_artifact(path)
+        if result.llm_usage is not None and result.llm_usage.requests
+        for sample in labelled_from_analyses(result.clauses)
+    ]
+
+
+def train_classifier_command(
+    sources: list[Path] = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Boilerplate registries or --use-llm analysis/comparison JSON artifacts.",
+    ),
+    output: Path = typer.Option(
+        DEFAULT_CATEGORY_MODEL_PATH,
+        "--output",
+        "-o",
+        dir_okay=False,
+        help="Where to write the trained category model.",
+    ),
+    epochs: int = typer.Option(12, "--epochs", min=1, help="Training passes over the data."),
+    holdout: float = typer.Option(
+        0.2,
+        "--holdout",
+        min=0.0,
+        max=0.5,
+        help="Share of clauses held out to measure agreement with the LLM labels.",
+    ),
+) -> None:
+    try:
+        samples: dict[str, LabelledClause] = {}
+        for path in sources:
+            for sample in _load_labelled(path):
+                samples[clause_fingerprint(sample.title, sample.text)] = sample
+    except (ValueError, ValidationError) as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    if len(samples) < 2:
+        raise typer.BadParameter(
+            "Need at least two LLM-labelled clauses; run analyze with --use-llm "
+            "(and --boilerplate) first."
+        )
+
+    labelled = list(samples.values())
+    train, held_out = split_holdout(labelled, holdout)
+    if train and held_out:
+        evaluation = evaluate_category_model(
+            train_category_model(train, epochs=epochs), len(train), held_out
+        )
+        render_category_model_evaluation(evaluation)
+    else:
+        typer.echo("Too few clauses for a holdout split; skipping evaluation.")
+
+    # The shipped model learns from every labelled clause, holdout included.
+    model = train_category_model(labelled, epochs=epochs)
+    model.save(output)
+    typer.echo(
+        f"Category model {model.version} trained on {len(labelled)} clauses "
+        f"({len(model.classes)} categories) -> {output}"
+    )
+    typer.echo(f"Enable it with REALITYCHECK_CATEGORY_MODEL={output}")
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from realitycheck_cli.analysis.rules import load_rule_pack
+from realitycheck_cli.analysis.triage import DEFAULT_TRIAGE_PAGES
+from realitycheck_cli.config.settings import Settings
+from realitycheck_cli.output.json_writer import (
+    OutputFormat,
+    iter_triage_records,
+    write_json_output,
+    write_ndjson_output,
+)
+from realitycheck_cli.output.rich_renderer import render_batch_failures, render_triage
+from realitycheck_cli.pipeline import triage_contract_files
+
+
+def _expand_sources(paths: list[Path]) -> list[Path]:
+    sources: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            sources.extend(sorted(path.rglob("*.pdf")))
+        else:
+            sources.append(path)
+    return list(dict.fromkeys(sources))
+
+
+def triage_command(
+    sources: list[Path] = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=True,
+        readable=True,
+        help="Contract PDFs, or directories searched recursively for *.pdf.",
+    ),
+    pages: int = typer.Option(
+        DEFAULT_TRIAGE_PAGES,
+        "--pages",
+        "-p",
+        min=0,
+        help="Always read this many opening pages; later pages only when they hit a keyword.",
+    ),
+    threshold: int | None = typer.Option(
+        None,
+        "--threshold",
+        "-t",
+        min=0,
+        max=100,
+        help="Queue contracts at or above this approximate risk "
+        "(default: REALITYCHECK_HIGH_RISK_THRESHOLD).",
+    ),
+    deep: bool = typer.Option(
+        True,
+        "--deep/--no-deep",
+        help="Run the full analysis on queued contracts after the scan.",
+    ),
+    json_output: Path | None = typer.Option(
+        None,
+        "--json-output",
+        "-j",
+        help="Path to write the triage output.",
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.JSON,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Artifact format: pretty JSON document or NDJSON (one record per line).",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Worker processes (default: one per CPU).",
+    ),
+    use_llm: bool = typer.Option(
+        False,
+        "--use-llm/--no-llm",
+        help="Enable LLM-assisted classification for the full analysis of queued contracts.",
+    ),
+    llm_budget: int | None = typer.Option(
+        None,
+        "--llm-budget",
+        min=1,
+        help="Stop LLM enrichment once this many tokens (prompt + output) are spent.",
+    ),
+    rules_path: Path | None = typer.Option(
+        None,
+        "--rules",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Rule pack (JSON or TOML) adding or overriding the built-in patterns.",
+    ),
+) -> None:
+    settings = Settings.from_env()
+    if use_llm and not settings.gemini_api_key:
+        raise typer.BadParameter(
+            "GEMINI_API_KEY must be set when --use-llm is enabled."
+        )
+    pdf_paths = _expand_sources(sources)
+    if not pdf_paths:
+        raise typer.BadParameter("No PDF files were found to triage.")
+
+    try:
+        rules = load_rule_pack(rules_path) if rules_path else None
+        results, full_results, failures = triage_contract_files(
+            pdf_paths,
+            settings,
+            rules=rules,
+            first_pages=pages,
+            threshold=threshold,
+            max_workers=workers,
+            deep=deep,
+            use_llm=use_llm,
+            llm_budget_tokens=llm_budget,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    default_name = f"triage_{len(pdf_paths)}_contracts.{output_format.value}"
+    output_path = json_output or Path("artifacts") / default_name
+    if output_format == OutputFormat.NDJSON:
+        output_path = write_ndjson_output(
+            iter_triage_records(results, full_results, failures), output_path
+        )
+    else:
+        output_path = write_json_output(
+            {"triage": results, "analyses": full_results, "failures": failures},
+            output_path,
+        )
+    render_triage(results, full_results, json_output_path=output_path)
+    render_batch_failures(failures)
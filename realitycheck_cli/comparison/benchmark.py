@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from realitycheck_cli.analysis.schemas import (
+    BenefitsParty,
+    ClauseAnalysis,
+    ClauseCategory,
+    RiskLevel,
+)
+from realitycheck_cli.comparison.matcher import MatchScorer, match_clauses
+
+DEFAULT_SIZES = (100, 500, 2000)
+
+_TITLE_WORDS = (
+    "payment", "liability", "termination", "confidentiality", "indemnity", "audit",
+    "warranty", "notices", "assignment", "insurance", "data", "services", "fees",
+    "renewal", "governing", "law", "scope", "delivery", "acceptance", "support",
+)
+_VOCABULARY_SIZE = 3000
+
+
+@dataclass(frozen=True)
+class BenchmarkRow:
+    clauses: int
+    scorer: MatchScorer
+    seconds: float
+    matched: int
+    accuracy: float
+
+
+def _clause(contract_id: str, clause_id: str, title: str, text: str) -> ClauseAnalysis:
+    return ClauseAnalysis(
+        contract_id=contract_id,
+        clause_id=clause_id,
+        title=title,
+        page=1,
+        text=text,
+        category=ClauseCategory.NEUTRAL,
+        category_confidence=0.35,
+        risk_level=RiskLevel.LOW,
+        risk_score=20,
+        benefits_party=BenefitsParty.UNKNOWN,
+    )
+
+
+def synthetic_contracts(
+    size: int, seed: int = 7
+) -> tuple[list[ClauseAnalysis], list[ClauseAnalysis], dict[str, str | None]]:
+    # Words follow a Zipf distribution like contract prose. The revision rewords
+    # roughly a tenth of each clause, swaps a few neighbours and drops or adds
+    # a few clauses; the returned truth maps revised ids to their origin.
+    rng = random.Random(seed)
+    vocabulary = [f"w{idx}" for idx in range(_VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(_VOCABULARY_SIZE)]
+
+    def words(count: int) -> list[str]:
+        return rng.choices(vocabulary, weights, k=count)
+
+    def title() -> str:
+        return " ".join(rng.sample(_TITLE_WORDS, 2)).title()
+
+    baseline = [
+        _clause("baseline", f"B-{idx:04d}", title(), " ".join(words(rng.randint(40, 400))))
+        for idx in range(size)
+    ]
+    revised: list[ClauseAnalysis] = []
+    truth: dict[str, str | None] = {}
+    for clause in baseline:
+        if rng.random() < 0.03:
+            continue
+        text = clause.text.split()
+        for _ in range(max(1, len(text) // 10)):
+            text[rng.randrange(len(text))] = words(1)[0]
+        clause_id = f"R-{len(truth):04d}"
+        truth[clause_id] = clause.clause_id
+        revised.append(_clause("revised", clause_id, clause.title, " ".join(text)))
+    for _ in range(size // 30):
+        clause_id = f"R-{len(truth):04d}"
+        truth[clause_id] = None
+        revised.insert(
+            rng.randrange(len(revised) + 1),
+            _clause("revised", clause_id, title(), " ".join(words(rng.randint(40, 200)))),
+        )
+    for idx in range(len(revised) - 1):
+        if rng.random() < 0.05:
+            revised[idx], revised[idx + 1] = revised[idx + 1], revised[idx]
+    return baseline, revised, truth
+
+
+def run_benchmark(
+    sizes: tuple[int, ...] = DEFAULT_SIZES, seed: int = 7
+) -> list[BenchmarkRow]:
+    rows: list[BenchmarkRow] = []
+    for size in sizes:
+        baseline, revised, truth = synthetic_contracts(size, seed)
+        for scorer in MatchScorer:
+            started = time.perf_counter()
+            matches = match_clauses(baseline, revised, scorer=scorer)
+            elapsed = time.perf_counter() - started
+            found = {
+                match.revised.clause_id: match.baseline.clause_id if match.baseline else None
+                for match in matches
+                if match.revised is not None
+            }
+            correct = sum(found[clause_id] == origin for clause_id, origin in truth.items())
+            matched = sum(origin is not None for origin in found.values())
+            rows.append(
+                BenchmarkRow(size, scorer, elapsed, matched, correct / len(truth))
+            )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    sizes = tuple(int(arg) for arg in args) or DEFAULT_SIZES
+    table = Table(title="Clause matcher benchmark")
+    table.add_column("Clauses", justify="right")
+    table.add_column("Scorer")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Matched", justify="right")
+    table.add_column("Accuracy", justify="right")
+    for row in run_benchmark(sizes):
+        table.add_row(
+            str(row.clauses),
+            row.scorer.value,
+            f"{row.seconds:.3f}",
+            str(row.matched),
+            f"{row.accuracy:.1%}",
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
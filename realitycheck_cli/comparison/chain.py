@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from realitycheck_cli.analysis.rules import RuleSet
+from realitycheck_cli.analysis.schemas import (
+    ClauseAnalysis,
+    ClauseLineage,
+    ContractAnalysisResult,
+    DeltaType,
+    LineagePoint,
+    RevisionChainResult,
+)
+from realitycheck_cli.comparison.delta_engine import compare_contract_results
+from realitycheck_cli.comparison.matcher import MatchScorer, match_clauses
+
+
+def _point(
+    version_index: int,
+    result: ContractAnalysisResult,
+    clause: ClauseAnalysis,
+    delta_type: DeltaType | None,
+) -> LineagePoint:
+    return LineagePoint(
+        version_index=version_index,
+        contract_id=result.contract_id,
+        clause_id=clause.clause_id,
+        title=clause.title,
+        risk_score=clause.risk_score,
+        delta_type=delta_type,
+    )
+
+
+def build_revision_chain(
+    results: list[ContractAnalysisResult],
+    high_risk_threshold: int = 70,
+    rules: RuleSet | None = None,
+    scorer: MatchScorer = MatchScorer.SEQUENCE,
+) -> RevisionChainResult:
+    if len(results) < 2:
+        raise ValueError("A revision chain needs at least two contract versions.")
+
+    lineages: list[ClauseLineage] = []
+    active: dict[str, ClauseLineage] = {}
+
+    def start_lineage(point: LineagePoint) -> ClauseLineage:
+        lineage = ClauseLineage(
+            lineage_id=f"L-{len(lineages) + 1:03d}",
+            points=[point],
+            risk_trajectory=[None] * len(results),
+        )
+        lineage.risk_trajectory[point.version_index] = point.risk_score
+        lineages.append(lineage)
+        return lineage
+
+    first = results[0]
+    for clause in first.clauses:
+        active[clause.clause_id] = start_lineage(_point(0, first, clause, None))
+
+    comparisons = []
+    for version_index in range(1, len(results)):
+        previous = results[version_index - 1]
+        current = results[version_index]
+        matches = match_clauses(previous.clauses, current.clauses, scorer=scorer)
+        comparison = compare_contract_results(
+            baseline=previous,
+            revised=current,
+            high_risk_threshold=high_risk_threshold,
+            matches=matches,
+            rules=rules,
+        )
+        comparisons.append(comparison)
+        delta_types = {
+            (delta.baseline_clause_id, delta.revised_clause_id): delta.delta_type
+            for delta in comparison.deltas
+        }
+
+        next_active: dict[str, ClauseLineage] = {}
+        for match in matches:
+            baseline_id = match.baseline.clause_id if match.baseline else None
+            revised_id = match.revised.clause_id if match.revised else None
+            delta_type = delta_types.get((baseline_id, revised_id))
+            if match.revised is None and baseline_id is not None:
+                active[baseline_id].points.append(
+                    LineagePoint(
+                        version_index=version_index,
+                        contract_id=current.contract_id,
+                        delta_type=DeltaType.REMOVED,
+                    )
+                )
+                continue
+            if match.revised is None:
+                continue
+            point = _point(version_index, current, match.revised, delta_type)
+            if baseline_id is None:
+                lineage = start_lineage(point)
+            else:
+                lineage = active[baseline_id]
+                lineage.points.append(point)
+                lineage.risk_trajectory[version_index] = point.risk_score
+            next_active[match.revised.clause_id] = lineage
+
+        for flag in comparison.flags:
+            lineage = next_active.get(flag.clause_id)
+            if lineage is not None:
+                lineage.flags.append(flag)
+        active = next_active
+
+    return RevisionChainResult(
+        contract_ids=[result.contract_id for result in results],
+        comparisons=comparisons,
+        lineages=lineages,
+    )
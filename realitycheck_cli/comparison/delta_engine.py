@@ -2,46 +2,121 @@ from __future__ import annotations
 
 import re
 
+from realitycheck_cli.analysis.heuristics import locate_signals, scan_markers
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, INDEMNITY_MARKERS, RuleSet
 from realitycheck_cli.analysis.schemas import (
     ClauseAnalysis,
     ClauseCategory,
     ClauseDelta,
+    ClauseTerm,
     ComparisonFlag,
     ComparisonResult,
     ContractAnalysisResult,
     DeltaType,
+    RedlineSpan,
     Severity,
 )
+from realitycheck_cli.analysis.terms import clause_terms, duration_in_months
 from realitycheck_cli.clauses.normalizer import normalize_clause_text
-from realitycheck_cli.comparison.matcher import match_clauses
-
-_LIABILITY_EXPANSION_PATTERNS = (
-    r"\bunlimited liability\b",
-    r"\bliability shall not be limited\b",
-    r"\bindemnif(?:y|ication).{0,40}all\b",
-)
-_NON_COMPETE_DURATION_RE = re.compile(
-    r"(\d+)\s*(day|days|month|months|year|years)", re.IGNORECASE
+from realitycheck_cli.comparison.matcher import (
+    ClauseMatch,
+    ClauseMatchIndex,
+    MatchScorer,
+    match_clauses,
 )
+from realitycheck_cli.comparison.redline import TriggerRegion, build_redline
+
+_INDEMNIFY_ALL_RE = re.compile(r"\bindemnif(?:y|ication).{0,40}all\b")
+
+
+def _duration_terms(clause: ClauseAnalysis) -> list[ClauseTerm]:
+    return [term for term in clause_terms(clause) if duration_in_months(term) > 0]
+
+
+def _duration_in_months(clause: ClauseAnalysis) -> int:
+    return max((duration_in_months(term) for term in _duration_terms(clause)), default=0)
 
 
-def _duration_in_months(text: str) -> int:
-    months = 0
-    for amount_raw, unit in _NON_COMPETE_DURATION_RE.findall(text):
-        amount = int(amount_raw)
-        unit_lower = unit.lower()
-        if unit_lower.startswith("day"):
-            months = max(months, max(1, amount // 30))
-        elif unit_lower.startswith("month"):
-            months = max(months, amount)
-        elif unit_lower.startswith("year"):
-            months = max(months, amount * 12)
-    return months
+def _has_liability_expansion(text: str, rules: RuleSet) -> bool:
+    scan = scan_markers(text, rules)
+    if scan.has_any(rules.liability_expansion_markers):
+        return True
+    return scan.has_any(INDEMNITY_MARKERS) and bool(_INDEMNIFY_ALL_RE.search(text.lower()))
 
 
-def _has_liability_expansion(text: str) -> bool:
-    lowered = text.lower()
-    return any(re.search(pattern, lowered) for pattern in _LIABILITY_EXPANSION_PATTERNS)
+def _signal_regions(
+    clause: ClauseAnalysis,
+    keys: set[tuple[str, str]],
+    prefix: str,
+    rules: RuleSet,
+) -> list[TriggerRegion]:
+    regions: list[TriggerRegion] = []
+    located: set[tuple[str, str]] = set()
+    for rule, hit in locate_signals(clause.text, rules):
+        key = (rule.signal_type.value, rule.label)
+        if key in keys:
+            regions.append(TriggerRegion(hit.start, hit.end, f"{prefix}:{rule.label}"))
+            located.add(key)
+    # Signals the rules cannot place (LLM-reported ones) fall back to their
+    # recorded evidence offsets, or to searching for the evidence text.
+    for signal in clause.signals:
+        key = (signal.type.value, signal.label)
+        if key not in keys or key in located:
+            continue
+        label = f"{prefix}:{signal.label}"
+        if signal.start is not None and signal.end is not None:
+            regions.append(TriggerRegion(signal.start, signal.end, label))
+        elif signal.evidence:
+            start = clause.text.find(signal.evidence)
+            if start >= 0:
+                regions.append(TriggerRegion(start, start + len(signal.evidence), label))
+    return regions
+
+
+def _flag_regions(
+    clause: ClauseAnalysis, flag_types: set[str], rules: RuleSet
+) -> list[TriggerRegion]:
+    regions: list[TriggerRegion] = []
+    if "EXPANDED_LIABILITY" in flag_types:
+        for hit in scan_markers(clause.text, rules).hits:
+            if hit.phrase in rules.liability_expansion_markers:
+                regions.append(TriggerRegion(hit.start, hit.end, "EXPANDED_LIABILITY"))
+        for match in _INDEMNIFY_ALL_RE.finditer(clause.text.lower()):
+            regions.append(TriggerRegion(match.start(), match.end(), "EXPANDED_LIABILITY"))
+    if "EXTENDED_NON_COMPETE" in flag_types:
+        for term in _duration_terms(clause):
+            regions.append(TriggerRegion(term.start, term.end, "EXTENDED_NON_COMPETE"))
+    return regions
+
+
+def _build_clause_redline(
+    baseline_clause: ClauseAnalysis,
+    revised_clause: ClauseAnalysis,
+    flag_types: set[str],
+    rules: RuleSet,
+) -> list[RedlineSpan]:
+    baseline_keys = {(signal.type.value, signal.label) for signal in baseline_clause.signals}
+    revised_keys = {(signal.type.value, signal.label) for signal in revised_clause.signals}
+    added_regions = _signal_regions(
+        revised_clause, revised_keys - baseline_keys, "SIGNAL_ADDED", rules
+    )
+    if "NEW_RISK" in flag_types:
+        # The risk jump comes from the new signals, so they carry the flag too.
+        added_regions += [
+            TriggerRegion(region.start, region.end, "NEW_RISK") for region in added_regions
+        ]
+    baseline_regions = _signal_regions(
+        baseline_clause, baseline_keys - revised_keys, "SIGNAL_REMOVED", rules
+    )
+    baseline_regions += _flag_regions(
+        baseline_clause, flag_types & {"EXTENDED_NON_COMPETE"}, rules
+    )
+    return build_redline(
+        baseline_clause.text,
+        revised_clause.text,
+        baseline_triggers=baseline_regions,
+        revised_triggers=added_regions + _flag_regions(revised_clause, flag_types, rules),
+    )
 
 
 def _severity_from_risk(score: int) -> Severity:
@@ -74,13 +149,24 @@ def compare_contract_results(
     baseline: ContractAnalysisResult,
     revised: ContractAnalysisResult,
     high_risk_threshold: int = 70,
+    baseline_index: ClauseMatchIndex | None = None,
+    matches: list[ClauseMatch] | None = None,
+    rules: RuleSet | None = None,
+    scorer: MatchScorer = MatchScorer.SEQUENCE,
 ) -> ComparisonResult:
+    rules = rules or DEFAULT_RULES
     deltas: list[ClauseDelta] = []
     flags: list[ComparisonFlag] = []
+    if matches is None:
+        matches = match_clauses(
+            baseline.clauses, revised.clauses, index=baseline_index, scorer=scorer
+        )
 
-    for match in match_clauses(baseline.clauses, revised.clauses):
+    for match in matches:
         baseline_clause = match.baseline
         revised_clause = match.revised
+        pair_flags_start = len(flags)
+        modified_delta: ClauseDelta | None = None
 
         if baseline_clause is None and revised_clause is not None:
             deltas.append(
@@ -132,19 +218,18 @@ def compare_contract_results(
             )
         else:
             risk_delta = revised_clause.risk_score - baseline_clause.risk_score
-            deltas.append(
-                ClauseDelta(
-                    delta_type=DeltaType.MODIFIED,
-                    baseline_clause_id=baseline_clause.clause_id,
-                    revised_clause_id=revised_clause.clause_id,
+            modified_delta = ClauseDelta(
+                delta_type=DeltaType.MODIFIED,
+                baseline_clause_id=baseline_clause.clause_id,
+                revised_clause_id=revised_clause.clause_id,
+                risk_delta=risk_delta,
+                reason=_build_modified_delta_reason(
+                    baseline_clause=baseline_clause,
+                    revised_clause=revised_clause,
                     risk_delta=risk_delta,
-                    reason=_build_modified_delta_reason(
-                        baseline_clause=baseline_clause,
-                        revised_clause=revised_clause,
-                        risk_delta=risk_delta,
-                    ),
-                )
+                ),
             )
+            deltas.append(modified_delta)
             if risk_delta >= 20:
                 flags.append(
                     ComparisonFlag(
@@ -161,9 +246,9 @@ def compare_contract_results(
             baseline_clause.category == ClauseCategory.LIABILITY
             and revised_clause.category == ClauseCategory.LIABILITY
             and (
-                _has_liability_expansion(revised_clause.text)
+                _has_liability_expansion(revised_clause.text, rules)
                 and (
-                    not _has_liability_expansion(baseline_clause.text)
+                    not _has_liability_expansion(baseline_clause.text, rules)
                     or revised_clause.risk_score > baseline_clause.risk_score
                 )
             )
@@ -181,8 +266,8 @@ def compare_contract_results(
             baseline_clause.category == ClauseCategory.NON_COMPETE
             and revised_clause.category == ClauseCategory.NON_COMPETE
         ):
-            baseline_months = _duration_in_months(baseline_clause.text)
-            revised_months = _duration_in_months(revised_clause.text)
+            baseline_months = _duration_in_months(baseline_clause)
+            revised_months = _duration_in_months(revised_clause)
             if revised_months > baseline_months and revised_months > 0:
                 flags.append(
                     ComparisonFlag(
@@ -195,6 +280,16 @@ def compare_contract_results(
                     )
                 )
 
+        if modified_delta is not None:
+            # The redline is built once the pair's flags are known so the spans
+            # that caused them can be marked.
+            modified_delta.redline = _build_clause_redline(
+                baseline_clause,
+                revised_clause,
+                {flag.type for flag in flags[pair_flags_start:]},
+                rules,
+            )
+
     overall_delta = revised.summary.overall_risk_score - baseline.summary.overall_risk_score
     leverage_delta = revised.summary.leverage_index - baseline.summary.leverage_index
     return ComparisonResult(
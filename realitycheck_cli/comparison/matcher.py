@@ -2,9 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+from enum import Enum
 
 from realitycheck_cli.analysis.schemas import ClauseAnalysis
 from realitycheck_cli.clauses.normalizer import canonical_title, normalize_clause_text
+from realitycheck_cli.comparison.similarity import TfidfSpace, text_features, title_features
+
+_TEXT_PREFIX_CHARS = 1200
+_TITLE_WEIGHT = 0.7
+_TEXT_WEIGHT = 0.3
+
+
+class MatchScorer(str, Enum):
+    SEQUENCE = "sequence"
+    TFIDF = "tfidf"
 
 
 @dataclass(frozen=True)
@@ -14,38 +25,130 @@ class ClauseMatch:
     similarity: float
 
 
-def _score_match(baseline: ClauseAnalysis, revised: ClauseAnalysis) -> float:
-    title_similarity = SequenceMatcher(
-        None,
-        canonical_title(baseline.title),
-        canonical_title(revised.title),
-    ).ratio()
-    baseline_text = normalize_clause_text(baseline.text)[:1200]
-    revised_text = normalize_clause_text(revised.text)[:1200]
-    text_similarity = SequenceMatcher(None, baseline_text, revised_text).ratio()
-    return (0.7 * title_similarity) + (0.3 * text_similarity)
+@dataclass(frozen=True)
+class ClauseMatchIndex:
+    clauses: tuple[ClauseAnalysis, ...]
+    titles: tuple[str, ...]
+    texts: tuple[str, ...]
+    exact: dict[tuple[str, str], tuple[int, ...]]
+    scorer: MatchScorer = MatchScorer.SEQUENCE
+    title_space: TfidfSpace | None = None
+    text_space: TfidfSpace | None = None
+
+
+def build_match_index(
+    clauses: list[ClauseAnalysis],
+    scorer: MatchScorer = MatchScorer.SEQUENCE,
+) -> ClauseMatchIndex:
+    titles: list[str] = []
+    texts: list[str] = []
+    full_texts: list[str] = []
+    exact: dict[tuple[str, str], list[int]] = {}
+    for idx, clause in enumerate(clauses):
+        title = canonical_title(clause.title)
+        text = normalize_clause_text(clause.text)
+        titles.append(title)
+        texts.append(text[:_TEXT_PREFIX_CHARS])
+        full_texts.append(text)
+        exact.setdefault((title, text), []).append(idx)
+    title_space = text_space = None
+    if scorer == MatchScorer.TFIDF:
+        # TF-IDF looks at the whole clause, not just the SequenceMatcher prefix.
+        title_space = TfidfSpace([title_features(title) for title in titles])
+        text_space = TfidfSpace([text_features(text) for text in full_texts])
+    return ClauseMatchIndex(
+        clauses=tuple(clauses),
+        titles=tuple(titles),
+        texts=tuple(texts),
+        exact={key: tuple(indices) for key, indices in exact.items()},
+        scorer=scorer,
+        title_space=title_space,
+        text_space=text_space,
+    )
+
+
+def _tfidf_scores(
+    index: ClauseMatchIndex, revised: list[tuple[str, str]]
+) -> list[list[float]]:
+    assert index.title_space is not None and index.text_space is not None
+    title_rows = index.title_space.similarity_matrix(
+        title_features(title) for title, _ in revised
+    )
+    text_rows = index.text_space.similarity_matrix(text_features(text) for _, text in revised)
+    return [
+        [
+            _TITLE_WEIGHT * title_score + _TEXT_WEIGHT * text_score
+            for title_score, text_score in zip(title_row, text_row)
+        ]
+        for title_row, text_row in zip(title_rows, text_rows)
+    ]
+
+
+def _best_candidate(
+    index: ClauseMatchIndex,
+    baseline_unused: set[int],
+    revised_title: str,
+    revised_text: str,
+) -> tuple[int | None, float]:
+    # seq2 is cached by SequenceMatcher, so keep the revised side fixed and
+    # only swap the baseline side in per candidate.
+    title_matcher = SequenceMatcher(None, "", revised_title)
+    text_matcher = SequenceMatcher(None, "", revised_text[:_TEXT_PREFIX_CHARS])
+    best_index = None
+    best_score = 0.0
+    for idx in baseline_unused:
+        title_matcher.set_seq1(index.titles[idx])
+        title_score = _TITLE_WEIGHT * title_matcher.ratio()
+        text_matcher.set_seq1(index.texts[idx])
+        if title_score + _TEXT_WEIGHT * text_matcher.real_quick_ratio() <= best_score:
+            continue
+        score = title_score + _TEXT_WEIGHT * text_matcher.ratio()
+        if score > best_score:
+            best_score = score
+            best_index = idx
+    return best_index, best_score
 
 
 def match_clauses(
     baseline_clauses: list[ClauseAnalysis],
     revised_clauses: list[ClauseAnalysis],
     threshold: float = 0.55,
+    index: ClauseMatchIndex | None = None,
+    scorer: MatchScorer = MatchScorer.SEQUENCE,
 ) -> list[ClauseMatch]:
-    baseline_unused = set(range(len(baseline_clauses)))
+    # A prebuilt index carries its own scorer.
+    if index is None:
+        index = build_match_index(baseline_clauses, scorer=scorer)
+    baseline_unused = set(range(len(index.clauses)))
     matches: list[ClauseMatch] = []
 
-    for revised in revised_clauses:
-        best_index = None
-        best_score = 0.0
-        for idx in baseline_unused:
-            score = _score_match(baseline_clauses[idx], revised)
-            if score > best_score:
-                best_score = score
-                best_index = idx
+    normalized = [
+        (canonical_title(revised.title), normalize_clause_text(revised.text))
+        for revised in revised_clauses
+    ]
+    score_rows = _tfidf_scores(index, normalized) if index.scorer == MatchScorer.TFIDF else None
+
+    for position, revised in enumerate(revised_clauses):
+        revised_title, revised_text = normalized[position]
+        exact = [
+            idx
+            for idx in index.exact.get((revised_title, revised_text), ())
+            if idx in baseline_unused
+        ]
+        if exact:
+            best_index, best_score = exact[0], 1.0
+        elif score_rows is not None:
+            row = score_rows[position]
+            best_index = max(baseline_unused, key=lambda idx: (row[idx], -idx), default=None)
+            best_score = row[best_index] if best_index is not None else 0.0
+        else:
+            best_index, best_score = _best_candidate(
+                index, baseline_unused, revised_title, revised_text
+            )
         if best_index is not None and best_score >= threshold:
             matches.append(
                 ClauseMatch(
-                    baseline=baseline_clauses[best_index],
+                    baseline=index.clauses[best_index],
                     revised=revised,
                     similarity=round(best_score, 3),
                 )
@@ -57,10 +160,9 @@ def match_clauses(
     for idx in sorted(baseline_unused):
         matches.append(
             ClauseMatch(
-                baseline=baseline_clauses[idx],
+                baseline=index.clauses[idx],
                 revised=None,
                 similarity=0.0,
             )
         )
     return matches
-
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+import re
+
+from realitycheck_cli.analysis.schemas import RedlineOp, RedlineSpan
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+# Myers runs in O((N + M) * D); past this many edits the clauses share too
+# little for a token diff to read well, so the changed middle is reported as
+# one deletion and one insertion instead.
+MAX_EDIT_COST = 1000
+
+
+@dataclass(frozen=True)
+class TriggerRegion:
+    start: int
+    end: int
+    label: str
+
+
+@dataclass(frozen=True)
+class _Tokens:
+    ids: list[int]
+    offsets: list[tuple[int, int]]
+
+
+def _tokenize(text: str, vocabulary: dict[str, int]) -> _Tokens:
+    ids: list[int] = []
+    offsets: list[tuple[int, int]] = []
+    for match in _TOKEN_RE.finditer(text):
+        ids.append(vocabulary.setdefault(match.group(), len(vocabulary)))
+        offsets.append(match.span())
+    return _Tokens(ids=ids, offsets=offsets)
+
+
+def _backtrack(trace: list[list[int]], n: int, m: int) -> list[tuple[RedlineOp, int]]:
+    # trace[d] holds the furthest x reached on diagonals -d..d after d edits,
+    # indexed by k + d.
+    edits: list[tuple[RedlineOp, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d - 1] < previous[k + 1 + d - 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = previous[prev_k + d - 1]
+        prev_y = prev_x - prev_k
+        if prev_k == k + 1:
+            edits.append((RedlineOp.INSERT, prev_y))
+        else:
+            edits.append((RedlineOp.DELETE, prev_x))
+        x, y = prev_x, prev_y
+    edits.reverse()
+    return edits
+
+
+def _myers(
+    a: Sequence[int], b: Sequence[int], max_cost: int
+) -> list[tuple[RedlineOp, int]] | None:
+    n, m = len(a), len(b)
+    limit = min(n + m, max_cost)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace: list[list[int]] = []
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                trace.append(v[offset - d : offset + d + 1])
+                return _backtrack(trace, n, m)
+        trace.append(v[offset - d : offset + d + 1])
+    return None
+
+
+def diff_tokens(
+    a: Sequence[int], b: Sequence[int], max_cost: int = MAX_EDIT_COST
+) -> list[tuple[RedlineOp, int]]:
+    # Returns the deleted indices of a and the inserted indices of b, in order.
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-suffix - 1] == b[-suffix - 1]:
+        suffix += 1
+    middle_a = a[prefix : len(a) - suffix]
+    middle_b = b[prefix : len(b) - suffix]
+
+    edits = _myers(middle_a, middle_b, max_cost)
+    if edits is None:
+        edits = [(RedlineOp.DELETE, idx) for idx in range(len(middle_a))]
+        edits += [(RedlineOp.INSERT, idx) for idx in range(len(middle_b))]
+    return [(op, idx + prefix) for op, idx in edits]
+
+
+def _mark(span_start: int, span_end: int, regions: Iterable[TriggerRegion]) -> list[str]:
+    labels: list[str] = []
+    for region in regions:
+        if span_start < region.end and region.start < span_end and region.label not in labels:
+            labels.append(region.label)
+    return labels
+
+
+def build_redline(
+    baseline_text: str,
+    revised_text: str,
+    baseline_triggers: Sequence[TriggerRegion] = (),
+    revised_triggers: Sequence[TriggerRegion] = (),
+    max_cost: int = MAX_EDIT_COST,
+) -> list[RedlineSpan]:
+    vocabulary: dict[str, int] = {}
+    baseline = _tokenize(baseline_text, vocabulary)
+    revised = _tokenize(revised_text, vocabulary)
+
+    # Consecutive token edits of the same kind collapse into a single span.
+    runs: list[tuple[RedlineOp, int, int]] = []
+    for op, idx in diff_tokens(baseline.ids, revised.ids, max_cost):
+        if runs and runs[-1][0] == op and runs[-1][2] == idx:
+            runs[-1] = (op, runs[-1][1], idx + 1)
+        else:
+            runs.append((op, idx, idx + 1))
+
+    spans: list[RedlineSpan] = []
+    for op, first, last in runs:
+        if op == RedlineOp.DELETE:
+            tokens, text, regions = baseline, baseline_text, baseline_triggers
+        else:
+            tokens, text, regions = revised, revised_text, revised_triggers
+        start = tokens.offsets[first][0]
+        end = tokens.offsets[last - 1][1]
+        spans.append(
+            RedlineSpan(
+                op=op,
+                start=start,
+                end=end,
+                text=text[start:end],
+                triggers=_mark(start, end, regions),
+            )
+        )
+    return spans
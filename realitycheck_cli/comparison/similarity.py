@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+import math
+import re
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+SparseVector = dict[int, float]
+
+
+def title_features(title: str) -> Counter[str]:
+    # Character trigrams keep "Payment" close to "Payment Terms" the way the
+    # character-level SequenceMatcher score does.
+    padded = f" {title} "
+    return Counter(padded[idx : idx + 3] for idx in range(len(padded) - 2))
+
+
+def text_features(text: str) -> Counter[str]:
+    words = _WORD_RE.findall(text)
+    features = Counter(words)
+    features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return features
+
+
+class TfidfSpace:
+    def __init__(self, documents: Sequence[Counter[str]]) -> None:
+        # Document frequencies come from the indexed (baseline) clauses only, so
+        # the space is built once and reused against any number of revisions.
+        self.vocabulary: dict[str, int] = {}
+        document_frequency: list[int] = []
+        for features in documents:
+            for term in features:
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                if term_id == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[term_id] += 1
+        count = len(documents)
+        self.idf = [math.log((1 + count) / (1 + df)) + 1 for df in document_frequency]
+        self._unseen_idf = math.log(1 + count) + 1
+
+        self.size = count
+        # Postings are kept as parallel id/weight lists, which the scoring loop
+        # walks noticeably faster than a list of tuples.
+        self.postings: dict[int, tuple[list[int], list[float]]] = {}
+        for doc_id, features in enumerate(documents):
+            for term_id, weight in self.vectorize(features).items():
+                doc_ids, weights = self.postings.setdefault(term_id, ([], []))
+                doc_ids.append(doc_id)
+                weights.append(weight)
+
+    def vectorize(self, features: Counter[str]) -> SparseVector:
+        weights: SparseVector = {}
+        norm = 0.0
+        for term, frequency in features.items():
+            term_id = self.vocabulary.get(term)
+            weight = (1 + math.log(frequency)) * (
+                self.idf[term_id] if term_id is not None else self._unseen_idf
+            )
+            norm += weight * weight
+            # Terms the indexed side never uses still count towards the norm,
+            # but cannot contribute to any dot product.
+            if term_id is not None:
+                weights[term_id] = weight
+        if not norm:
+            return {}
+        scale = 1 / math.sqrt(norm)
+        return {term_id: weight * scale for term_id, weight in weights.items()}
+
+    def similarities(self, vector: SparseVector) -> list[float]:
+        # One row of the sparse product: only the postings of terms the vector
+        # actually holds are visited.
+        scores = [0.0] * self.size
+        for term_id, weight in vector.items():
+            posting = self.postings.get(term_id)
+            if posting is None:
+                continue
+            for doc_id, doc_weight in zip(*posting):
+                scores[doc_id] += weight * doc_weight
+        return scores
+
+    def similarity_matrix(self, documents: Iterable[Counter[str]]) -> list[list[float]]:
+        # Cosine similarity of every document against every indexed one.
+        return [self.similarities(self.vectorize(features)) for features in documents]
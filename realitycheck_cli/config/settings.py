@@ -10,6 +10,17 @@ class Settings:
     gemini_model: str
     high_risk_threshold: int
     llm_timeout_seconds: int
+    memory_budget_mb: int | None = None
+    spill_pages: bool = False
+    detect_structure: bool = False
+    llm_max_retries: int = 2
+    llm_hedge: bool = False
+    llm_input_cost_per_mtok: float | None = None
+    llm_output_cost_per_mtok: float | None = None
+    match_scorer: str = "sequence"
+    category_model_path: str | None = None
+    max_clause_chars: int | None = None
+    clause_window_chars: int = 12_000
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -25,10 +36,56 @@ class Settings:
             timeout = int(timeout_raw)
         except ValueError as exc:
             raise ValueError("REALITYCHECK_LLM_TIMEOUT must be an integer.") from exc
+        budget_raw = os.getenv("REALITYCHECK_MEMORY_BUDGET_MB")
+        try:
+            memory_budget = int(budget_raw) if budget_raw else None
+        except ValueError as exc:
+            raise ValueError("REALITYCHECK_MEMORY_BUDGET_MB must be an integer.") from exc
+        spill_raw = os.getenv("REALITYCHECK_SPILL_PAGES", "")
+        structure_raw = os.getenv("REALITYCHECK_DETECT_STRUCTURE", "")
+        retries_raw = os.getenv("REALITYCHECK_LLM_MAX_RETRIES", "2")
+        try:
+            max_retries = int(retries_raw)
+        except ValueError as exc:
+            raise ValueError("REALITYCHECK_LLM_MAX_RETRIES must be an integer.") from exc
+        hedge_raw = os.getenv("REALITYCHECK_LLM_HEDGE", "")
+        costs: dict[str, float | None] = {}
+        for name in ("REALITYCHECK_LLM_INPUT_COST", "REALITYCHECK_LLM_OUTPUT_COST"):
+            cost_raw = os.getenv(name)
+            try:
+                costs[name] = max(0.0, float(cost_raw)) if cost_raw else None
+            except ValueError as exc:
+                raise ValueError(f"{name} must be a number.") from exc
+        clause_chars_raw = os.getenv("REALITYCHECK_MAX_CLAUSE_CHARS")
+        try:
+            max_clause_chars = int(clause_chars_raw) if clause_chars_raw else None
+        except ValueError as exc:
+            raise ValueError("REALITYCHECK_MAX_CLAUSE_CHARS must be an integer.") from exc
+        window_raw = os.getenv("REALITYCHECK_CLAUSE_WINDOW_CHARS", "12000")
+        try:
+            window_chars = int(window_raw)
+        except ValueError as exc:
+            raise ValueError("REALITYCHECK_CLAUSE_WINDOW_CHARS must be an integer.") from exc
+        match_scorer = os.getenv("REALITYCHECK_MATCH_SCORER", "sequence").strip().lower()
+        if match_scorer not in {"sequence", "tfidf"}:
+            raise ValueError("REALITYCHECK_MATCH_SCORER must be 'sequence' or 'tfidf'.")
         return cls(
             gemini_api_key=os.getenv("GEMINI_API_KEY"),
             gemini_model=os.getenv("REALITYCHECK_GEMINI_MODEL", "gemini-3-flash-preview"),
             high_risk_threshold=max(1, min(100, threshold)),
             llm_timeout_seconds=max(5, timeout),
+            memory_budget_mb=max(1, memory_budget) if memory_budget is not None else None,
+            spill_pages=spill_raw.strip().lower() in {"1", "true", "yes", "on"},
+            detect_structure=structure_raw.strip().lower() in {"1", "true", "yes", "on"},
+            llm_max_retries=max(0, min(10, max_retries)),
+            llm_hedge=hedge_raw.strip().lower() in {"1", "true", "yes", "on"},
+            llm_input_cost_per_mtok=costs["REALITYCHECK_LLM_INPUT_COST"],
+            llm_output_cost_per_mtok=costs["REALITYCHECK_LLM_OUTPUT_COST"],
+            match_scorer=match_scorer,
+            category_model_path=os.getenv("REALITYCHECK_CATEGORY_MODEL") or None,
+            max_clause_chars=(
+                max(1000, max_clause_chars) if max_clause_chars is not None else None
+            ),
+            clause_window_chars=max(2000, window_chars),
         )
 
@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import os
+from pathlib import Path
+import threading
+import time
+from typing import TypeVar
+
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.category_model import CategoryModel, load_category_model
+from realitycheck_cli.analysis.classifier import (
+    ASYNC_LLM_CONCURRENCY,
+    ASYNC_LLM_THREADS,
+    ClauseProgress,
+    analyze_clauses,
+    analyze_clauses_async,
+)
+from realitycheck_cli.analysis.llm_client import LLMClient
+from realitycheck_cli.analysis.llm_transport import LLMTransport
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, RuleSet
+from realitycheck_cli.analysis.triage import (
+    DEFAULT_TRIAGE_PAGES,
+    select_triage_pages,
+    triage_confidence,
+)
+from realitycheck_cli.analysis.schemas import (
+    Clause,
+    ClauseAnalysis,
+    ComparisonResult,
+    ContractAnalysisResult,
+    ContractRiskSummary,
+    LLMUsage,
+    TriageResult,
+)
+from realitycheck_cli.batch import StageCallback
+from realitycheck_cli.clauses.splitter import split_into_clauses
+from realitycheck_cli.comparison.delta_engine import compare_contract_results
+from realitycheck_cli.comparison.matcher import MatchScorer
+from realitycheck_cli.config.settings import Settings
+from realitycheck_cli.ingest.pdf_parser import (
+    PageTextCache,
+    PdfSource,
+    SpilledPages,
+    read_pdf,
+    read_pdf_quick,
+)
+from realitycheck_cli.ingest.text_cleaner import clean_pages
+from realitycheck_cli.negotiation.email_generator import generate_negotiation_email
+from realitycheck_cli.scoring.leverage import (
+    compute_ambiguity_index,
+    compute_leverage_index,
+    compute_protection_coverage,
+)
+from realitycheck_cli.scoring.power_imbalance import compute_power_imbalance
+from realitycheck_cli.scoring.risk_engine import compute_contract_scores
+
+_SHARED_ANALYZERS = 8
+
+_T = TypeVar("_T")
+
+
+def _no_stage(name: str) -> None:
+    return None
+
+
+def _contract_id(source: PdfSource, contract_id: str | None) -> str:
+    if isinstance(source, Path):
+        return contract_id or source.stem
+    if contract_id is None:
+        raise ValueError("contract_id is required when analyzing an in-memory PDF.")
+    return contract_id
+
+
+def _folder_tail(folder: Path, depth: int) -> tuple[str, ...]:
+    return folder.parts[len(folder.parts) - depth :]
+
+
+def unique_contract_ids(paths: Sequence[Path]) -> list[str]:
+    # Contract ids default to the file stem, but revisions are often saved
+    # under one file name in different folders. Stems shared by different
+    # files get as many parent folders as it takes to tell them apart, and
+    # the extension when only the extension differs.
+    resolved = [path.resolve() for path in paths]
+    by_stem: dict[str, set[Path]] = {}
+    for path in resolved:
+        by_stem.setdefault(path.stem, set()).add(path)
+    ids: list[str] = []
+    for original, path in zip(paths, resolved):
+        members = by_stem[path.stem]
+        if len(members) == 1:
+            ids.append(original.stem)
+            continue
+        folders = {member.parent for member in members}
+        depth = 0
+        while len({_folder_tail(folder, depth) for folder in folders}) < len(folders):
+            depth += 1
+        shares_folder = sum(member.parent == path.parent for member in members) > 1
+        name = path.name if shares_folder else path.stem
+        ids.append("/".join([*_folder_tail(path.parent, depth), name]))
+    return ids
+
+
+@dataclass(frozen=True)
+class _LoadedContract:
+    contract_id: str
+    source_path: str
+    content_hash: str
+    clauses: list[Clause]
+    previous_analyses: list[ClauseAnalysis] | None
+    registry: BoilerplateRegistry | None
+
+
+def remaining_budget(
+    budget_tokens: int | None, results: list[ContractAnalysisResult]
+) -> int | None:
+    if budget_tokens is None:
+        return None
+    spent = sum(result.llm_usage.total_tokens for result in results if result.llm_usage)
+    return max(0, budget_tokens - spent)
+
+
+def share_budget(budget_tokens: int | None, parts: int) -> int | None:
+    # Parallel workers cannot draw on one shared counter, so each gets an
+    # equal slice of what is left.
+    if budget_tokens is None:
+        return None
+    return budget_tokens // max(1, parts)
+
+
+def _category_model(settings: Settings) -> CategoryModel | None:
+    if not settings.category_model_path:
+        return None
+    return load_category_model(Path(settings.category_model_path))
+
+
+def _llm_mode(use_llm: bool | None) -> str:
+    if use_llm is None:
+        return "unknown"
+    return "on" if use_llm else "off"
+
+
+def _cap_clauses(clauses: list[Clause], max_chars: int | None) -> list[Clause]:
+    if max_chars is None:
+        return clauses
+    return [
+        clause
+        if len(clause.text) <= max_chars
+        else clause.model_copy(update={"text": clause.text[:max_chars]})
+        for clause in clauses
+    ]
+
+
+class Analyzer:
+    # Holds everything that is built once per configuration: the compiled
+    # rules, the learned category model, the LLM client with its transport
+    # and circuit breaker, and the page and boilerplate caches. Calls only
+    # carry per-contract state, so one instance may serve many threads.
+    def __init__(
+        self,
+        settings: Settings,
+        rules: RuleSet | None = None,
+        use_llm: bool = False,
+        registry: BoilerplateRegistry | None = None,
+        page_cache: PageTextCache | None = None,
+        llm_transport: LLMTransport | None = None,
+    ) -> None:
+        self.settings = settings
+        self.rules = rules or DEFAULT_RULES
+        self.use_llm = use_llm
+        self.registry = registry
+        self.page_cache = page_cache
+        self.category_model = _category_model(settings)
+        self.model_version = (
+            self.category_model.version if self.category_model is not None else None
+        )
+        # Registry entries hold finished analyses, so a learned category model
+        # is part of what they were built with.
+        self.registry_version = (
+            self.rules.version
+            if self.model_version is None
+            else f"{self.rules.version}+{self.model_version}"
+        )
+        self._llm_transport = llm_transport
+        self._llm_client: LLMClient | None = None
+        self._llm_executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Analyzer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._llm_client is not None:
+                self._llm_client.close()
+                self._llm_client = None
+            if self._llm_executor is not None:
+                self._llm_executor.shutdown(wait=False, cancel_futures=True)
+                self._llm_executor = None
+
+    def _shared_llm_client(self) -> LLMClient:
+        # Built on first use so a configuration error surfaces on the first
+        # LLM-enabled call, as it did before the client was shared.
+        with self._lock:
+            if self._llm_client is None:
+                self._llm_client = LLMClient(self.settings, transport=self._llm_transport)
+            return self._llm_client
+
+    def _shared_llm_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._llm_executor is None:
+                self._llm_executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_LLM_THREADS, thread_name_prefix="llm"
+                )
+            return self._llm_executor
+
+    def _check_registry(self, registry: BoilerplateRegistry) -> None:
+        with self._lock:
+            if registry.rules_version is None:
+                registry.rules_version = self.registry_version
+        if registry.rules_version != self.registry_version:
+            raise ValueError(
+                f"Boilerplate registry was built with rules {registry.rules_version}, "
+                f"not {self.registry_version}."
+            )
+
+    def reuse_mismatches(self, previous_result: ContractAnalysisResult) -> list[str]:
+        # Analyses produced under a different rule pack, model or enrichment
+        # mode cannot be reused: heuristic results would skip the LLM for
+        # every unchanged clause, and LLM results would leak into plain runs.
+        mismatches: list[str] = []
+        if previous_result.rules_version != self.rules.version:
+            mismatches.append(
+                f"rules {previous_result.rules_version or 'unknown'}, not {self.rules.version}"
+            )
+        if previous_result.category_model_version != self.model_version:
+            mismatches.append(
+                f"category model {previous_result.category_model_version or 'none'}, "
+                f"not {self.model_version or 'none'}"
+            )
+        if previous_result.use_llm != self.use_llm:
+            mismatches.append(
+                f"LLM enrichment {_llm_mode(previous_result.use_llm)}, "
+                f"not {_llm_mode(self.use_llm)}"
+            )
+        return mismatches
+
+    def can_reuse(self, previous_result: ContractAnalysisResult) -> bool:
+        return not self.reuse_mismatches(previous_result)
+
+    def _load_clauses(
+        self,
+        source: PdfSource,
+        contract_id: str | None,
+        previous_result: ContractAnalysisResult | None,
+        registry: BoilerplateRegistry | None,
+        page_cache: PageTextCache | None,
+        stage: StageCallback,
+    ) -> _LoadedContract:
+        contract_id = _contract_id(source, contract_id)
+        # Per-call caches take precedence over the ones the analyzer owns.
+        registry = registry if registry is not None else self.registry
+        page_cache = page_cache if page_cache is not None else self.page_cache
+        if registry is not None:
+            self._check_registry(registry)
+        if previous_result is not None and not self.can_reuse(previous_result):
+            previous_result = None
+        stage("parse")
+        parsed = read_pdf(
+            source,
+            page_cache=page_cache,
+            memory_budget_mb=self.settings.memory_budget_mb,
+            spill_to_disk=self.settings.spill_pages,
+            detect_structure=self.settings.detect_structure,
+        )
+        stage("split")
+        try:
+            cleaned_pages = clean_pages(parsed.pages)
+        finally:
+            if isinstance(parsed.pages, SpilledPages):
+                parsed.pages.close()
+        clauses = split_into_clauses(contract_id=contract_id, pages=cleaned_pages)
+        if not clauses:
+            raise ValueError(f"No clauses could be extracted from {parsed.label}.")
+        return _LoadedContract(
+            contract_id=contract_id,
+            source_path=parsed.label,
+            content_hash=parsed.content_hash,
+            clauses=_cap_clauses(clauses, self.settings.max_clause_chars),
+            previous_analyses=previous_result.clauses if previous_result else None,
+            registry=registry,
+        )
+
+    def _build_result(
+        self,
+        contract: _LoadedContract,
+        clause_analyses: list[ClauseAnalysis],
+        missing_protections: list[str],
+        usage: LLMUsage | None,
+    ) -> ContractAnalysisResult:
+        contract_id = contract.contract_id
+        (
+            overall_risk,
+            category_scores,
+            weighted_contributions,
+            high_risk_clause_ids,
+        ) = compute_contract_scores(
+            clauses=clause_analyses,
+            missing_protections=missing_protections,
+            high_risk_threshold=self.settings.high_risk_threshold,
+        )
+        power_imbalance = compute_power_imbalance(clause_analyses)
+        ambiguity_index = compute_ambiguity_index(clause_analyses)
+        protection_coverage = compute_protection_coverage(missing_protections)
+        leverage_index = compute_leverage_index(
+            overall_risk=overall_risk,
+            power_imbalance=power_imbalance,
+            ambiguity_index=ambiguity_index,
+            protection_coverage=protection_coverage,
+        )
+
+        summary = ContractRiskSummary(
+            contract_id=contract_id,
+            overall_risk_score=overall_risk,
+            power_imbalance_score=power_imbalance,
+            ambiguity_index=ambiguity_index,
+            protection_coverage_score=protection_coverage,
+            leverage_index=leverage_index,
+            category_scores=category_scores,
+            weighted_contributions=weighted_contributions,
+            high_risk_clause_ids=high_risk_clause_ids,
+            missing_protections=missing_protections,
+        )
+        negotiation_email = generate_negotiation_email(
+            contract_name=contract_id,
+            clauses=clause_analyses,
+            overall_risk_score=overall_risk,
+            missing_protections=missing_protections,
+        )
+        return ContractAnalysisResult(
+            contract_id=contract_id,
+            source_path=contract.source_path,
+            content_hash=contract.content_hash,
+            clauses=clause_analyses,
+            summary=summary,
+            negotiation_email=negotiation_email,
+            rules_version=self.rules.version,
+            category_model_version=self.model_version,
+            use_llm=self.use_llm,
+            llm_usage=usage,
+        )
+
+    def analyze(
+        self,
+        source: PdfSource,
+        contract_id: str | None = None,
+        previous_result: ContractAnalysisResult | None = None,
+        llm_budget_tokens: int | None = None,
+        registry: BoilerplateRegistry | None = None,
+        page_cache: PageTextCache | None = None,
+        on_clause: Callable[[ClauseProgress], None] | None = None,
+        on_stage: StageCallback | None = None,
+    ) -> ContractAnalysisResult:
+        stage = on_stage or _no_stage
+        contract = self._load_clauses(
+            source, contract_id, previous_result, registry, page_cache, stage
+        )
+        stage("classify")
+        usage = LLMUsage() if self.use_llm else None
+        clause_analyses, missing_protections = analyze_clauses(
+            contract_id=contract.contract_id,
+            clauses=contract.clauses,
+            settings=self.settings,
+            use_llm=self.use_llm,
+            previous_analyses=contract.previous_analyses,
+            registry=contract.registry,
+            rules=self.rules,
+            usage=usage,
+            llm_budget_tokens=llm_budget_tokens,
+            on_clause=on_clause,
+            category_model=self.category_model,
+            llm_client=self._shared_llm_client() if self.use_llm else None,
+        )
+        stage("score")
+        return self._build_result(contract, clause_analyses, missing_protections, usage)
+
+    async def analyze_async(
+        self,
+        source: PdfSource,
+        contract_id: str | None = None,
+        previous_result: ContractAnalysisResult | None = None,
+        llm_budget_tokens: int | None = None,
+        registry: BoilerplateRegistry | None = None,
+        page_cache: PageTextCache | None = None,
+        on_clause: Callable[[ClauseProgress], None] | None = None,
+        on_stage: StageCallback | None = None,
+        executor: ThreadPoolExecutor | None = None,
+        llm_concurrency: int = ASYNC_LLM_CONCURRENCY,
+    ) -> ContractAnalysisResult:
+        # Parsing, heuristics and scoring run on the executor (the loop's
+        # default one when None) and each LLM call is its own task on the
+        # analyzer's LLM pool, so the event loop never blocks, slow calls
+        # never starve the CPU stages and many contracts can be in flight.
+        # Cancelling the coroutine cancels every pending clause, but a thread
+        # cannot be interrupted: an LLM call that is already running goes on
+        # through its retries, is billed, and its result is discarded.
+        loop = asyncio.get_running_loop()
+
+        async def run_cpu(function: Callable[..., _T], *args: object) -> _T:
+            return await loop.run_in_executor(executor, functools.partial(function, *args))
+
+        stage = on_stage or _no_stage
+        contract = await run_cpu(
+            self._load_clauses, source, contract_id, previous_result, registry, page_cache, stage
+        )
+        stage("classify")
+        usage = LLMUsage() if self.use_llm else None
+        clause_analyses, missing_protections = await analyze_clauses_async(
+            contract_id=contract.contract_id,
+            clauses=contract.clauses,
+            settings=self.settings,
+            run_cpu=run_cpu,
+            use_llm=self.use_llm,
+            previous_analyses=contract.previous_analyses,
+            registry=contract.registry,
+            rules=self.rules,
+            usage=usage,
+            llm_budget_tokens=llm_budget_tokens,
+            on_clause=on_clause,
+            category_model=self.category_model,
+            llm_client=self._shared_llm_client() if self.use_llm else None,
+            llm_concurrency=llm_concurrency,
+            llm_executor=self._shared_llm_executor() if self.use_llm else None,
+        )
+        stage("score")
+        return await run_cpu(
+            self._build_result, contract, clause_analyses, missing_protections, usage
+        )
+
+    def triage(
+        self,
+        source: PdfSource,
+        contract_id: str | None = None,
+        first_pages: int = DEFAULT_TRIAGE_PAGES,
+        threshold: int | None = None,
+    ) -> TriageResult:
+        # Heuristic-only pass over pdfium text of the opening pages and the
+        # pages that mention a category or protection; no LLM, no layout
+        # analysis, no registry.
+        started = time.perf_counter()
+        contract_id = _contract_id(source, contract_id)
+        parsed = read_pdf_quick(source)
+        examined = select_triage_pages(parsed.pages, first_pages, self.rules)
+        clauses = split_into_clauses(contract_id=contract_id, pages=clean_pages(examined))
+        if not clauses:
+            raise ValueError(f"No extractable text was found in PDF: {parsed.label}")
+        analyses, missing_protections = analyze_clauses(
+            contract_id=contract_id,
+            clauses=_cap_clauses(clauses, self.settings.max_clause_chars),
+            settings=self.settings,
+            rules=self.rules,
+            category_model=self.category_model,
+        )
+        overall_risk, _, _, high_risk_clause_ids = compute_contract_scores(
+            clauses=analyses,
+            missing_protections=missing_protections,
+            high_risk_threshold=self.settings.high_risk_threshold,
+        )
+        threshold = threshold if threshold is not None else self.settings.high_risk_threshold
+        return TriageResult(
+            contract_id=contract_id,
+            source_path=parsed.label,
+            content_hash=parsed.content_hash,
+            page_count=len(parsed.pages),
+            pages_examined=[page.page_number for page in examined],
+            approximate_risk_score=overall_risk,
+            confidence=triage_confidence(parsed.pages, examined, analyses),
+            high_risk_clause_ids=high_risk_clause_ids,
+            missing_protections=missing_protections,
+            queued_for_full_analysis=overall_risk >= threshold,
+            elapsed_seconds=round(time.perf_counter() - started, 4),
+        )
+
+    def analyze_many(
+        self,
+        sources: Sequence[Path],
+        max_workers: int | None = None,
+        llm_budget_tokens: int | None = None,
+    ) -> list[ContractAnalysisResult]:
+        # Threads share this analyzer's state; they overlap PDF and LLM I/O,
+        # while CPU-bound batches are better served by compare-many workers.
+        budget = share_budget(llm_budget_tokens, len(sources))
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(sources)))
+        if workers == 1:
+            return [self.analyze(source, llm_budget_tokens=budget) for source in sources]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    lambda source: self.analyze(source, llm_budget_tokens=budget), sources
+                )
+            )
+
+    def compare(
+        self,
+        baseline: PdfSource | ContractAnalysisResult,
+        revised: PdfSource,
+        llm_budget_tokens: int | None = None,
+        baseline_id: str | None = None,
+        revised_id: str | None = None,
+    ) -> tuple[ContractAnalysisResult, ContractAnalysisResult, ComparisonResult]:
+        if isinstance(baseline, Path) and isinstance(revised, Path):
+            default_ids = unique_contract_ids([baseline, revised])
+            baseline_id = baseline_id or default_ids[0]
+            revised_id = revised_id or default_ids[1]
+        baseline_result = (
+            baseline
+            if isinstance(baseline, ContractAnalysisResult)
+            else self.analyze(
+                baseline, contract_id=baseline_id, llm_budget_tokens=llm_budget_tokens
+            )
+        )
+        revised_result = self.analyze(
+            revised,
+            contract_id=revised_id,
+            llm_budget_tokens=remaining_budget(llm_budget_tokens, [baseline_result]),
+        )
+        comparison = compare_contract_results(
+            baseline=baseline_result,
+            revised=revised_result,
+            high_risk_threshold=self.settings.high_risk_threshold,
+            rules=self.rules,
+            scorer=MatchScorer(self.settings.match_scorer),
+        )
+        return baseline_result, revised_result, comparison
+
+    async def compare_async(
+        self,
+        baseline: PdfSource | ContractAnalysisResult,
+        revised: PdfSource,
+        llm_budget_tokens: int | None = None,
+        baseline_id: str | None = None,
+        revised_id: str | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> tuple[ContractAnalysisResult, ContractAnalysisResult, ComparisonResult]:
+        # Both versions are analyzed at once, so each gets half the budget
+        # instead of the revision inheriting what the baseline left.
+        if isinstance(baseline, Path) and isinstance(revised, Path):
+            default_ids = unique_contract_ids([baseline, revised])
+            baseline_id = baseline_id or default_ids[0]
+            revised_id = revised_id or default_ids[1]
+        if isinstance(baseline, ContractAnalysisResult):
+            revised_result = await self.analyze_async(
+                revised,
+                contract_id=revised_id,
+                llm_budget_tokens=llm_budget_tokens,
+                executor=executor,
+            )
+            baseline_result = baseline
+        else:
+            budget = share_budget(llm_budget_tokens, 2)
+            baseline_result, revised_result = await asyncio.gather(
+                self.analyze_async(
+                    baseline, contract_id=baseline_id, llm_budget_tokens=budget, executor=executor
+                ),
+                self.analyze_async(
+                    revised, contract_id=revised_id, llm_budget_tokens=budget, executor=executor
+                ),
+            )
+        comparison = await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                compare_contract_results,
+                baseline=baseline_result,
+                revised=revised_result,
+                high_risk_threshold=self.settings.high_risk_threshold,
+                rules=self.rules,
+                scorer=MatchScorer(self.settings.match_scorer),
+            ),
+        )
+        return baseline_result, revised_result, comparison
+
+
+_shared: OrderedDict[tuple[Settings, str, bool, int | None], Analyzer] = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+def shared_analyzer(
+    settings: Settings, rules: RuleSet | None = None, use_llm: bool = False
+) -> Analyzer:
+    # The module-level pipeline functions reuse one analyzer per
+    # configuration, so repeated calls (and batch worker processes) pay the
+    # setup cost once.
+    rules = rules or DEFAULT_RULES
+    # A retrained category model on disk gets a fresh analyzer.
+    model_path = Path(settings.category_model_path) if settings.category_model_path else None
+    model_stamp = (
+        model_path.stat().st_mtime_ns if model_path is not None and model_path.exists() else None
+    )
+    key = (settings, rules.version, use_llm, model_stamp)
+    with _shared_lock:
+        analyzer = _shared.get(key)
+        if analyzer is None:
+            analyzer = _shared[key] = Analyzer(settings, rules=rules, use_llm=use_llm)
+            while len(_shared) > _SHARED_ANALYZERS:
+                # Not closed: a caller may still be using it. Its pools are
+                # released once the last reference to it is dropped.
+                _shared.popitem(last=False)
+        _shared.move_to_end(key)
+    return analyzer
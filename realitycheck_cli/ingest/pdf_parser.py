@@ -1,26 +1,419 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+import hashlib
+import io
+import mmap
 from pathlib import Path
+import tempfile
+import threading
+from typing import Any, BinaryIO, overload
+
 import pdfplumber
+import pypdfium2 as pdfium
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import LIT
+from pdfplumber.page import Page
+from pdfplumber.utils.exceptions import PdfminerException
+
+from realitycheck_cli.ingest.structure import (
+    PageStyles,
+    detect_headings,
+    extract_page_styles,
+    read_outline_targets,
+)
+
+# Measured peak for pdfplumber's default mode, which keeps every page's layout
+# objects alive until the document closes. Used only to decide when to switch
+# to low-memory extraction.
+_ESTIMATED_BYTES_PER_PAGE = 4 * 1024 * 1024
+_LITERAL_IMAGE = LIT("Image")
+_READ_CHUNK_BYTES = 1 << 20
+
+PdfSource = Path | bytes | bytearray | memoryview | mmap.mmap | BinaryIO
+# pdfium keeps global state and must not be entered from two threads at once.
+_PDFIUM_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
 class PageText:
     page_number: int
     text: str
+    headings: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class PageExtraction:
+    text: str
+    # None when the page was extracted without structure detection.
+    styles: PageStyles | None
+
+
+class PageTextCache:
+    def __init__(self, max_pages: int = 4096) -> None:
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self._pages: OrderedDict[str, PageExtraction] = OrderedDict()
+        # One cache may serve every thread of a shared Analyzer.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> PageExtraction | None:
+        with self._lock:
+            extraction = self._pages.get(key)
+            if extraction is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return extraction
+
+    def put(self, key: str, extraction: PageExtraction) -> None:
+        with self._lock:
+            self._pages[key] = extraction
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+
+class SpilledPages(Sequence[PageText]):
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._index: list[tuple[int, int, int]] = []
+        self._headings: dict[int, tuple[str, ...]] = {}
+
+    def append(self, page: PageText) -> None:
+        encoded = page.text.encode("utf-8")
+        offset = self._file.seek(0, 2)
+        self._file.write(encoded)
+        self._index.append((page.page_number, offset, len(encoded)))
+        if page.headings:
+            self._headings[page.page_number] = page.headings
+
+    def set_headings(self, headings: dict[int, tuple[str, ...]]) -> None:
+        self._headings = dict(headings)
+
+    def _load(self, entry: tuple[int, int, int]) -> PageText:
+        page_number, offset, length = entry
+        self._file.seek(offset)
+        return PageText(
+            page_number=page_number,
+            text=self._file.read(length).decode("utf-8"),
+            headings=self._headings.get(page_number, ()),
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> PageText: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PageText]: ...
+
+    def __getitem__(self, index: int | slice) -> PageText | list[PageText]:
+        if isinstance(index, slice):
+            return [self._load(entry) for entry in self._index[index]]
+        return self._load(self._index[index])
+
+    def __iter__(self) -> Iterator[PageText]:
+        for entry in self._index:
+            yield self._load(entry)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _stream_bytes(stream: PDFStream) -> bytes:
+    # Decoded rather than raw: pdfminer drops the raw bytes once it decodes a
+    # stream, so for a font shared by several pages raw data would depend on
+    # which page was extracted first. Decoding is cached on the stream.
+    try:
+        return stream.get_data()
+    except Exception:  # an unsupported filter is pdfminer's problem, not the key's
+        return stream.get_rawdata() or b""
+
+
+def _digest_pdf_object(digest: Any, value: Any, seen: set[int]) -> None:
+    if isinstance(value, PDFObjRef):
+        if value.objid in seen:
+            digest.update(b"R%d" % value.objid)
+            return
+        seen.add(value.objid)
+        value = resolve1(value)
+    if isinstance(value, PDFStream):
+        _digest_pdf_object(digest, value.attrs, seen)
+        # Image samples cannot change the extracted text; their dictionary
+        # is enough.
+        if resolve1(value.attrs.get("Subtype")) is not _LITERAL_IMAGE:
+            digest.update(_stream_bytes(value))
+    elif isinstance(value, dict):
+        digest.update(b"<<")
+        for key in sorted(value, key=str):
+            digest.update(f"/{key}".encode("utf-8"))
+            _digest_pdf_object(digest, value[key], seen)
+        digest.update(b">>")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _digest_pdf_object(digest, item, seen)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def page_content_key(page: Any) -> str:
+    # Extracted text is a function of the content streams, everything they
+    # can reach through the page resources (fonts with their encodings and
+    # embedded programs, Form XObjects with their own resources, graphics
+    # states) and the page geometry, so all of that goes into the key.
+    page_obj = page.page_obj
+    digest = hashlib.sha256(repr((page.bbox, page_obj.rotate)).encode("utf-8"))
+    seen: set[int] = set()
+    contents = page_obj.contents
+    for stream in contents if isinstance(contents, list) else [contents]:
+        _digest_pdf_object(digest, stream, seen)
+    _digest_pdf_object(digest, page_obj.resources or {}, seen)
+    return digest.hexdigest()
+
+
+def _declared_page_count(pdf: pdfplumber.PDF) -> int:
+    pages = resolve1(pdf.doc.catalog.get("Pages")) or {}
+    count = resolve1(pages.get("Count"))
+    return count if isinstance(count, int) else 0
+
+
+def _iter_pages(pdf: pdfplumber.PDF, low_memory: bool) -> Iterator[Page]:
+    if not low_memory:
+        yield from pdf.pages
+        return
+    # pdf.pages builds (and retains) a Page for the whole document up front;
+    # creating them one at a time lets each page be dropped once extracted.
+    try:
+        for idx, page_obj in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+            page = Page(pdf, page_obj, page_number=idx, initial_doctop=0)
+            try:
+                yield page
+            finally:
+                page.close()
+    except Exception as exc:
+        raise PdfminerException(exc) from exc
+
+
+def _extract_page(
+    page: Page,
+    page_cache: PageTextCache | None,
+    with_styles: bool,
+    keep_all_lines: bool,
+) -> PageExtraction:
+    def extract() -> PageExtraction:
+        return PageExtraction(
+            text=page.extract_text() or "",
+            styles=(
+                extract_page_styles(page, keep_all_lines=keep_all_lines) if with_styles else None
+            ),
+        )
+
+    if page_cache is None:
+        return extract()
+    mode = int(keep_all_lines) if with_styles else "text"
+    key = f"{page_content_key(page)}:{mode}"
+    extraction = page_cache.get(key)
+    if extraction is None:
+        extraction = extract()
+        page_cache.put(key, extraction)
+    return extraction
+
+
+@dataclass(frozen=True)
+class ParsedPdf:
+    pages: Sequence[PageText]
+    # sha256 of the PDF bytes, computed from the buffer pdfplumber parses.
+    content_hash: str
+    label: str
+
+
+@dataclass(frozen=True)
+class _OpenedSource:
+    stream: BinaryIO | mmap.mmap
+    content_hash: str
+    label: str
+
+
+@contextmanager
+def _open_source(source: PdfSource) -> Iterator[_OpenedSource]:
+    # Every source is read from storage exactly once: files are memory-mapped
+    # and streams are drained into memory, and the hash and the parser both
+    # work on that one buffer.
+    if isinstance(source, Path):
+        if not source.exists():
+            raise FileNotFoundError(f"PDF not found: {source}")
+        if source.stat().st_size == 0:
+            raise ValueError(f"PDF is empty: {source}")
+        with source.open("rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            yield _OpenedSource(mapped, hashlib.sha256(mapped).hexdigest(), str(source))
+        return
+    if isinstance(source, mmap.mmap):
+        # A caller-owned map is parsed in place and left open.
+        source.seek(0)
+        yield _OpenedSource(source, hashlib.sha256(source).hexdigest(), f"<{len(source)} bytes>")
+        return
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield _OpenedSource(
+            io.BytesIO(source), hashlib.sha256(source).hexdigest(), f"<{len(source)} bytes>"
+        )
+        return
+    digest = hashlib.sha256()
+    buffer = io.BytesIO()
+    while chunk := source.read(_READ_CHUNK_BYTES):
+        digest.update(chunk)
+        buffer.write(chunk)
+    buffer.seek(0)
+    name = getattr(source, "name", None)
+    label = name if isinstance(name, str) else f"<{buffer.getbuffer().nbytes} bytes>"
+    yield _OpenedSource(buffer, digest.hexdigest(), label)
+
+
+def read_pdf(
+    source: PdfSource,
+    page_cache: PageTextCache | None = None,
+    low_memory: bool = False,
+    memory_budget_mb: int | None = None,
+    spill_to_disk: bool = False,
+    detect_structure: bool = False,
+) -> ParsedPdf:
+    with _open_source(source) as opened:
+        pages = _extract_pages(
+            opened.stream,
+            opened.label,
+            page_cache,
+            low_memory,
+            memory_budget_mb,
+            spill_to_disk,
+            detect_structure,
+        )
+    return ParsedPdf(pages=pages, content_hash=opened.content_hash, label=opened.label)
+
+
+def parse_pdf(
+    path: PdfSource,
+    page_cache: PageTextCache | None = None,
+    low_memory: bool = False,
+    memory_budget_mb: int | None = None,
+    spill_to_disk: bool = False,
+    detect_structure: bool = False,
+) -> Sequence[PageText]:
+    return read_pdf(
+        path,
+        page_cache=page_cache,
+        low_memory=low_memory,
+        memory_budget_mb=memory_budget_mb,
+        spill_to_disk=spill_to_disk,
+        detect_structure=detect_structure,
+    ).pages
+
+
+class _MappedReader:
+    # pdfium reads custom documents through readinto, which mmap lacks.
+    def __init__(self, mapped: mmap.mmap) -> None:
+        self._mapped = mapped
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mapped.read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._mapped.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def read_pdf_quick(source: PdfSource) -> ParsedPdf:
+    # pdfium's text layer skips pdfplumber's per-character layout analysis and
+    # is many times faster; good enough to rank contracts, not to split them
+    # by font headings. Every page is returned, including empty ones.
+    with _open_source(source) as opened:
+        stream = opened.stream
+        reader = _MappedReader(stream) if isinstance(stream, mmap.mmap) else stream
+        pages: list[PageText] = []
+        with _PDFIUM_LOCK:
+            try:
+                document = pdfium.PdfDocument(reader)
+            except pdfium.PdfiumError as exc:
+                raise ValueError(f"Cannot read PDF {opened.label}: {exc}") from exc
+            try:
+                for index in range(len(document)):
+                    page = document[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range().replace("\r\n", "\n")
+                    textpage.close()
+                    page.close()
+                    pages.append(PageText(page_number=index + 1, text=text))
+            finally:
+                document.close()
+    return ParsedPdf(pages=pages, content_hash=opened.content_hash, label=opened.label)
 
 
-def parse_pdf(path: Path) -> list[PageText]:
-    if not path.exists():
-        raise FileNotFoundError(f"PDF not found: {path}")
-    pages: list[PageText] = []
-    with pdfplumber.open(path) as pdf:
-        for idx, page in enumerate(pdf.pages, start=1):
-            extracted = page.extract_text() or ""
-            if extracted.strip():
-                pages.append(PageText(page_number=idx, text=extracted))
-    if not pages:
-        raise ValueError(f"No extractable text was found in PDF: {path}")
-    return pages
+def _extract_pages(
+    stream: BinaryIO | mmap.mmap,
+    label: str,
+    page_cache: PageTextCache | None,
+    low_memory: bool,
+    memory_budget_mb: int | None,
+    spill_to_disk: bool,
+    detect_structure: bool,
+) -> Sequence[PageText]:
+    # Structure detection (outline and heading fonts) changes how a contract
+    # is split into clauses, so it is opt-in: clause ids and --previous
+    # artifacts from plain runs stay valid.
+    pages: list[PageText] | SpilledPages = SpilledPages() if spill_to_disk else []
+    styles: dict[int, PageStyles] = {}
+    page_numbers: dict[int, int] = {}
+    try:
+        with pdfplumber.open(stream) as pdf:
+            if not low_memory and memory_budget_mb is not None:
+                estimated = _declared_page_count(pdf) * _ESTIMATED_BYTES_PER_PAGE
+                low_memory = estimated > memory_budget_mb * 1024 * 1024
+            targets = read_outline_targets(pdf) if detect_structure else []
+            for page in _iter_pages(pdf, low_memory):
+                # Outline targets are resolved from this one pass over the
+                # pages rather than a second walk of the page tree.
+                page_numbers[page.page_obj.pageid] = page.page_number
+                extraction = _extract_page(
+                    page, page_cache, with_styles=detect_structure, keep_all_lines=bool(targets)
+                )
+                if extraction.text.strip():
+                    pages.append(PageText(page_number=page.page_number, text=extraction.text))
+                    if extraction.styles is not None:
+                        styles[page.page_number] = extraction.styles
+        if not pages:
+            raise ValueError(f"No extractable text was found in PDF: {label}")
+        outline = [(page_numbers.get(objid), title) for objid, title in targets]
+        headings = detect_headings(styles, outline) if detect_structure else {}
+    except BaseException:
+        # The caller never sees a spill file for a failed parse, so it is
+        # closed (and removed) here.
+        if isinstance(pages, SpilledPages):
+            pages.close()
+        raise
 
+    if not headings:
+        return pages
+    if isinstance(pages, SpilledPages):
+        pages.set_headings(headings)
+        return pages
+    return [
+        replace(page, headings=headings.get(page.page_number, ())) for page in pages
+    ]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+import re
+from typing import Any
+
+import pdfplumber
+from pdfminer.pdfdocument import PDFDestinationNotFound, PDFNoOutlines
+from pdfminer.pdfpage import PDFPage
+from pdfminer.psexceptions import PSException
+from pdfminer.psparser import PSLiteral
+from pdfminer.pdftypes import resolve1
+
+_MAX_HEADING_WORDS = 12
+_HEADING_SIZE_DELTA = 1.0
+_BOLD_LINE_RATIO = 0.9
+_MIN_HEADINGS = 2
+_BOLD_FONT_MARKERS = ("bold", "black", "heavy")
+_NUMBERING_RE = re.compile(
+    r"^(?:(?:section|article|clause)\s+)?(?:\d+(?:\.\d+)*[\).:-]?|[ivxlc]+[\).])\s+(?=\w)",
+    re.IGNORECASE,
+)
+_LEADER_RE = re.compile(r"\.{3,}|…|_{3,}")
+
+
+@dataclass(frozen=True)
+class LineStyle:
+    text: str
+    size: float
+    bold_ratio: float
+
+
+@dataclass(frozen=True)
+class PageStyles:
+    lines: tuple[LineStyle, ...]
+    size_counts: tuple[tuple[float, int], ...]
+    bold_chars: int
+    total_chars: int
+
+
+def normalize_line(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _title_key(text: str) -> str:
+    return _NUMBERING_RE.sub("", normalize_line(text)).rstrip(" .:").lower()
+
+
+def _is_bold(fontname: str) -> bool:
+    lowered = fontname.lower()
+    return any(marker in lowered for marker in _BOLD_FONT_MARKERS)
+
+
+def extract_page_styles(page: Any, keep_all_lines: bool = False) -> PageStyles:
+    sizes: Counter[float] = Counter()
+    bold_chars = 0
+    total_chars = 0
+    measured: list[LineStyle] = []
+    for line in page.extract_text_lines(return_chars=True):
+        chars = [char for char in line["chars"] if not char["text"].isspace()]
+        if not chars:
+            continue
+        line_bold = sum(1 for char in chars if _is_bold(char.get("fontname", "")))
+        for char in chars:
+            sizes[round(char["size"], 1)] += 1
+        bold_chars += line_bold
+        total_chars += len(chars)
+        text = normalize_line(line["text"])
+        if len(text.split()) <= _MAX_HEADING_WORDS:
+            measured.append(
+                LineStyle(
+                    text=text,
+                    size=max(round(char["size"], 1) for char in chars),
+                    bold_ratio=line_bold / len(chars),
+                )
+            )
+
+    if keep_all_lines or not sizes:
+        lines = measured
+    else:
+        # Only lines that stand out on their page can be font-based headings,
+        # so there is no need to carry the rest until the document is done.
+        smallest = min(sizes)
+        lines = [
+            line
+            for line in measured
+            if line.bold_ratio >= _BOLD_LINE_RATIO
+            or line.size >= smallest + _HEADING_SIZE_DELTA
+        ]
+    return PageStyles(
+        lines=tuple(lines),
+        size_counts=tuple(sorted(sizes.items())),
+        bold_chars=bold_chars,
+        total_chars=total_chars,
+    )
+
+
+def _outline_target(pdf: pdfplumber.PDF, dest: Any, action: Any) -> int | None:
+    if dest is None and action is not None:
+        action = resolve1(action)
+        if isinstance(action, dict):
+            dest = action.get("D")
+    dest = resolve1(dest)
+    if isinstance(dest, PSLiteral):
+        dest = dest.name
+    if isinstance(dest, (str, bytes)):
+        try:
+            dest = resolve1(pdf.doc.get_dest(dest))
+        except (PDFDestinationNotFound, KeyError):
+            return None
+    if isinstance(dest, dict):
+        dest = resolve1(dest.get("D"))
+    if isinstance(dest, list) and dest:
+        return getattr(dest[0], "objid", None)
+    return None
+
+
+def read_outline_targets(pdf: pdfplumber.PDF) -> list[tuple[int | None, str]]:
+    # Outline titles with the object id of the page each one points at; the
+    # ids are mapped to page numbers by whoever walks the pages anyway.
+    try:
+        return [
+            (_outline_target(pdf, dest, action), title)
+            for _level, title, dest, action, _se in pdf.doc.get_outlines()
+            if title and title.strip()
+        ]
+    except PDFNoOutlines:
+        return []
+    except (PSException, KeyError, TypeError, ValueError):
+        # A malformed outline should not block text extraction.
+        return []
+
+
+def read_outline(pdf: pdfplumber.PDF) -> list[tuple[int | None, str]]:
+    targets = read_outline_targets(pdf)
+    if not targets:
+        return []
+    try:
+        page_numbers = {
+            page.pageid: idx for idx, page in enumerate(PDFPage.create_pages(pdf.doc), start=1)
+        }
+    except (PSException, KeyError, TypeError, ValueError):
+        return []
+    return [(page_numbers.get(objid), title) for objid, title in targets]
+
+
+def _outline_headings(
+    styles: dict[int, PageStyles],
+    outline: list[tuple[int | None, str]],
+) -> dict[int, list[str]]:
+    headings: dict[int, list[str]] = {}
+    used: set[tuple[int, int]] = set()
+    for page_number, title in outline:
+        key = _title_key(title)
+        if not key:
+            continue
+        candidates = [page_number] if page_number in styles else sorted(styles)
+        for candidate in candidates:
+            match = next(
+                (
+                    idx
+                    for idx, line in enumerate(styles[candidate].lines)
+                    if (candidate, idx) not in used and _title_key(line.text) == key
+                ),
+                None,
+            )
+            if match is not None:
+                used.add((candidate, match))
+                headings.setdefault(candidate, []).append(styles[candidate].lines[match].text)
+                break
+    return headings
+
+
+def _font_headings(styles: dict[int, PageStyles]) -> dict[int, list[str]]:
+    sizes: Counter[float] = Counter()
+    bold_chars = 0
+    total_chars = 0
+    for page in styles.values():
+        sizes.update(dict(page.size_counts))
+        bold_chars += page.bold_chars
+        total_chars += page.total_chars
+    if not sizes:
+        return {}
+    body_size = sizes.most_common(1)[0][0]
+    body_is_bold = bold_chars > total_chars / 2
+
+    headings: dict[int, list[str]] = {}
+    for page_number, page in styles.items():
+        for line in page.lines:
+            if _LEADER_RE.search(line.text) or not any(ch.isalpha() for ch in line.text):
+                continue
+            larger = line.size >= body_size + _HEADING_SIZE_DELTA
+            # Bold alone also marks table headers and signature blocks, so it
+            # only counts together with numbering or an all-caps title.
+            emphasized = (
+                line.bold_ratio >= _BOLD_LINE_RATIO
+                and not body_is_bold
+                and (bool(_NUMBERING_RE.match(line.text)) or line.text.isupper())
+            )
+            if larger or emphasized:
+                headings.setdefault(page_number, []).append(line.text)
+    return headings
+
+
+def detect_headings(
+    styles: dict[int, PageStyles],
+    outline: list[tuple[int | None, str]],
+) -> dict[int, tuple[str, ...]]:
+    for headings in (
+        _outline_headings(styles, outline) if outline else {},
+        _font_headings(styles),
+    ):
+        if sum(len(lines) for lines in headings.values()) >= _MIN_HEADINGS:
+            return {page: tuple(lines) for page, lines in headings.items()}
+    return {}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Sequence
 import re
 
 from realitycheck_cli.ingest.pdf_parser import PageText
@@ -12,16 +13,16 @@ def _normalize_lines(text: str) -> list[str]:
     return [line for line in lines if line]
 
 
-def clean_pages(pages: list[PageText]) -> list[PageText]:
+def clean_pages(pages: Sequence[PageText]) -> list[PageText]:
     if not pages:
         return []
 
     first_lines = Counter()
     last_lines = Counter()
-    page_lines: list[tuple[int, list[str]]] = []
+    # Two passes over the pages rather than holding every page's lines, so
+    # disk-spilled page text is only materialized once, as cleaned output.
     for page in pages:
         lines = _normalize_lines(page.text)
-        page_lines.append((page.page_number, lines))
         if lines:
             first_lines[lines[0].lower()] += 1
             last_lines[lines[-1].lower()] += 1
@@ -31,8 +32,8 @@ def clean_pages(pages: list[PageText]) -> list[PageText]:
     repeated_footers = {line for line, count in last_lines.items() if count >= threshold}
 
     cleaned: list[PageText] = []
-    for page_number, lines in page_lines:
-        trimmed = list(lines)
+    for page in pages:
+        trimmed = _normalize_lines(page.text)
         if trimmed and trimmed[0].lower() in repeated_headers:
             trimmed = trimmed[1:]
         if trimmed and trimmed[-1].lower() in repeated_footers:
@@ -40,6 +41,8 @@ def clean_pages(pages: list[PageText]) -> list[PageText]:
         text = "\n".join(trimmed)
         text = re.sub(r"\n{3,}", "\n\n", text).strip()
         if text:
-            cleaned.append(PageText(page_number=page_number, text=text))
+            cleaned.append(
+                PageText(page_number=page.page_number, text=text, headings=page.headings)
+            )
     return cleaned
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import hashlib
+from pathlib import Path
+import time
+
+from realitycheck_cli.analysis.schemas import ContractAnalysisResult
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class WatchEntry:
+    path: Path
+    status: str
+    result: ContractAnalysisResult | None = None
+    reused_clauses: int = 0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class _PendingChange:
+    signature: tuple[int, int]
+    first_seen: float
+
+
+def file_content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DirectoryWatcher:
+    def __init__(
+        self,
+        directory: Path,
+        pattern: str = "*.pdf",
+        debounce_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not directory.is_dir():
+            raise ValueError(f"Watch target is not a directory: {directory}")
+        self.directory = directory
+        self.pattern = pattern
+        self.debounce_seconds = debounce_seconds
+        self._clock = clock
+        self._signatures: dict[Path, tuple[int, int]] = {}
+        self._pending: dict[Path, _PendingChange] = {}
+        self._hashes: dict[Path, str] = {}
+        self.skipped_unchanged = 0
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        signatures: dict[Path, tuple[int, int]] = {}
+        for path in sorted(self.directory.glob(self.pattern)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.is_file():
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def poll(self) -> list[Path]:
+        now = self._clock()
+        signatures = self._scan()
+        for path in set(self._signatures) - set(signatures):
+            self._pending.pop(path, None)
+            self._hashes.pop(path, None)
+
+        for path, signature in signatures.items():
+            if self._signatures.get(path) == signature:
+                continue
+            # Every save restarts the quiet period, so a burst of writes from an
+            # editor is analyzed once, after the last one lands.
+            self._pending[path] = _PendingChange(signature=signature, first_seen=now)
+        self._signatures = signatures
+
+        ready: list[Path] = []
+        for path, pending in list(self._pending.items()):
+            if now - pending.first_seen < self.debounce_seconds:
+                continue
+            del self._pending[path]
+            try:
+                content_hash = file_content_hash(path)
+            except FileNotFoundError:
+                continue
+            if self._hashes.get(path) == content_hash:
+                self.skipped_unchanged += 1
+                continue
+            self._hashes[path] = content_hash
+            ready.append(path)
+        return ready
+
+    def forget(self, path: Path) -> None:
+        self._hashes.pop(path, None)
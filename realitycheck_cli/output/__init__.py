@@ -0,0 +1 @@
+"""Output modules for JSON artifacts and terminal rendering."""
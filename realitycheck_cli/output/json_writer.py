@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from enum import Enum
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, TextIO
+
+from pydantic import BaseModel
+
+from realitycheck_cli.analysis.schemas import (
+    BatchFailure,
+    ComparisonResult,
+    ContractAnalysisResult,
+    LLMUsage,
+    MultiComparisonResult,
+    RevisionChainResult,
+    TriageResult,
+)
+
+_INDENT = "  "
+
+
+class OutputFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+def _leaf(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+def _model_items(model: BaseModel) -> Iterator[tuple[str, Any]]:
+    for name, field in type(model).model_fields.items():
+        if field.exclude:
+            continue
+        yield name, getattr(model, name)
+
+
+def _iter_container(
+    items: Iterable[tuple[str, Any]],
+    opening: str,
+    closing: str,
+    level: int,
+) -> Iterator[str]:
+    inner = "\n" + _INDENT * (level + 1)
+    first = True
+    for prefix, item in items:
+        yield (opening if first else ",") + inner + prefix
+        first = False
+        yield from _iter_json(item, level + 1)
+    if first:
+        yield opening + closing
+    else:
+        yield "\n" + _INDENT * level + closing
+
+
+def _iter_json(value: Any, level: int = 0) -> Iterator[str]:
+    if isinstance(value, BaseModel):
+        yield from _iter_container(
+            ((json.dumps(key) + ": ", item) for key, item in _model_items(value)),
+            "{",
+            "}",
+            level,
+        )
+    elif isinstance(value, dict):
+        yield from _iter_container(
+            ((json.dumps(str(key)) + ": ", item) for key, item in value.items()),
+            "{",
+            "}",
+            level,
+        )
+    elif isinstance(value, (list, tuple, Iterator)):
+        yield from _iter_container((("", item) for item in value), "[", "]", level)
+    else:
+        yield json.dumps(_leaf(value), ensure_ascii=False)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return dict(_model_items(value))
+    if isinstance(value, (Enum, Path)):
+        return _leaf(value)
+    if isinstance(value, Iterator):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@contextmanager
+def _atomic_writer(output_path: Path) -> Iterator[TextIO]:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=output_path.parent,
+        prefix=f".{output_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        mode = output_path.stat().st_mode & 0o777 if output_path.exists() else 0o644
+        os.chmod(handle.name, mode)
+        os.replace(handle.name, output_path)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+
+
+def write_json_output(payload: Any, output_path: Path) -> Path:
+    with _atomic_writer(output_path) as handle:
+        for chunk in _iter_json(payload):
+            handle.write(chunk)
+        handle.write("\n")
+    return output_path
+
+
+class NdjsonWriter:
+    def __init__(self, output_path: Path) -> None:
+        self._context = _atomic_writer(output_path)
+        self._handle: TextIO | None = None
+        self.records_written = 0
+
+    def __enter__(self) -> "NdjsonWriter":
+        self._handle = self._context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._handle = None
+        self._context.__exit__(*exc_info)
+
+    def write(self, record: Any) -> None:
+        if self._handle is None:
+            raise RuntimeError("NdjsonWriter must be used as a context manager.")
+        self._handle.write(
+            json.dumps(
+                record,
+                default=_json_default,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        )
+        self._handle.write("\n")
+        self.records_written += 1
+
+
+def write_ndjson_output(records: Iterable[Any], output_path: Path) -> Path:
+    with NdjsonWriter(output_path) as writer:
+        for record in records:
+            writer.write(record)
+    return output_path
+
+
+def iter_analysis_records(result: ContractAnalysisResult) -> Iterator[dict[str, Any]]:
+    header: dict[str, Any] = {"record_type": "contract"}
+    header.update(
+        (name, value) for name, value in _model_items(result) if name != "clauses"
+    )
+    yield header
+    for clause in result.clauses:
+        yield {"record_type": "clause", **dict(_model_items(clause))}
+
+
+def _iter_comparison_result_records(
+    comparison: ComparisonResult,
+) -> Iterator[dict[str, Any]]:
+    header: dict[str, Any] = {"record_type": "comparison"}
+    header.update(
+        (name, value)
+        for name, value in _model_items(comparison)
+        if name not in ("deltas", "flags")
+    )
+    yield header
+    for delta in comparison.deltas:
+        yield {"record_type": "clause_delta", **dict(_model_items(delta))}
+    for flag in comparison.flags:
+        yield {"record_type": "flag", **dict(_model_items(flag))}
+
+
+def _iter_batch_usage_records(usage: LLMUsage | None) -> Iterator[dict[str, Any]]:
+    if usage is not None:
+        yield {"record_type": "llm_usage", **usage.model_dump(mode="json")}
+
+
+def _iter_failure_records(failures: list[BatchFailure]) -> Iterator[dict[str, Any]]:
+    for failure in failures:
+        yield {"record_type": "failure", **failure.model_dump(mode="json")}
+
+
+def iter_comparison_records(
+    baseline: ContractAnalysisResult,
+    revised: ContractAnalysisResult,
+    comparison: ComparisonResult,
+) -> Iterator[dict[str, Any]]:
+    yield from iter_analysis_records(baseline)
+    yield from iter_analysis_records(revised)
+    yield from _iter_comparison_result_records(comparison)
+
+
+def iter_multi_comparison_records(
+    baseline: ContractAnalysisResult,
+    revised_results: list[ContractAnalysisResult],
+    multi: MultiComparisonResult,
+) -> Iterator[dict[str, Any]]:
+    yield from iter_analysis_records(baseline)
+    for revised, comparison in zip(revised_results, multi.comparisons):
+        yield from iter_analysis_records(revised)
+        yield from _iter_comparison_result_records(comparison)
+    yield {
+        "record_type": "flag_matrix",
+        "baseline_contract_id": multi.baseline_contract_id,
+        "flag_matrix": multi.flag_matrix,
+    }
+    yield from _iter_failure_records(multi.failures)
+    yield from _iter_batch_usage_records(multi.llm_usage)
+
+
+def iter_revision_chain_records(
+    results: list[ContractAnalysisResult],
+    chain: RevisionChainResult,
+) -> Iterator[dict[str, Any]]:
+    yield from iter_analysis_records(results[0])
+    for revised, comparison in zip(results[1:], chain.comparisons):
+        yield from iter_analysis_records(revised)
+        yield from _iter_comparison_result_records(comparison)
+    for lineage in chain.lineages:
+        yield {"record_type": "clause_lineage", **dict(_model_items(lineage))}
+    yield from _iter_failure_records(chain.failures)
+    yield from _iter_batch_usage_records(chain.llm_usage)
+
+
+def iter_triage_records(
+    results: list[TriageResult],
+    full_results: list[ContractAnalysisResult],
+    failures: list[BatchFailure],
+) -> Iterator[dict[str, Any]]:
+    for result in results:
+        yield {"record_type": "triage", **result.model_dump(mode="json")}
+    for full_result in full_results:
+        yield from iter_analysis_records(full_result)
+    yield from _iter_failure_records(failures)
@@ -0,0 +1,583 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from realitycheck_cli.analysis.category_model import CategoryModelEvaluation
+from realitycheck_cli.analysis.classifier import ClauseProgress
+from realitycheck_cli.analysis.schemas import (
+    BatchFailure,
+    ComparisonResult,
+    ContractAnalysisResult,
+    DeltaType,
+    LLMUsage,
+    MultiComparisonResult,
+    RedlineOp,
+    RedlineSpan,
+    RevisionChainResult,
+    TriageResult,
+)
+from realitycheck_cli.ingest.watcher import WatchEntry
+from realitycheck_cli.portfolio.search import SearchHit
+from realitycheck_cli.portfolio.store import ContractRow
+from realitycheck_cli.scoring.weights import CATEGORY_WEIGHTS
+
+_EMAIL_PREVIEW_LINES = 16
+_CLAUSE_TABLE_ROWS = 10
+_PROGRESS_TABLE_ROWS = 15
+
+console = Console()
+
+
+def _risk_style(score: int) -> str:
+    if score >= 80:
+        return "bold red"
+    if score >= 60:
+        return "bold yellow"
+    return "bold green"
+
+
+def _leverage_style(score: int) -> str:
+    return _risk_style(100 - score)
+
+
+def _score_panel(title: str, value: str, style: str) -> Panel:
+    return Panel(
+        Text(value, style=style, justify="center"),
+        title=title,
+        width=len(title) + 6,
+    )
+
+
+def _score_row(panels: list[Panel]) -> Table:
+    row = Table.grid(padding=(0, 1))
+    row.add_row(*panels)
+    return row
+
+
+def _signed(value: int) -> str:
+    return f"{value:+d}"
+
+
+def render_analysis(result: ContractAnalysisResult, json_output_path: Path | None) -> None:
+    summary = result.summary
+    console.print(
+        Panel(
+            "RealityCheck CLI\n"
+            f"Contract: {escape(Path(result.source_path).name)}\n"
+            f"Clauses analyzed: {len(result.clauses)}",
+            title="Analysis",
+        )
+    )
+    console.print(
+        _score_row(
+            [
+                _score_panel(
+                    "Overall Risk Score",
+                    f"{summary.overall_risk_score}/100",
+                    _risk_style(summary.overall_risk_score),
+                ),
+                _score_panel(
+                    "Power Imbalance Score",
+                    f"{summary.power_imbalance_score}/100",
+                    _risk_style(summary.power_imbalance_score),
+                ),
+                _score_panel(
+                    "Leverage Index (TM)",
+                    f"{summary.leverage_index}/100",
+                    _leverage_style(summary.leverage_index),
+                ),
+            ]
+        )
+    )
+    console.print(
+        _score_row(
+            [
+                _score_panel(
+                    "Ambiguity Index",
+                    f"{summary.ambiguity_index}/100",
+                    _risk_style(summary.ambiguity_index),
+                ),
+                _score_panel(
+                    "Protection Coverage",
+                    f"{summary.protection_coverage_score}/100",
+                    _leverage_style(summary.protection_coverage_score),
+                ),
+            ]
+        )
+    )
+
+    categories = Table(title="Category Risk Summary")
+    categories.add_column("Category")
+    categories.add_column("Score", justify="right")
+    categories.add_column("Weight", justify="right")
+    categories.add_column("Contribution", justify="right")
+    weights = {category.value: weight for category, weight in CATEGORY_WEIGHTS.items()}
+    ranked = sorted(
+        (item for item in summary.category_scores.items() if item[1] > 0),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    for category, score in ranked:
+        categories.add_row(
+            category,
+            str(score),
+            f"{weights.get(category, 0.0):.2f}",
+            f"{summary.weighted_contributions.get(category, 0.0):.2f}",
+        )
+    console.print(categories)
+
+    clauses = Table(title="Highest-Risk Clauses")
+    clauses.add_column("ID")
+    clauses.add_column("Title")
+    clauses.add_column("Page", justify="right")
+    clauses.add_column("Category")
+    clauses.add_column("Risk", justify="right")
+    clauses.add_column("Signals")
+    top_clauses = sorted(result.clauses, key=lambda item: item.risk_score, reverse=True)
+    for clause in top_clauses[:_CLAUSE_TABLE_ROWS]:
+        clauses.add_row(
+            clause.clause_id,
+            escape(clause.title),
+            str(clause.page),
+            clause.category.value,
+            f"[{_risk_style(clause.risk_score)}]{clause.risk_score}[/]",
+            escape(", ".join(signal.label for signal in clause.signals)) or "-",
+        )
+    console.print(clauses)
+
+    if summary.missing_protections:
+        console.print(
+            Panel(
+                "\n".join(
+                    f"- {item.replace('_', ' ')}" for item in summary.missing_protections
+                ),
+                title="Missing Protections",
+            )
+        )
+
+    email_lines = result.negotiation_email.splitlines()
+    preview = escape("\n".join(email_lines[:_EMAIL_PREVIEW_LINES]))
+    if len(email_lines) > _EMAIL_PREVIEW_LINES:
+        preview += "\n..."
+    console.print(Panel(preview, title="Negotiation Draft (Preview)"))
+    if json_output_path is not None:
+        console.print(f"JSON output: {json_output_path}")
+
+
+def _redline_summary(spans: list[RedlineSpan]) -> Text:
+    if not spans:
+        return Text("-")
+    # Spans that caused a signal or flag change are the ones worth showing.
+    shown = [span for span in spans if span.triggers][:2] or spans[:2]
+    summary = Text()
+    for span in shown:
+        if summary:
+            summary.append(" ")
+        text = span.text if len(span.text) <= 24 else span.text[:23] + "…"
+        if span.op == RedlineOp.DELETE:
+            summary.append(text, style="red strike")
+        else:
+            summary.append(text, style="bold red" if span.triggers else "green")
+    if len(spans) > len(shown):
+        summary.append(f" +{len(spans) - len(shown)} more", style="dim")
+    return summary
+
+
+def render_comparison(
+    comparison: ComparisonResult,
+    baseline_name: str,
+    revised_name: str,
+    json_output_path: Path | None,
+) -> None:
+    console.print(
+        Panel(
+            f"Baseline: {escape(baseline_name)}\nRevised: {escape(revised_name)}",
+            title="Comparison",
+        )
+    )
+    console.print(
+        _score_row(
+            [
+                _score_panel(
+                    "Baseline Risk",
+                    str(comparison.baseline_overall_risk),
+                    _risk_style(comparison.baseline_overall_risk),
+                ),
+                _score_panel(
+                    "Revised Risk",
+                    str(comparison.revised_overall_risk),
+                    _risk_style(comparison.revised_overall_risk),
+                ),
+                _score_panel(
+                    "Risk Delta",
+                    _signed(comparison.overall_risk_delta),
+                    "bold red" if comparison.overall_risk_delta > 0 else "bold green",
+                ),
+            ]
+        )
+    )
+    console.print(
+        _score_row(
+            [
+                _score_panel(
+                    "Baseline Leverage",
+                    str(comparison.baseline_leverage_index),
+                    _leverage_style(comparison.baseline_leverage_index),
+                ),
+                _score_panel(
+                    "Revised Leverage",
+                    str(comparison.revised_leverage_index),
+                    _leverage_style(comparison.revised_leverage_index),
+                ),
+                _score_panel(
+                    "Leverage Delta",
+                    _signed(comparison.leverage_delta),
+                    "bold red" if comparison.leverage_delta < 0 else "bold green",
+                ),
+            ]
+        )
+    )
+
+    changed = [delta for delta in comparison.deltas if delta.delta_type != DeltaType.UNCHANGED]
+    deltas = Table(title=f"Clause Changes ({len(changed)})")
+    deltas.add_column("Change")
+    deltas.add_column("Baseline")
+    deltas.add_column("Revised")
+    deltas.add_column("Risk Delta", justify="right")
+    deltas.add_column("Redline")
+    deltas.add_column("Reason")
+    for delta in changed:
+        deltas.add_row(
+            delta.delta_type.value,
+            delta.baseline_clause_id or "-",
+            delta.revised_clause_id or "-",
+            _signed(delta.risk_delta),
+            _redline_summary(delta.redline),
+            escape(delta.reason),
+        )
+    console.print(deltas)
+
+    if comparison.flags:
+        flags = Table(title="Risk Flags")
+        flags.add_column("Flag")
+        flags.add_column("Clause")
+        flags.add_column("Severity")
+        flags.add_column("Description")
+        for flag in comparison.flags:
+            flags.add_row(
+                flag.type, flag.clause_id, flag.severity.value, escape(flag.description)
+            )
+        console.print(flags)
+    if json_output_path is not None:
+        console.print(f"JSON output: {json_output_path}")
+
+
+def render_multi_comparison(
+    multi: MultiComparisonResult,
+    baseline_name: str,
+    json_output_path: Path | None,
+) -> None:
+    flag_types = sorted({flag for row in multi.flag_matrix.values() for flag in row})
+    table = Table(
+        title=f"Baseline {escape(baseline_name)} vs {len(multi.comparisons)} revisions"
+    )
+    table.add_column("Revision")
+    table.add_column("Risk", justify="right")
+    table.add_column("Risk Delta", justify="right")
+    table.add_column("Leverage Delta", justify="right")
+    table.add_column("Changed", justify="right")
+    for flag_type in flag_types:
+        table.add_column(flag_type, justify="right")
+    for comparison in multi.comparisons:
+        row = multi.flag_matrix.get(comparison.revised_contract_id, {})
+        changed = sum(
+            1 for delta in comparison.deltas if delta.delta_type != DeltaType.UNCHANGED
+        )
+        table.add_row(
+            escape(comparison.revised_contract_id),
+            f"[{_risk_style(comparison.revised_overall_risk)}]"
+            f"{comparison.revised_overall_risk}[/]",
+            _signed(comparison.overall_risk_delta),
+            _signed(comparison.leverage_delta),
+            str(changed),
+            *[str(row.get(flag_type, 0)) for flag_type in flag_types],
+        )
+    console.print(table)
+    if json_output_path is not None:
+        console.print(f"JSON output: {json_output_path}")
+
+
+def render_llm_usage(usage: LLMUsage | None) -> None:
+    if usage is None or not (usage.requests or usage.budget_skipped):
+        return
+    parts = [
+        f"{usage.requests} requests",
+        f"{usage.prompt_tokens:,} prompt + {usage.output_tokens:,} output tokens",
+    ]
+    if usage.estimated_requests:
+        parts.append(f"{usage.estimated_requests} estimated from text length")
+    if usage.estimated_cost_usd is not None:
+        parts.append(f"~${usage.estimated_cost_usd:.4f}")
+    if usage.fallbacks:
+        parts.append(f"{usage.fallbacks} fell back to heuristics")
+    if usage.budget_skipped:
+        parts.append(f"{usage.budget_skipped} skipped by --llm-budget")
+    console.print(f"LLM usage: {'; '.join(parts)}.")
+
+
+def render_batch_failures(failures: list[BatchFailure]) -> None:
+    if not failures:
+        return
+    table = Table(title=f"Failed Contracts ({len(failures)} attempts)")
+    table.add_column("Contract")
+    table.add_column("Attempt")
+    table.add_column("Stage")
+    table.add_column("Reason")
+    table.add_column("Elapsed", justify="right")
+    table.add_column("Detail")
+    for failure in failures:
+        detail = failure.message
+        if failure.retried:
+            detail += " (retried degraded)"
+        table.add_row(
+            escape(failure.contract_id),
+            "degraded" if failure.degraded else "full",
+            failure.stage or "-",
+            f"[red]{failure.reason.value}[/]",
+            f"{failure.elapsed_seconds:.1f}s",
+            escape(detail),
+        )
+    console.print(table)
+
+
+def render_category_model_evaluation(evaluation: CategoryModelEvaluation) -> None:
+    table = Table(
+        title=(
+            f"Category tiers vs LLM labels ({evaluation.holdout_size} held out, "
+            f"{evaluation.train_size} trained)"
+        )
+    )
+    table.add_column("Tier")
+    table.add_column("Agreement", justify="right")
+    table.add_column("Clauses/s", justify="right")
+    table.add_row(
+        "heuristic",
+        f"{evaluation.heuristic_agreement:.1%}",
+        f"{evaluation.heuristic_clauses_per_second:,.0f}",
+    )
+    table.add_row(
+        "learned",
+        f"{evaluation.model_agreement:.1%}",
+        f"{evaluation.model_clauses_per_second:,.0f}",
+    )
+    console.print(table)
+
+
+def _trajectory(scores: list[int | None]) -> str:
+    return " -> ".join("-" if score is None else str(score) for score in scores)
+
+
+def render_revision_chain(
+    chain: RevisionChainResult,
+    json_output_path: Path | None,
+) -> None:
+    table = Table(title=f"Revision Chain ({len(chain.contract_ids)} versions)")
+    table.add_column("Version")
+    table.add_column("Risk", justify="right")
+    table.add_column("Risk Delta", justify="right")
+    table.add_column("Leverage Delta", justify="right")
+    table.add_column("Flags", justify="right")
+    table.add_row(escape(chain.contract_ids[0]), "-", "-", "-", "-")
+    for comparison in chain.comparisons:
+        table.add_row(
+            escape(comparison.revised_contract_id),
+            f"[{_risk_style(comparison.revised_overall_risk)}]"
+            f"{comparison.revised_overall_risk}[/]",
+            _signed(comparison.overall_risk_delta),
+            _signed(comparison.leverage_delta),
+            str(len(comparison.flags)),
+        )
+    console.print(table)
+
+    changed = [
+        lineage
+        for lineage in chain.lineages
+        if lineage.flags
+        or any(
+            point.delta_type not in (None, DeltaType.UNCHANGED)
+            for point in lineage.points
+        )
+    ]
+    if changed:
+        lineages = Table(title=f"Clause Lineages With Changes ({len(changed)})")
+        lineages.add_column("Lineage")
+        lineages.add_column("Clause")
+        lineages.add_column("Risk Trajectory")
+        lineages.add_column("Flags")
+        for lineage in changed:
+            latest = next(
+                (point for point in reversed(lineage.points) if point.clause_id),
+                lineage.points[0],
+            )
+            lineages.add_row(
+                lineage.lineage_id,
+                escape(f"{latest.clause_id} {latest.title}"),
+                _trajectory(lineage.risk_trajectory),
+                ", ".join(flag.type for flag in lineage.flags) or "-",
+            )
+        console.print(lineages)
+    if json_output_path is not None:
+        console.print(f"JSON output: {json_output_path}")
+
+
+def render_portfolio_rows(rows: list[ContractRow]) -> None:
+    table = Table(title=f"Portfolio Matches ({len(rows)})")
+    table.add_column("Contract")
+    table.add_column("Risk", justify="right")
+    table.add_column("Leverage", justify="right")
+    table.add_column("Power", justify="right")
+    table.add_column("Coverage", justify="right")
+    table.add_column("Clauses", justify="right")
+    table.add_column("Missing Protections")
+    for row in rows:
+        table.add_row(
+            escape(row.contract_id),
+            f"[{_risk_style(row.overall_risk_score)}]{row.overall_risk_score}[/]",
+            str(row.leverage_index),
+            str(row.power_imbalance_score),
+            str(row.protection_coverage_score),
+            str(row.clause_count),
+            ", ".join(row.missing_protections) or "-",
+        )
+    console.print(table)
+
+
+def render_triage(
+    results: list[TriageResult],
+    full_results: list[ContractAnalysisResult],
+    json_output_path: Path | None,
+) -> None:
+    full_risk = {
+        result.source_path: result.summary.overall_risk_score for result in full_results
+    }
+    queued = sum(1 for result in results if result.queued_for_full_analysis)
+    table = Table(title=f"Triage ({len(results)} contracts, {queued} queued for full analysis)")
+    table.add_column("Rank", justify="right")
+    table.add_column("Contract")
+    table.add_column("~Risk", justify="right")
+    table.add_column("Confidence", justify="right")
+    table.add_column("Pages", justify="right")
+    table.add_column("Missing", justify="right")
+    table.add_column("Queued")
+    table.add_column("Full Risk", justify="right")
+    for rank, result in enumerate(results, start=1):
+        score = full_risk.get(result.source_path)
+        table.add_row(
+            str(rank),
+            escape(result.contract_id),
+            f"[{_risk_style(result.approximate_risk_score)}]"
+            f"{result.approximate_risk_score}[/]",
+            f"{result.confidence:.2f}",
+            f"{len(result.pages_examined)}/{result.page_count}",
+            str(len(result.missing_protections)),
+            "[bold yellow]yes[/]" if result.queued_for_full_analysis else "no",
+            f"[{_risk_style(score)}]{score}[/]" if score is not None else "-",
+        )
+    console.print(table)
+    if json_output_path is not None:
+        console.print(f"JSON output: {json_output_path}")
+
+
+def render_search_hits(match_expression: str, hits: list[SearchHit]) -> None:
+    table = Table(title=f"Clause Search: {escape(match_expression)} ({len(hits)} hits)")
+    table.add_column("Contract")
+    table.add_column("Clause")
+    table.add_column("Page", justify="right")
+    table.add_column("Category")
+    table.add_column("Score", justify="right")
+    table.add_column("Excerpt")
+    for hit in hits:
+        table.add_row(
+            escape(hit.contract_id),
+            escape(f"{hit.clause_id} {hit.title}"),
+            str(hit.page),
+            hit.category,
+            f"{hit.score:.2f}",
+            escape(hit.snippet),
+        )
+    console.print(table)
+
+
+def build_watch_table(
+    entries: list[WatchEntry],
+    directory: Path,
+    caption: str | None = None,
+) -> Table:
+    table = Table(title=f"Watching {escape(str(directory))}", caption=caption)
+    table.add_column("Contract")
+    table.add_column("Status")
+    table.add_column("Risk", justify="right")
+    table.add_column("Leverage", justify="right")
+    table.add_column("Clauses", justify="right")
+    table.add_column("Reused", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("Missing Protections")
+    for entry in entries:
+        result = entry.result
+        summary = result.summary if result is not None else None
+        status = escape(entry.error) if entry.error else entry.status
+        table.add_row(
+            escape(entry.path.name),
+            f"[red]{status}[/]" if entry.error else status,
+            f"[{_risk_style(summary.overall_risk_score)}]{summary.overall_risk_score}[/]"
+            if summary
+            else "-",
+            str(summary.leverage_index) if summary else "-",
+            str(len(result.clauses)) if result else "-",
+            str(entry.reused_clauses) if result else "-",
+            f"{entry.elapsed_seconds:.2f}s" if entry.elapsed_seconds else "-",
+            ", ".join(summary.missing_protections) if summary and summary.missing_protections else "-",
+        )
+    return table
+
+
+def build_progress_table(
+    contract_name: str,
+    events: list[ClauseProgress],
+    risk_estimate: int | None,
+    elapsed_seconds: float,
+) -> Table:
+    completed = events[-1].completed if events else 0
+    total = events[-1].total if events else 0
+    estimate = (
+        f"[{_risk_style(risk_estimate)}]{risk_estimate}/100[/]"
+        if risk_estimate is not None
+        else "-"
+    )
+    table = Table(
+        title=f"Analyzing {escape(contract_name)}: {completed}/{total or '?'} clauses",
+        caption=f"Running risk estimate {estimate} after {elapsed_seconds:.1f}s",
+    )
+    table.add_column("Clause")
+    table.add_column("Page", justify="right")
+    table.add_column("Category")
+    table.add_column("Risk", justify="right")
+    table.add_column("Signals", justify="right")
+    table.add_column("Source")
+    for event in events[-_PROGRESS_TABLE_ROWS:]:
+        analysis = event.analysis
+        table.add_row(
+            escape(f"{analysis.clause_id} {analysis.title}"),
+            str(analysis.page),
+            analysis.category.value,
+            f"[{_risk_style(analysis.risk_score)}]{analysis.risk_score}[/]",
+            str(len(analysis.signals)),
+            event.source,
+        )
+    return table
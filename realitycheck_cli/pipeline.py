@@ -1,112 +1,525 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import dataclasses
 from pathlib import Path
+import time
 
-from realitycheck_cli.analysis.classifier import analyze_clauses
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.classifier import ClauseProgress
+from realitycheck_cli.analysis.rules import RuleSet
+from realitycheck_cli.analysis.triage import DEFAULT_TRIAGE_PAGES
 from realitycheck_cli.analysis.schemas import (
+    BatchFailure,
     ComparisonResult,
     ContractAnalysisResult,
-    ContractRiskSummary,
+    FailureReason,
+    LLMUsage,
+    MultiComparisonResult,
+    RevisionChainResult,
+    TriageResult,
 )
-from realitycheck_cli.clauses.splitter import split_into_clauses
+from realitycheck_cli.batch import BatchTask, Deadlines, StageCallback, run_with_deadlines
+from realitycheck_cli.comparison.chain import build_revision_chain
 from realitycheck_cli.comparison.delta_engine import compare_contract_results
+from realitycheck_cli.comparison.matcher import (
+    ClauseMatchIndex,
+    MatchScorer,
+    build_match_index,
+)
 from realitycheck_cli.config.settings import Settings
-from realitycheck_cli.ingest.pdf_parser import parse_pdf
-from realitycheck_cli.ingest.text_cleaner import clean_pages
-from realitycheck_cli.negotiation.email_generator import generate_negotiation_email
-from realitycheck_cli.scoring.leverage import (
-    compute_ambiguity_index,
-    compute_leverage_index,
-    compute_protection_coverage,
+from realitycheck_cli.engine import (
+    remaining_budget,
+    share_budget,
+    shared_analyzer,
+    unique_contract_ids,
 )
-from realitycheck_cli.scoring.power_imbalance import compute_power_imbalance
-from realitycheck_cli.scoring.risk_engine import compute_contract_scores
+from realitycheck_cli.ingest.pdf_parser import PageTextCache
+
+
+def load_analysis_result(path: Path) -> ContractAnalysisResult:
+    if not path.exists():
+        raise FileNotFoundError(f"Analysis artifact not found: {path}")
+    return ContractAnalysisResult.model_validate_json(path.read_text(encoding="utf-8"))
 
 
 def analyze_contract_file(
     pdf_path: Path,
     settings: Settings,
     use_llm: bool = False,
+    previous_result: ContractAnalysisResult | None = None,
+    registry: BoilerplateRegistry | None = None,
+    page_cache: PageTextCache | None = None,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+    on_clause: Callable[[ClauseProgress], None] | None = None,
+    on_stage: StageCallback | None = None,
+    contract_id: str | None = None,
 ) -> ContractAnalysisResult:
-    cleaned_pages = clean_pages(parse_pdf(pdf_path))
-    contract_id = pdf_path.stem
-    clauses = split_into_clauses(contract_id=contract_id, pages=cleaned_pages)
-    if not clauses:
-        raise ValueError(f"No clauses could be extracted from {pdf_path}.")
-
-    clause_analyses, missing_protections = analyze_clauses(
+    analyzer = shared_analyzer(settings, rules=rules, use_llm=use_llm)
+    return analyzer.analyze(
+        pdf_path,
         contract_id=contract_id,
-        clauses=clauses,
-        settings=settings,
-        use_llm=use_llm,
-    )
-    (
-        overall_risk,
-        category_scores,
-        weighted_contributions,
-        high_risk_clause_ids,
-    ) = compute_contract_scores(
-        clauses=clause_analyses,
-        missing_protections=missing_protections,
-        high_risk_threshold=settings.high_risk_threshold,
-    )
-    power_imbalance = compute_power_imbalance(clause_analyses)
-    ambiguity_index = compute_ambiguity_index(clause_analyses)
-    protection_coverage = compute_protection_coverage(missing_protections)
-    leverage_index = compute_leverage_index(
-        overall_risk=overall_risk,
-        power_imbalance=power_imbalance,
-        ambiguity_index=ambiguity_index,
-        protection_coverage=protection_coverage,
+        previous_result=previous_result,
+        llm_budget_tokens=llm_budget_tokens,
+        registry=registry,
+        page_cache=page_cache,
+        on_clause=on_clause,
+        on_stage=on_stage,
     )
 
-    summary = ContractRiskSummary(
-        contract_id=contract_id,
-        overall_risk_score=overall_risk,
-        power_imbalance_score=power_imbalance,
-        ambiguity_index=ambiguity_index,
-        protection_coverage_score=protection_coverage,
-        leverage_index=leverage_index,
-        category_scores=category_scores,
-        weighted_contributions=weighted_contributions,
-        high_risk_clause_ids=high_risk_clause_ids,
-        missing_protections=missing_protections,
-    )
-    negotiation_email = generate_negotiation_email(
-        contract_name=contract_id,
-        clauses=clause_analyses,
-        overall_risk_score=overall_risk,
-        missing_protections=missing_protections,
-    )
-    return ContractAnalysisResult(
-        contract_id=contract_id,
-        source_path=str(pdf_path),
-        clauses=clause_analyses,
-        summary=summary,
-        negotiation_email=negotiation_email,
+
+def compare_contract_files(
+    baseline_path: Path,
+    revised_path: Path,
+    settings: Settings,
+    use_llm: bool = False,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+) -> tuple[ContractAnalysisResult, ContractAnalysisResult, ComparisonResult]:
+    analyzer = shared_analyzer(settings, rules=rules, use_llm=use_llm)
+    return analyzer.compare(baseline_path, revised_path, llm_budget_tokens=llm_budget_tokens)
+
+
+async def analyze_contract_async(
+    pdf_path: Path,
+    settings: Settings,
+    use_llm: bool = False,
+    previous_result: ContractAnalysisResult | None = None,
+    registry: BoilerplateRegistry | None = None,
+    page_cache: PageTextCache | None = None,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+    on_clause: Callable[[ClauseProgress], None] | None = None,
+    executor: ThreadPoolExecutor | None = None,
+) -> ContractAnalysisResult:
+    analyzer = shared_analyzer(settings, rules=rules, use_llm=use_llm)
+    return await analyzer.analyze_async(
+        pdf_path,
+        previous_result=previous_result,
+        llm_budget_tokens=llm_budget_tokens,
+        registry=registry,
+        page_cache=page_cache,
+        on_clause=on_clause,
+        executor=executor,
     )
 
 
-def compare_contract_files(
+async def compare_contracts_async(
     baseline_path: Path,
     revised_path: Path,
     settings: Settings,
     use_llm: bool = False,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+    executor: ThreadPoolExecutor | None = None,
 ) -> tuple[ContractAnalysisResult, ContractAnalysisResult, ComparisonResult]:
-    baseline_result = analyze_contract_file(
-        pdf_path=baseline_path,
-        settings=settings,
-        use_llm=use_llm,
+    analyzer = shared_analyzer(settings, rules=rules, use_llm=use_llm)
+    return await analyzer.compare_async(
+        baseline_path, revised_path, llm_budget_tokens=llm_budget_tokens, executor=executor
     )
+
+
+def _compare_against_baseline(
+    revised_path: Path,
+    baseline_result: ContractAnalysisResult,
+    baseline_index: ClauseMatchIndex,
+    settings: Settings,
+    use_llm: bool,
+    rules: RuleSet | None,
+    llm_budget_tokens: int | None,
+    contract_id: str | None = None,
+    on_stage: StageCallback | None = None,
+) -> tuple[ContractAnalysisResult, ComparisonResult]:
     revised_result = analyze_contract_file(
         pdf_path=revised_path,
         settings=settings,
         use_llm=use_llm,
+        rules=rules,
+        llm_budget_tokens=llm_budget_tokens,
+        on_stage=on_stage,
+        contract_id=contract_id,
     )
+    if on_stage is not None:
+        on_stage("compare")
     comparison = compare_contract_results(
         baseline=baseline_result,
         revised=revised_result,
         high_risk_threshold=settings.high_risk_threshold,
+        baseline_index=baseline_index,
+        rules=rules,
+    )
+    return revised_result, comparison
+
+
+def _degraded_overrides(settings: Settings, deadlines: Deadlines) -> dict[str, object] | None:
+    # A contract that overran gets one more try without the LLM and with its
+    # clauses capped, which bounds the regex work per clause.
+    if not deadlines.retry_degraded:
+        return None
+    return {
+        "settings": dataclasses.replace(
+            settings, max_clause_chars=deadlines.degraded_clause_chars
+        ),
+        "use_llm": False,
+        "llm_budget_tokens": None,
+    }
+
+
+def _analyze_baseline(
+    baseline_path: Path,
+    baseline_id: str,
+    settings: Settings,
+    use_llm: bool,
+    rules: RuleSet | None,
+    llm_budget_tokens: int | None,
+    deadlines: Deadlines | None,
+) -> tuple[ContractAnalysisResult, list[BatchFailure]]:
+    if deadlines is None or not deadlines.enabled:
+        baseline_result = analyze_contract_file(
+            pdf_path=baseline_path,
+            settings=settings,
+            use_llm=use_llm,
+            rules=rules,
+            llm_budget_tokens=llm_budget_tokens,
+            contract_id=baseline_id,
+        )
+        return baseline_result, []
+    # Every revision waits on the baseline, so it gets the same killable
+    # worker and budgets; without it nothing can be compared.
+    (outcome,) = run_with_deadlines(
+        [
+            BatchTask(
+                key=0,
+                contract_id=baseline_id,
+                source_path=str(baseline_path),
+                function=analyze_contract_file,
+                kwargs={
+                    "pdf_path": baseline_path,
+                    "settings": settings,
+                    "use_llm": use_llm,
+                    "rules": rules,
+                    "llm_budget_tokens": llm_budget_tokens,
+                    "contract_id": baseline_id,
+                },
+                degraded_kwargs=_degraded_overrides(settings, deadlines),
+            )
+        ],
+        deadlines,
+        max_workers=1,
+    )
+    if not outcome.ok:
+        raise ValueError(
+            f"Baseline {baseline_path} did not finish: {outcome.failures[-1].message}"
+        )
+    return outcome.value, list(outcome.failures)
+
+
+def build_flag_matrix(comparisons: list[ComparisonResult]) -> dict[str, dict[str, int]]:
+    matrix: dict[str, dict[str, int]] = {}
+    for comparison in comparisons:
+        row = matrix.setdefault(comparison.revised_contract_id, {})
+        for flag in comparison.flags:
+            row[flag.type] = row.get(flag.type, 0) + 1
+    return matrix
+
+
+def compare_many_contract_files(
+    baseline_path: Path,
+    revised_paths: list[Path],
+    settings: Settings,
+    use_llm: bool = False,
+    max_workers: int | None = None,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+    deadlines: Deadlines | None = None,
+) -> tuple[ContractAnalysisResult, list[ContractAnalysisResult], MultiComparisonResult]:
+    # The flag matrix and every output are keyed by contract id, so revisions
+    # that share a file name must not share an id.
+    baseline_id, *revised_ids = unique_contract_ids([baseline_path, *revised_paths])
+    baseline_result, failures = _analyze_baseline(
+        baseline_path, baseline_id, settings, use_llm, rules, llm_budget_tokens, deadlines
+    )
+    baseline_index = build_match_index(
+        baseline_result.clauses, scorer=MatchScorer(settings.match_scorer)
+    )
+    revision_budget = share_budget(
+        remaining_budget(llm_budget_tokens, [baseline_result]), len(revised_paths)
+    )
+
+    if deadlines is not None and deadlines.enabled:
+        # Budgets can only be enforced on a killable worker, so this path
+        # uses one even for a single revision or --workers 1.
+        batch = run_with_deadlines(
+            [
+                BatchTask(
+                    key=idx,
+                    contract_id=contract_id,
+                    source_path=str(path),
+                    function=_compare_against_baseline,
+                    kwargs={
+                        "revised_path": path,
+                        "baseline_result": baseline_result,
+                        "baseline_index": baseline_index,
+                        "settings": settings,
+                        "use_llm": use_llm,
+                        "rules": rules,
+                        "llm_budget_tokens": revision_budget,
+                        "contract_id": contract_id,
+                    },
+                    degraded_kwargs=_degraded_overrides(settings, deadlines),
+                )
+                for idx, (path, contract_id) in enumerate(zip(revised_paths, revised_ids))
+            ],
+            deadlines,
+            max_workers=max_workers,
+        )
+        outcomes = [outcome.value for outcome in batch if outcome.ok]
+        failures += [failure for outcome in batch for failure in outcome.failures]
+    elif max_workers == 1 or len(revised_paths) <= 1:
+        outcomes = [
+            _compare_against_baseline(
+                path,
+                baseline_result,
+                baseline_index,
+                settings,
+                use_llm,
+                rules,
+                revision_budget,
+                contract_id,
+            )
+            for path, contract_id in zip(revised_paths, revised_ids)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _compare_against_baseline,
+                    path,
+                    baseline_result,
+                    baseline_index,
+                    settings,
+                    use_llm,
+                    rules,
+                    revision_budget,
+                    contract_id,
+                )
+                for path, contract_id in zip(revised_paths, revised_ids)
+            ]
+            outcomes = [future.result() for future in futures]
+
+    revised_results = [revised for revised, _ in outcomes]
+    comparisons = [comparison for _, comparison in outcomes]
+    return (
+        baseline_result,
+        revised_results,
+        MultiComparisonResult(
+            baseline_contract_id=baseline_result.contract_id,
+            comparisons=comparisons,
+            flag_matrix=build_flag_matrix(comparisons),
+            llm_usage=LLMUsage.combine(
+                [baseline_result.llm_usage]
+                + [result.llm_usage for result in revised_results]
+            ),
+            failures=failures,
+        ),
+    )
+
+
+def compare_revision_chain(
+    version_paths: list[Path],
+    settings: Settings,
+    use_llm: bool = False,
+    max_workers: int | None = None,
+    rules: RuleSet | None = None,
+    llm_budget_tokens: int | None = None,
+    deadlines: Deadlines | None = None,
+) -> tuple[list[ContractAnalysisResult], RevisionChainResult]:
+    if len(version_paths) < 2:
+        raise ValueError("A revision chain needs at least two contract versions.")
+    if deadlines is not None and "compare" in deadlines.stage_seconds:
+        # Versions are matched in this process once all of them are analyzed,
+        # so there is no worker to hold to a compare budget.
+        raise ValueError(
+            "A compare stage timeout does not apply to compare-chain; "
+            "use --timeout or the parse, split, classify and score stages."
+        )
+
+    # Each version is analyzed exactly once; the chain then only matches
+    # consecutive pairs, so cost grows linearly with the number of versions.
+    failures: list[BatchFailure] = []
+    version_ids = unique_contract_ids(version_paths)
+    if deadlines is not None and deadlines.enabled:
+        version_budget = share_budget(llm_budget_tokens, len(version_paths))
+        batch = run_with_deadlines(
+            [
+                BatchTask(
+                    key=idx,
+                    contract_id=contract_id,
+                    source_path=str(path),
+                    function=analyze_contract_file,
+                    kwargs={
+                        "pdf_path": path,
+                        "settings": settings,
+                        "use_llm": use_llm,
+                        "rules": rules,
+                        "llm_budget_tokens": version_budget,
+                        "contract_id": contract_id,
+                    },
+                    degraded_kwargs=_degraded_overrides(settings, deadlines),
+                )
+                for idx, (path, contract_id) in enumerate(zip(version_paths, version_ids))
+            ],
+            deadlines,
+            max_workers=max_workers,
+        )
+        results = [outcome.value for outcome in batch if outcome.ok]
+        failures = [failure for outcome in batch for failure in outcome.failures]
+        if len(results) < 2:
+            raise ValueError(
+                f"Only {len(results)} of {len(version_paths)} versions finished within "
+                "their time budget; a revision chain needs at least two."
+            )
+    elif max_workers == 1:
+        results: list[ContractAnalysisResult] = []
+        for path, contract_id in zip(version_paths, version_ids):
+            results.append(
+                analyze_contract_file(
+                    pdf_path=path,
+                    settings=settings,
+                    use_llm=use_llm,
+                    rules=rules,
+                    llm_budget_tokens=remaining_budget(llm_budget_tokens, results),
+                    contract_id=contract_id,
+                )
+            )
+    else:
+        version_budget = share_budget(llm_budget_tokens, len(version_paths))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    analyze_contract_file,
+                    path,
+                    settings,
+                    use_llm,
+                    rules=rules,
+                    llm_budget_tokens=version_budget,
+                    contract_id=contract_id,
+                )
+                for path, contract_id in zip(version_paths, version_ids)
+            ]
+            results = [future.result() for future in futures]
+
+    chain = build_revision_chain(
+        results,
+        high_risk_threshold=settings.high_risk_threshold,
+        rules=rules,
+        scorer=MatchScorer(settings.match_scorer),
+    )
+    chain.llm_usage = LLMUsage.combine([result.llm_usage for result in results])
+    chain.failures = failures
+    return results, chain
+
+
+def _triage_file(
+    path: Path,
+    contract_id: str,
+    settings: Settings,
+    rules: RuleSet | None,
+    first_pages: int,
+    threshold: int | None,
+) -> TriageResult | BatchFailure:
+    # One unreadable PDF in a data room must not sink the rest of the scan,
+    # so errors come back as values rather than through the executor.
+    started = time.perf_counter()
+    try:
+        return shared_analyzer(settings, rules=rules).triage(
+            path, contract_id=contract_id, first_pages=first_pages, threshold=threshold
+        )
+    except (OSError, ValueError) as exc:
+        return BatchFailure(
+            contract_id=contract_id,
+            source_path=str(path),
+            stage="parse",
+            reason=FailureReason.ERROR,
+            message=f"{type(exc).__name__}: {exc}",
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+
+def _analyze_queued_file(
+    path: Path,
+    contract_id: str,
+    settings: Settings,
+    use_llm: bool,
+    rules: RuleSet | None,
+    llm_budget_tokens: int | None,
+) -> ContractAnalysisResult | BatchFailure:
+    started = time.perf_counter()
+    try:
+        return analyze_contract_file(
+            path,
+            settings,
+            use_llm=use_llm,
+            rules=rules,
+            llm_budget_tokens=llm_budget_tokens,
+            contract_id=contract_id,
+        )
+    except (OSError, ValueError) as exc:
+        return BatchFailure(
+            contract_id=contract_id,
+            source_path=str(path),
+            reason=FailureReason.ERROR,
+            message=f"{type(exc).__name__}: {exc}",
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+
+def triage_contract_files(
+    pdf_paths: list[Path],
+    settings: Settings,
+    rules: RuleSet | None = None,
+    first_pages: int = DEFAULT_TRIAGE_PAGES,
+    threshold: int | None = None,
+    max_workers: int | None = None,
+    deep: bool = True,
+    use_llm: bool = False,
+    llm_budget_tokens: int | None = None,
+) -> tuple[list[TriageResult], list[ContractAnalysisResult], list[BatchFailure]]:
+    contract_ids = unique_contract_ids(pdf_paths)
+    triage_args = [
+        (path, contract_id, settings, rules, first_pages, threshold)
+        for path, contract_id in zip(pdf_paths, contract_ids)
+    ]
+    if max_workers == 1 or len(pdf_paths) <= 1:
+        scanned = [_triage_file(*args) for args in triage_args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            scanned = list(executor.map(_triage_file, *zip(*triage_args)))
+
+    failures = [outcome for outcome in scanned if isinstance(outcome, BatchFailure)]
+    results = sorted(
+        (outcome for outcome in scanned if isinstance(outcome, TriageResult)),
+        key=lambda result: (-result.approximate_risk_score, result.contract_id),
     )
-    return baseline_result, revised_result, comparison
+    paths_by_id = dict(zip(contract_ids, pdf_paths))
+    queued = [result.contract_id for result in results if result.queued_for_full_analysis]
+    if not deep or not queued:
+        return results, [], failures
 
+    budget = share_budget(llm_budget_tokens, len(queued))
+    analyze_args = [
+        (paths_by_id[contract_id], contract_id, settings, use_llm, rules, budget)
+        for contract_id in queued
+    ]
+    if max_workers == 1 or len(queued) <= 1:
+        analyzed = [_analyze_queued_file(*args) for args in analyze_args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            analyzed = list(executor.map(_analyze_queued_file, *zip(*analyze_args)))
+    failures.extend(outcome for outcome in analyzed if isinstance(outcome, BatchFailure))
+    full_results = [
+        outcome for outcome in analyzed if isinstance(outcome, ContractAnalysisResult)
+    ]
+    return results, full_results, failures
@@ -0,0 +1 @@
+"""Portfolio storage and query modules."""
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import sqlite3
+
+from realitycheck_cli.analysis.schemas import ClauseAnalysis, ContractAnalysisResult
+
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS clause_search USING fts5(
+    contract_id UNINDEXED,
+    clause_id UNINDEXED,
+    page UNINDEXED,
+    title,
+    category,
+    signals,
+    text,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS clause_search_documents (
+    contract_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+"""
+
+# bm25 column weights follow the clause_search column order; unindexed columns get 0.
+_BM25_WEIGHTS = "0.0, 0.0, 0.0, 4.0, 1.0, 2.0, 1.0"
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    contract_id: str
+    clause_id: str
+    page: int
+    title: str
+    category: str
+    score: float
+    snippet: str
+
+
+def ensure_search_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(_SEARCH_SCHEMA)
+
+
+def _signals_text(clause: ClauseAnalysis) -> str:
+    return " ".join(
+        f"{signal.type.value} {signal.label}" for signal in clause.signals
+    )
+
+
+def _content_hash(result: ContractAnalysisResult) -> str:
+    digest = hashlib.sha256()
+    for clause in result.clauses:
+        for part in (
+            clause.clause_id,
+            str(clause.page),
+            clause.title,
+            clause.category.value,
+            _signals_text(clause),
+            clause.text,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def index_contract(conn: sqlite3.Connection, result: ContractAnalysisResult) -> bool:
+    content_hash = _content_hash(result)
+    row = conn.execute(
+        "SELECT content_hash FROM clause_search_documents WHERE contract_id = ?",
+        (result.contract_id,),
+    ).fetchone()
+    if row is not None and row[0] == content_hash:
+        return False
+
+    conn.execute("DELETE FROM clause_search WHERE contract_id = ?", (result.contract_id,))
+    conn.executemany(
+        "INSERT INTO clause_search VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                result.contract_id,
+                clause.clause_id,
+                clause.page,
+                clause.title,
+                clause.category.value,
+                _signals_text(clause),
+                clause.text,
+            )
+            for clause in result.clauses
+        ],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO clause_search_documents VALUES (?, ?)",
+        (result.contract_id, content_hash),
+    )
+    return True
+
+
+def _quote(term: str) -> str:
+    return '"' + term.strip().replace('"', '""') + '"'
+
+
+def build_match_expression(
+    phrase: str,
+    near: str | None = None,
+    distance: int = 10,
+) -> str:
+    if not phrase.strip():
+        raise ValueError("Search phrase must not be empty.")
+    if near is None or not near.strip():
+        return _quote(phrase)
+    return f"NEAR({_quote(phrase)} {_quote(near)}, {max(0, distance)})"
+
+
+def search_clauses(
+    conn: sqlite3.Connection,
+    match_expression: str,
+    limit: int = 20,
+) -> list[SearchHit]:
+    try:
+        rows = conn.execute(
+            "SELECT contract_id, clause_id, page, title, category, "
+            f"bm25(clause_search, {_BM25_WEIGHTS}) AS rank, "
+            "snippet(clause_search, 6, '[', ']', '...', 16) "
+            "FROM clause_search WHERE clause_search MATCH ? "
+            "ORDER BY rank LIMIT ?",
+            (match_expression, max(1, limit)),
+        ).fetchall()
+    except sqlite3.OperationalError as exc:
+        raise ValueError(f"Invalid search query {match_expression!r}: {exc}") from exc
+    return [
+        SearchHit(
+            contract_id=row[0],
+            clause_id=row[1],
+            page=int(row[2]),
+            title=row[3],
+            category=row[4],
+            score=round(-row[5], 4),
+            snippet=row[6],
+        )
+        for row in rows
+    ]
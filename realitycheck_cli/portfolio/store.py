@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from pydantic import ValidationError
+
+from realitycheck_cli.analysis.schemas import ContractAnalysisResult
+from realitycheck_cli.portfolio.search import (
+    SearchHit,
+    ensure_search_schema,
+    index_contract,
+    search_clauses,
+)
+
+DEFAULT_PORTFOLIO_DB = Path("artifacts") / "portfolio.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    contract_id TEXT PRIMARY KEY,
+    source_path TEXT NOT NULL,
+    overall_risk_score INTEGER NOT NULL,
+    power_imbalance_score INTEGER NOT NULL,
+    ambiguity_index INTEGER NOT NULL,
+    protection_coverage_score INTEGER NOT NULL,
+    leverage_index INTEGER NOT NULL,
+    clause_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clauses (
+    contract_id TEXT NOT NULL,
+    clause_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    risk_score INTEGER NOT NULL,
+    benefits_party TEXT NOT NULL,
+    PRIMARY KEY (contract_id, clause_id)
+);
+CREATE TABLE IF NOT EXISTS signals (
+    contract_id TEXT NOT NULL,
+    clause_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    label TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    evidence TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS missing_protections (
+    contract_id TEXT NOT NULL,
+    protection TEXT NOT NULL,
+    PRIMARY KEY (contract_id, protection)
+);
+CREATE INDEX IF NOT EXISTS idx_contracts_risk ON contracts (overall_risk_score);
+CREATE INDEX IF NOT EXISTS idx_contracts_leverage ON contracts (leverage_index);
+CREATE INDEX IF NOT EXISTS idx_clauses_category_risk ON clauses (category, risk_score);
+CREATE INDEX IF NOT EXISTS idx_signals_type ON signals (type, contract_id);
+CREATE INDEX IF NOT EXISTS idx_signals_clause ON signals (contract_id, clause_id);
+CREATE INDEX IF NOT EXISTS idx_missing_protection ON missing_protections (protection, contract_id);
+"""
+
+_CHILD_TABLES = ("clauses", "signals", "missing_protections")
+
+
+@dataclass(frozen=True)
+class PortfolioQuery:
+    missing_protections: tuple[str, ...] = ()
+    category: str | None = None
+    signal_type: str | None = None
+    min_risk: int | None = None
+    max_risk: int | None = None
+    min_leverage: int | None = None
+    max_leverage: int | None = None
+    limit: int = 100
+
+
+@dataclass(frozen=True)
+class ContractRow:
+    contract_id: str
+    source_path: str
+    overall_risk_score: int
+    power_imbalance_score: int
+    protection_coverage_score: int
+    leverage_index: int
+    clause_count: int
+    missing_protections: tuple[str, ...]
+
+
+def _artifact_analyses(payload: Any) -> list[Any]:
+    if isinstance(payload, dict) and isinstance(payload.get("versions"), list):
+        # compare-chain writes every version's analysis in order.
+        return payload["versions"]
+    if isinstance(payload, dict) and isinstance(payload.get("analyses"), list):
+        # triage writes the full analyses of the contracts it queued.
+        return payload["analyses"]
+    if isinstance(payload, dict) and "baseline" in payload and "revised" in payload:
+        # compare writes one revised analysis, compare-many a list of them.
+        revised = payload["revised"]
+        return [payload["baseline"], *(revised if isinstance(revised, list) else [revised])]
+    return [payload]
+
+
+def _ndjson_analyses(records: Iterable[Any]) -> list[dict[str, Any]]:
+    # Every NDJSON artifact writes each analysis as a contract record followed
+    # by its clause records; the other record types carry no analyses.
+    analyses: list[dict[str, Any]] = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        record_type = record.get("record_type")
+        fields = {key: value for key, value in record.items() if key != "record_type"}
+        if record_type == "contract":
+            analyses.append({**fields, "clauses": []})
+        elif record_type == "clause" and analyses:
+            analyses[-1]["clauses"].append(fields)
+    return analyses
+
+
+def _read_artifact(path: Path) -> list[Any]:
+    text = path.read_text(encoding="utf-8")
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path} is neither a JSON nor an NDJSON artifact: {exc}") from exc
+    else:
+        if not (isinstance(payload, dict) and "record_type" in payload):
+            return _artifact_analyses(payload)
+        records = [payload]
+    analyses = _ndjson_analyses(records)
+    if not analyses:
+        raise ValueError(f"{path} holds no contract records to load.")
+    return analyses
+
+
+def load_portfolio_artifact(path: Path) -> list[ContractAnalysisResult]:
+    if not path.exists():
+        raise FileNotFoundError(f"Artifact not found: {path}")
+    try:
+        return [
+            ContractAnalysisResult.model_validate(analysis) for analysis in _read_artifact(path)
+        ]
+    except ValidationError as exc:
+        raise ValueError(
+            f"{path} is not an analysis or comparison artifact "
+            f"({exc.error_count()} validation error(s), first: {exc.errors()[0]['msg']})."
+        ) from exc
+
+
+class PortfolioStore:
+    def __init__(self, path: Path = DEFAULT_PORTFOLIO_DB) -> None:
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(_SCHEMA)
+        ensure_search_schema(self._conn)
+
+    def __enter__(self) -> "PortfolioStore":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def ingest(self, results: Iterable[ContractAnalysisResult]) -> int:
+        count = 0
+        with self._conn:
+            for result in results:
+                self._replace_contract(result)
+                index_contract(self._conn, result)
+                count += 1
+        return count
+
+    def _replace_contract(self, result: ContractAnalysisResult) -> None:
+        contract_id = result.contract_id
+        self._conn.execute("DELETE FROM contracts WHERE contract_id = ?", (contract_id,))
+        for table in _CHILD_TABLES:
+            self._conn.execute(f"DELETE FROM {table} WHERE contract_id = ?", (contract_id,))
+
+        summary = result.summary
+        self._conn.execute(
+            "INSERT INTO contracts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                contract_id,
+                result.source_path,
+                summary.overall_risk_score,
+                summary.power_imbalance_score,
+                summary.ambiguity_index,
+                summary.protection_coverage_score,
+                summary.leverage_index,
+                len(result.clauses),
+            ),
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO clauses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    contract_id,
+                    clause.clause_id,
+                    clause.title,
+                    clause.page,
+                    clause.category.value,
+                    clause.risk_level.value,
+                    clause.risk_score,
+                    clause.benefits_party.value,
+                )
+                for clause in result.clauses
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    contract_id,
+                    clause.clause_id,
+                    signal.type.value,
+                    signal.label,
+                    signal.severity.value,
+                    signal.evidence,
+                )
+                for clause in result.clauses
+                for signal in clause.signals
+            ],
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO missing_protections VALUES (?, ?)",
+            [(contract_id, item) for item in summary.missing_protections],
+        )
+
+    def search(self, match_expression: str, limit: int = 20) -> list[SearchHit]:
+        return search_clauses(self._conn, match_expression, limit=limit)
+
+    def query(self, query: PortfolioQuery) -> list[ContractRow]:
+        conditions: list[str] = []
+        params: list[Any] = []
+        for protection in query.missing_protections:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM missing_protections mp "
+                "WHERE mp.contract_id = c.contract_id AND mp.protection = ?)"
+            )
+            params.append(protection)
+        if query.category is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM clauses cl "
+                "WHERE cl.contract_id = c.contract_id AND cl.category = ?)"
+            )
+            params.append(query.category)
+        if query.signal_type is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM signals s "
+                "WHERE s.contract_id = c.contract_id AND s.type = ?)"
+            )
+            params.append(query.signal_type)
+        for column, operator, value in (
+            ("overall_risk_score", ">=", query.min_risk),
+            ("overall_risk_score", "<=", query.max_risk),
+            ("leverage_index", ">=", query.min_leverage),
+            ("leverage_index", "<=", query.max_leverage),
+        ):
+            if value is not None:
+                conditions.append(f"c.{column} {operator} ?")
+                params.append(value)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(
+            "SELECT c.contract_id, c.source_path, c.overall_risk_score, "
+            "c.power_imbalance_score, c.protection_coverage_score, c.leverage_index, "
+            "c.clause_count, "
+            "(SELECT group_concat(protection, ',') FROM missing_protections mp "
+            "WHERE mp.contract_id = c.contract_id) "
+            f"FROM contracts c {where} "
+            "ORDER BY c.overall_risk_score DESC, c.contract_id LIMIT ?",
+            [*params, max(1, query.limit)],
+        ).fetchall()
+        return [
+            ContractRow(
+                contract_id=row[0],
+                source_path=row[1],
+                overall_risk_score=row[2],
+                power_imbalance_score=row[3],
+                protection_coverage_score=row[4],
+                leverage_index=row[5],
+                clause_count=row[6],
+                missing_protections=tuple(sorted(row[7].split(","))) if row[7] else (),
+            )
+            for row in rows
+        ]
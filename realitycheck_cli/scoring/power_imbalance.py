@@ -1,10 +1,8 @@
 from __future__ import annotations
 
+from realitycheck_cli.analysis.rules import MUTUALITY_MARKERS, NOTICE_MARKERS
 from realitycheck_cli.analysis.schemas import BenefitsParty, ClauseAnalysis, SignalType
 
-_MUTUALITY_MARKERS = ("mutual", "both parties", "each party")
-_NOTICE_MARKERS = ("written notice", "notice period", "days notice")
-
 
 def compute_power_imbalance(clauses: list[ClauseAnalysis]) -> int:
     unilateral_rights = 0
@@ -14,6 +12,8 @@ def compute_power_imbalance(clauses: list[ClauseAnalysis]) -> int:
     notice_protections = 0
 
     for clause in clauses:
+        # Plain substring checks, deliberately looser than the word-bounded
+        # signal phrases: "sole discretionary" still counts here.
         lowered = clause.text.lower()
         if clause.benefits_party in (BenefitsParty.CLIENT, BenefitsParty.VENDOR):
             asymmetric_obligations += 1
@@ -21,9 +21,9 @@ def compute_power_imbalance(clauses: list[ClauseAnalysis]) -> int:
             sole_discretion_terms += 1
         if "without notice" in lowered:
             unilateral_rights += 1
-        if any(marker in lowered for marker in _MUTUALITY_MARKERS):
+        if any(marker in lowered for marker in MUTUALITY_MARKERS):
             mutuality_markers += 1
-        if any(marker in lowered for marker in _NOTICE_MARKERS):
+        if any(marker in lowered for marker in NOTICE_MARKERS):
             notice_protections += 1
         for signal in clause.signals:
             if signal.type == SignalType.ONE_SIDED_RIGHT:
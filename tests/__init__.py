@@ -1,2 +1,16 @@
 """Test suite for RealityCheck CLI."""
 
+from __future__ import annotations
+
+from realitycheck_cli.config.settings import Settings
+
+
+def make_settings(**overrides: object) -> Settings:
+    values: dict[str, object] = {
+        "gemini_api_key": None,
+        "gemini_model": "gemini-3-flash-preview",
+        "high_risk_threshold": 70,
+        "llm_timeout_seconds": 7,
+    }
+    values.update(overrides)
+    return Settings(**values)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from pathlib import Path
+import time
+import unittest
+from unittest.mock import patch
+
+from realitycheck_cli.analysis.schemas import FailureReason
+from realitycheck_cli.batch import (
+    BatchTask,
+    Deadlines,
+    StageCallback,
+    deadlines_from_options,
+    parse_stage_timeouts,
+    run_with_deadlines,
+)
+from realitycheck_cli.pipeline import compare_many_contract_files, compare_revision_chain
+
+from tests import make_settings
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _stalled_analysis(**kwargs: object) -> None:
+    time.sleep(30)
+
+
+def _staged_job(
+    name: str,
+    stall_stage: str | None = None,
+    fail: bool = False,
+    on_stage: StageCallback | None = None,
+) -> str:
+    for stage in ("parse", "classify"):
+        if on_stage is not None:
+            on_stage(stage)
+        if stage == stall_stage:
+            time.sleep(30)
+    if fail:
+        raise ValueError(f"{name} has no clauses")
+    return name
+
+
+def _task(
+    key: int, degraded_kwargs: dict[str, object] | None = None, **kwargs: object
+) -> BatchTask:
+    return BatchTask(
+        key=key,
+        contract_id=f"c{key}",
+        source_path=f"c{key}.pdf",
+        function=_staged_job,
+        kwargs={"name": f"c{key}", **kwargs},
+        degraded_kwargs=degraded_kwargs,
+    )
+
+
+class DeadlineRunnerTests(unittest.TestCase):
+    def test_overrunning_contract_is_killed_without_stalling_the_batch(self) -> None:
+        started = time.monotonic()
+        outcomes = run_with_deadlines(
+            [
+                _task(0),
+                _task(1, stall_stage="classify"),
+                _task(2, fail=True),
+                _task(3),
+            ],
+            Deadlines(contract_seconds=10, stage_seconds={"classify": 0.5}),
+            max_workers=2,
+        )
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual([outcome.value for outcome in outcomes], ["c0", None, None, "c3"])
+
+        (timeout,) = outcomes[1].failures
+        self.assertEqual(timeout.reason, FailureReason.TIMEOUT)
+        self.assertEqual(timeout.stage, "classify")
+        self.assertFalse(timeout.retried)
+        (error,) = outcomes[2].failures
+        self.assertEqual(error.reason, FailureReason.ERROR)
+        self.assertIn("has no clauses", error.message)
+
+    def test_timed_out_contract_is_retried_once_with_degraded_settings(self) -> None:
+        outcomes = run_with_deadlines(
+            [
+                _task(0, stall_stage="parse", degraded_kwargs={"stall_stage": None}),
+                _task(1, stall_stage="parse", degraded_kwargs={"name": "still slow"}),
+            ],
+            Deadlines(contract_seconds=0.5, retry_degraded=True),
+            max_workers=2,
+        )
+        self.assertEqual(outcomes[0].value, "c0")
+        self.assertEqual([failure.retried for failure in outcomes[0].failures], [True])
+        self.assertIsNone(outcomes[1].value)
+        self.assertEqual(
+            [(failure.degraded, failure.retried) for failure in outcomes[1].failures],
+            [(False, True), (True, False)],
+        )
+
+    def test_stage_timeout_options_are_validated(self) -> None:
+        self.assertEqual(
+            parse_stage_timeouts(["Parse=2.5", "score=1"]), {"parse": 2.5, "score": 1.0}
+        )
+        for value in ("parse", "render=3", "parse=soon", "parse=0"):
+            with self.assertRaises(ValueError):
+                parse_stage_timeouts([value])
+        self.assertIsNone(deadlines_from_options(None, None, False))
+        with self.assertRaises(ValueError):
+            deadlines_from_options(None, [], True)
+
+
+class PipelineDeadlineTests(unittest.TestCase):
+    def test_stalled_baseline_is_killed_instead_of_stalling_compare_many(self) -> None:
+        started = time.monotonic()
+        with patch("realitycheck_cli.pipeline.analyze_contract_file", _stalled_analysis):
+            with self.assertRaisesRegex(ValueError, "Baseline .* did not finish"):
+                compare_many_contract_files(
+                    _ROOT / "baseline.pdf",
+                    [_ROOT / "revised.pdf"],
+                    make_settings(),
+                    deadlines=Deadlines(contract_seconds=0.5),
+                )
+        self.assertLess(time.monotonic() - started, 10)
+
+    def test_compare_stage_budget_is_rejected_for_chains(self) -> None:
+        with self.assertRaisesRegex(ValueError, "compare-chain"):
+            compare_revision_chain(
+                [_ROOT / "baseline.pdf", _ROOT / "revised.pdf"],
+                make_settings(),
+                deadlines=Deadlines(stage_seconds={"compare": 1.0}),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import tempfile
+import unittest
+
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.category_model import (
+    CategoryModel,
+    LabelledClause,
+    evaluate_category_model,
+    labelled_from_analyses,
+    load_category_model,
+    split_holdout,
+    train_category_model,
+)
+from realitycheck_cli.analysis.classifier import analyze_clauses
+from realitycheck_cli.analysis.schemas import Clause, ClauseCategory
+
+from tests import make_settings
+
+# Wording the regex heuristics do not know, standing in for LLM labels.
+_VOCABULARY = {
+    ClauseCategory.TERMINATION: ["wind down", "walk away from", "end the engagement"],
+    ClauseCategory.FINANCIAL_RISK: ["remit", "surcharge", "net sixty"],
+    ClauseCategory.PRIVACY: ["personal records", "data subject", "breach notification"],
+    ClauseCategory.IP_TRANSFER: ["work product", "deliverables vest", "moral rights"],
+    ClauseCategory.NEUTRAL: ["headings", "counterparts", "entire understanding"],
+}
+_FILLER = "the parties agree that each side will act in good faith under this section".split()
+
+
+def _samples(count: int, seed: int = 3) -> list[LabelledClause]:
+    rng = random.Random(seed)
+    samples: list[LabelledClause] = []
+    for idx in range(count):
+        category = list(_VOCABULARY)[idx % len(_VOCABULARY)]
+        words = rng.sample(_FILLER, 8) + [rng.choice(_VOCABULARY[category])]
+        rng.shuffle(words)
+        samples.append(LabelledClause(f"Section {idx}", " ".join(words) + ".", category))
+    return samples
+
+
+class CategoryModelTests(unittest.TestCase):
+    def test_learns_llm_labels_the_heuristics_miss(self) -> None:
+        train, holdout = split_holdout(_samples(300), 0.2)
+        self.assertTrue(train and holdout)
+        evaluation = evaluate_category_model(train_category_model(train), len(train), holdout)
+        self.assertGreater(evaluation.model_agreement, 0.95)
+        self.assertGreater(evaluation.model_agreement, evaluation.heuristic_agreement)
+        self.assertGreater(evaluation.model_clauses_per_second, 0)
+
+    def test_model_round_trips_through_its_file(self) -> None:
+        model = train_category_model(_samples(100), epochs=4)
+        documents = [(sample.title, sample.text) for sample in _samples(20, seed=9)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = model.save(Path(directory) / "model.json")
+            loaded = load_category_model(path)
+            self.assertIs(load_category_model(path), loaded)
+            self.assertEqual(CategoryModel.load(path).version, loaded.version)
+        self.assertEqual(
+            [category for category, _ in loaded.predict_batch(documents)],
+            [category for category, _ in model.predict_batch(documents)],
+        )
+        with self.assertRaises(ValueError):
+            load_category_model(Path("missing-model.json"))
+
+    def test_analyze_clauses_uses_learned_tier_when_given_a_model(self) -> None:
+        model = train_category_model(_samples(300))
+        clause = Clause(
+            contract_id="draft",
+            clause_id="C-001",
+            title="Section 1",
+            page=1,
+            text="Either side may wind down this section in good faith.",
+        )
+        heuristic, _ = analyze_clauses("draft", [clause], make_settings())
+        learned, _ = analyze_clauses("draft", [clause], make_settings(), category_model=model)
+        self.assertEqual(heuristic[0].category, ClauseCategory.NEUTRAL)
+        self.assertEqual(learned[0].category, ClauseCategory.TERMINATION)
+        self.assertIn("Learned category", learned[0].explanation)
+
+    def test_only_llm_labelled_registry_entries_are_training_data(self) -> None:
+        registry = BoilerplateRegistry()
+        clauses = [
+            Clause(contract_id="draft", clause_id=f"C-00{idx}", title="T", page=1, text=text)
+            for idx, text in enumerate(["Fees are due in thirty days.", "Notices in writing."])
+        ]
+        analyses, _ = analyze_clauses("draft", clauses, make_settings())
+        self.assertEqual([analysis.source for analysis in analyses], ["heuristic"] * 2)
+        labelled_analyses = [analysis.model_copy(update={"source": "llm"}) for analysis in analyses]
+        registry.register(clauses[0], labelled_analyses[0], enriched=True)
+        registry.register(clauses[1], labelled_analyses[1], enriched=False)
+        # The explanation is model text and may mention anything; only the
+        # recorded source decides.
+        quoting = labelled_analyses[0].model_copy(
+            update={"explanation": "Not an LLM unavailable case."}
+        )
+        fallback = analyses[0].model_copy(update={"source": "fallback"})
+
+        labelled = labelled_from_analyses(
+            registry.enriched_analyses() + [quoting, fallback, analyses[1]]
+        )
+        self.assertEqual(
+            [sample.text for sample in labelled], [clauses[0].text, clauses[0].text]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
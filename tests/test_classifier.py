@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+import unittest
+from unittest.mock import patch
+
+from realitycheck_cli.analysis.boilerplate import BoilerplateRegistry
+from realitycheck_cli.analysis.classifier import ClauseProgress, analyze_clauses
+from realitycheck_cli.analysis.schemas import Clause
+from realitycheck_cli.pipeline import analyze_contract_file
+
+from tests import make_settings
+
+_SAMPLE_PDF = Path(__file__).resolve().parents[1] / "contract.pdf"
+
+
+def _clause(clause_id: str, title: str, text: str, page: int = 1) -> Clause:
+    return Clause(
+        contract_id="draft",
+        clause_id=clause_id,
+        title=title,
+        page=page,
+        text=text,
+    )
+
+
+class IncrementalAnalysisTests(unittest.TestCase):
+    def test_reuses_unchanged_clauses_and_reanalyzes_changed_ones(self) -> None:
+        previous_clauses = [
+            _clause("C-001", "Payment", "Invoices are due within 30 days."),
+            _clause("C-002", "Termination", "Either party may terminate with notice."),
+        ]
+        previous, _ = analyze_clauses(
+            contract_id="draft",
+            clauses=previous_clauses,
+            settings=make_settings(),
+        )
+        previous[0] = previous[0].model_copy(update={"explanation": "cached"})
+
+        revised_clauses = [
+            _clause("C-001", "Payment", "Invoices are due  within 30 days!", page=2),
+            _clause("C-002", "Termination", "Company may terminate without notice."),
+        ]
+        with patch("realitycheck_cli.analysis.classifier.LLMClient") as mock_client:
+            mock_client.return_value.classify_clause.return_value = {}
+            analyses, missing = analyze_clauses(
+                contract_id="draft",
+                clauses=revised_clauses,
+                settings=make_settings(),
+                use_llm=True,
+                previous_analyses=previous,
+            )
+
+        self.assertEqual(analyses[0].explanation, "cached")
+        self.assertEqual(analyses[0].page, 2)
+        self.assertEqual(analyses[0].text, revised_clauses[0].text)
+        self.assertNotEqual(analyses[1].explanation, "cached")
+        self.assertEqual(mock_client.return_value.classify_clause.call_count, 1)
+        self.assertNotIn("payment_timeline", missing)
+
+
+_CONFIDENTIALITY = (
+    "Each party shall keep confidential all non-public information disclosed by the "
+    "other party in connection with this agreement and shall use such information "
+    "solely for the purpose of performing its obligations hereunder. These obligations "
+    "survive for three years after termination of this agreement, except for trade "
+    "secrets, which remain protected for as long as they qualify as trade secrets "
+    "under applicable law."
+)
+
+
+class BoilerplateRegistryTests(unittest.TestCase):
+    def test_reuses_cluster_analysis_for_identical_and_near_identical_clauses(self) -> None:
+        registry = BoilerplateRegistry()
+        first = [_clause("C-001", "Confidentiality", _CONFIDENTIALITY)]
+        second = [
+            _clause("C-004", "Confidential Information", _CONFIDENTIALITY.upper()),
+            _clause(
+                "C-005",
+                "Confidentiality",
+                _CONFIDENTIALITY.replace("Each party", "Either party"),
+            ),
+            _clause("C-006", "Payment", "Invoices are due within 30 days."),
+        ]
+        with patch("realitycheck_cli.analysis.classifier.LLMClient") as mock_client:
+            mock_client.return_value.classify_clause.return_value = {
+                "explanation": "canonical"
+            }
+            analyze_clauses("a", first, make_settings(), use_llm=True, registry=registry)
+            analyses, _ = analyze_clauses(
+                "b", second, make_settings(), use_llm=True, registry=registry
+            )
+
+        self.assertEqual(mock_client.return_value.classify_clause.call_count, 2)
+        self.assertEqual(
+            [analysis.explanation for analysis in analyses[:2]], ["canonical"] * 2
+        )
+        self.assertEqual(analyses[1].clause_id, "C-005")
+        self.assertEqual([analysis.source for analysis in analyses], ["llm"] * 3)
+        stats = registry.stats()
+        self.assertEqual((stats.clusters, stats.exact_hits, stats.near_hits), (2, 1, 1))
+        self.assertEqual(stats.llm_calls_saved, 2)
+
+    def test_near_hits_read_signals_and_party_from_their_own_wording(self) -> None:
+        canonical = (
+            f"{_CONFIDENTIALITY} Vendor may disclose such information at its sole "
+            "discretion to affiliates."
+        )
+        registry = BoilerplateRegistry()
+        analyze_clauses(
+            "a",
+            [_clause("C-001", "Confidentiality", canonical)],
+            make_settings(),
+            registry=registry,
+        )
+        variants = [
+            _clause("C-002", "Confidentiality", canonical.upper()),
+            _clause("C-003", "Confidentiality", canonical.replace("Each party", "Either party")),
+            _clause(
+                "C-004",
+                "Confidentiality",
+                "  " + canonical.replace("sole discretion", "reasonable discretion"),
+            ),
+        ]
+        reused, _ = analyze_clauses("b", variants, make_settings(), registry=registry)
+        fresh, _ = analyze_clauses("b", variants, make_settings())
+
+        self.assertEqual(registry.stats().hits, 3)
+        self.assertEqual(reused, fresh)
+        self.assertEqual(
+            [analysis.benefits_party.value for analysis in reused], ["MUTUAL", "VENDOR", "MUTUAL"]
+        )
+        signal = reused[1].signals[0]
+        self.assertEqual(reused[1].text[signal.start : signal.end], signal.evidence)
+        self.assertEqual(reused[2].signals, [])
+
+
+class ClauseProgressTests(unittest.TestCase):
+    def test_reports_each_clause_as_it_completes(self) -> None:
+        clauses = [
+            _clause("C-001", "Payment", "Invoices are due within 30 days."),
+            _clause("C-002", "Termination", "Company may terminate without notice."),
+        ]
+        previous, _ = analyze_clauses("draft", clauses[:1], make_settings())
+        events: list[ClauseProgress] = []
+        analyses, missing = analyze_clauses(
+            "draft",
+            clauses,
+            make_settings(),
+            previous_analyses=previous,
+            on_clause=events.append,
+        )
+
+        self.assertEqual([event.analysis for event in events], analyses)
+        self.assertEqual([(event.completed, event.total) for event in events], [(1, 2), (2, 2)])
+        self.assertEqual([event.source for event in events], ["previous", "heuristic"])
+        self.assertEqual(events[0].missing_protections, tuple(missing))
+
+    @unittest.skipUnless(_SAMPLE_PDF.exists(), "sample contract PDF not available")
+    def test_progressive_result_matches_batch_result(self) -> None:
+        events: list[ClauseProgress] = []
+        progressive = analyze_contract_file(_SAMPLE_PDF, make_settings(), on_clause=events.append)
+        self.assertEqual(progressive, analyze_contract_file(_SAMPLE_PDF, make_settings()))
+        self.assertEqual(len(events), len(progressive.clauses))
+
+
+_FILLER_SENTENCE = "The vendor shall provide the services described in each statement of work. "
+
+
+class WindowedAnalysisTests(unittest.TestCase):
+    def _oversized(self) -> Clause:
+        text = (
+            _FILLER_SENTENCE * 40
+            + "Client may terminate at its sole discretion without notice. "
+            + _FILLER_SENTENCE * 80
+            + "The contractor accepts unlimited liability for all damages. "
+            + _FILLER_SENTENCE * 40
+        )
+        return _clause("C-001", "Full Agreement", text)
+
+    def test_windowed_heuristics_match_a_whole_clause_pass(self) -> None:
+        clause = self._oversized()
+        windowed_settings = make_settings(clause_window_chars=2000)
+        whole_settings = make_settings(clause_window_chars=len(clause.text))
+        (windowed,), _ = analyze_clauses("draft", [clause], windowed_settings)
+        (whole,), _ = analyze_clauses("draft", [clause], whole_settings)
+
+        self.assertIn("overlapping windows", windowed.explanation)
+        self.assertEqual(
+            windowed.model_copy(update={"explanation": whole.explanation}), whole
+        )
+        for signal in windowed.signals:
+            self.assertEqual(clause.text[signal.start : signal.end], signal.evidence)
+
+    def test_each_window_is_its_own_bounded_llm_prompt(self) -> None:
+        clause = self._oversized()
+
+        def classify(window: Clause, heuristic_snapshot: dict[str, object]) -> dict[str, Any]:
+            risky = "unlimited liability" in window.text
+            signals = (
+                [
+                    {
+                        "type": "LIABILITY_EXPANSION",
+                        "label": "uncapped damages",
+                        "severity": "HIGH",
+                        "evidence": "unlimited liability for all damages",
+                    }
+                ]
+                if risky
+                else []
+            )
+            return {
+                "category": "LIABILITY" if risky else "NEUTRAL",
+                "risk_score": 90 if risky else 20,
+                "risk_level": "CRITICAL" if risky else "LOW",
+                "explanation": "uncapped" if risky else "routine",
+                "signals": signals,
+            }
+
+        with patch("realitycheck_cli.analysis.classifier.LLMClient") as mock_client:
+            mock_client.return_value.classify_clause.side_effect = classify
+            (analysis,), _ = analyze_clauses(
+                "draft",
+                [clause],
+                make_settings(clause_window_chars=2000),
+                use_llm=True,
+            )
+
+        calls = mock_client.return_value.classify_clause.call_args_list
+        self.assertGreater(len(calls), 1)
+        self.assertTrue(all(len(call.args[0].text) <= 2000 for call in calls))
+        self.assertEqual(analysis.risk_score, 90)
+        self.assertTrue(analysis.explanation.startswith("Part "))
+        (uncapped,) = [signal for signal in analysis.signals if signal.label == "uncapped damages"]
+        self.assertEqual(clause.text[uncapped.start : uncapped.end], uncapped.evidence)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from pathlib import Path
 import unittest
 
+from realitycheck_cli.analysis.heuristics import detect_signals
 from realitycheck_cli.analysis.schemas import (
     BenefitsParty,
     ClauseAnalysis,
     ClauseCategory,
     ContractAnalysisResult,
     ContractRiskSummary,
+    DeltaType,
     RiskLevel,
 )
+from realitycheck_cli.comparison.benchmark import run_benchmark
+from realitycheck_cli.comparison.chain import build_revision_chain
 from realitycheck_cli.comparison.delta_engine import compare_contract_results
+from realitycheck_cli.comparison.matcher import MatchScorer, build_match_index, match_clauses
+from realitycheck_cli.comparison.redline import build_redline
+from realitycheck_cli.engine import unique_contract_ids
+from realitycheck_cli.pipeline import build_flag_matrix
 
 
 def _analysis(
@@ -117,6 +126,219 @@ class CompareTests(unittest.TestCase):
         self.assertIn("EXPANDED_LIABILITY", flag_types)
         self.assertIn("EXTENDED_NON_COMPETE", flag_types)
 
+    def test_modified_clauses_carry_token_redline_marked_by_triggers(self) -> None:
+        baseline_text = "Vendor may terminate for a 12 month cause with notice."
+        revised_text = "Vendor may terminate at its sole discretion for a 24 month cause."
+        baseline_clause = _analysis(
+            "C-001", "Non-Compete", baseline_text, ClauseCategory.NON_COMPETE, 50
+        )
+        revised_clause = _analysis(
+            "C-001", "Non-Compete", revised_text, ClauseCategory.NON_COMPETE, 80
+        )
+        revised_clause.signals = detect_signals(revised_text)
+        comparison = compare_contract_results(
+            baseline=_result("baseline", [baseline_clause], 50),
+            revised=_result("revised", [revised_clause], 80),
+        )
+
+        spans = [
+            (span.op.value, span.text, span.triggers) for span in comparison.deltas[0].redline
+        ]
+        self.assertEqual(
+            spans,
+            [
+                (
+                    "INSERT",
+                    "at its sole discretion",
+                    ["SIGNAL_ADDED:sole discretion", "NEW_RISK"],
+                ),
+                ("DELETE", "12", ["EXTENDED_NON_COMPETE"]),
+                ("INSERT", "24", ["EXTENDED_NON_COMPETE"]),
+                ("DELETE", "with notice", []),
+            ],
+        )
+        for span in comparison.deltas[0].redline:
+            source = baseline_text if span.op.value == "DELETE" else revised_text
+            self.assertEqual(source[span.start : span.end], span.text)
+
+    def test_redline_scales_to_long_clauses(self) -> None:
+        words = [f"term{idx}" for idx in range(20000)]
+        baseline_text = " ".join(words)
+        revised_text = " ".join(words[:9000] + ["unlimited", "liability"] + words[9001:])
+        spans = build_redline(baseline_text, revised_text)
+        self.assertEqual(
+            [(span.op.value, span.text) for span in spans],
+            [("DELETE", "term9000"), ("INSERT", "unlimited liability")],
+        )
+        self.assertEqual(len(build_redline("a b c d", "w x y z", max_cost=3)), 2)
+
+    def test_shared_baseline_index_matches_per_pair_results(self) -> None:
+        def clauses(*rows: tuple[str, str, ClauseCategory, int]) -> list[ClauseAnalysis]:
+            return [
+                _analysis(f"C-{idx:03d}", title, text, category, risk)
+                for idx, (title, text, category, risk) in enumerate(rows, start=1)
+            ]
+
+        baseline_clauses = clauses(
+            ("Payment", "Invoices are due in 30 days.", ClauseCategory.FINANCIAL_RISK, 58),
+            ("Liability", "Liability is capped at fees paid.", ClauseCategory.LIABILITY, 60),
+            ("Notices", "Notices must be in writing.", ClauseCategory.NEUTRAL, 35),
+        )
+        revisions = [
+            clauses(
+                ("Payment Terms", "Invoices are due in 60 days.", ClauseCategory.FINANCIAL_RISK, 58),
+                ("Liability", "Liability is capped at fees paid.", ClauseCategory.LIABILITY, 60),
+            ),
+            clauses(
+                (
+                    "Liability",
+                    "The contractor accepts unlimited liability for all damages.",
+                    ClauseCategory.LIABILITY,
+                    92,
+                ),
+                ("Audit", "Client may audit records at any time.", ClauseCategory.PRIVACY, 75),
+            ),
+        ]
+        index = build_match_index(baseline_clauses)
+        baseline = _result("baseline", baseline_clauses, overall_risk=45)
+        comparisons = []
+        for number, revised_clauses in enumerate(revisions, start=1):
+            expected = match_clauses(baseline_clauses, revised_clauses)
+            indexed = match_clauses(baseline_clauses, revised_clauses, index=index)
+            self.assertEqual(indexed, expected)
+            comparisons.append(
+                compare_contract_results(
+                    baseline=baseline,
+                    revised=_result(f"rev{number}", revised_clauses, overall_risk=60),
+                    baseline_index=index,
+                )
+            )
+
+        matrix = build_flag_matrix(comparisons)
+        self.assertEqual(matrix["rev1"], {})
+        self.assertEqual(matrix["rev2"], {"NEW_RISK": 2, "EXPANDED_LIABILITY": 1})
+
+    def test_contract_ids_tell_apart_files_that_share_a_name(self) -> None:
+        paths = [
+            Path("deals/acme/v1/contract.pdf"),
+            Path("deals/acme/v2/contract.pdf"),
+            Path("deals/globex/v1/contract.pdf"),
+            Path("deals/acme/v1/../v1/contract.pdf"),
+            Path("deals/acme/v1/contract.PDF"),
+            Path("deals/acme/v1/addendum.pdf"),
+        ]
+        self.assertEqual(
+            unique_contract_ids(paths),
+            [
+                "acme/v1/contract.pdf",
+                "acme/v2/contract",
+                "globex/v1/contract",
+                "acme/v1/contract.pdf",
+                "acme/v1/contract.PDF",
+                "addendum",
+            ],
+        )
+        self.assertEqual(unique_contract_ids(paths[1:3]), ["v2/contract", "v1/contract"])
+        self.assertEqual(unique_contract_ids(paths[:2]), ["v1/contract", "v2/contract"])
+
+    def test_revision_chain_carries_clause_identity_across_versions(self) -> None:
+        non_compete = "Contractor agrees to a {months} month non-compete term."
+        versions = [
+            _result(
+                "v1",
+                [
+                    _analysis("C-001", "Non-Compete", non_compete.format(months=12), ClauseCategory.NON_COMPETE, 55),
+                    _analysis("C-002", "Notices", "Notices must be in writing.", ClauseCategory.NEUTRAL, 35),
+                ],
+                overall_risk=40,
+            ),
+            _result(
+                "v2",
+                [
+                    _analysis("C-001", "Notices", "Notices must be in writing.", ClauseCategory.NEUTRAL, 35),
+                    _analysis("C-002", "Non-Compete", non_compete.format(months=24), ClauseCategory.NON_COMPETE, 72),
+                ],
+                overall_risk=55,
+            ),
+            _result(
+                "v3",
+                [
+                    _analysis("C-001", "Non-Compete", non_compete.format(months=36), ClauseCategory.NON_COMPETE, 80),
+                    _analysis("C-002", "Audit", "Client may audit records at any time.", ClauseCategory.PRIVACY, 75),
+                ],
+                overall_risk=70,
+            ),
+        ]
+
+        chain = build_revision_chain(versions)
+        self.assertEqual(chain.contract_ids, ["v1", "v2", "v3"])
+        self.assertEqual(len(chain.comparisons), 2)
+        by_title = {lineage.points[0].title: lineage for lineage in chain.lineages}
+        self.assertEqual(set(by_title), {"Non-Compete", "Notices", "Audit"})
+
+        non_compete_lineage = by_title["Non-Compete"]
+        self.assertEqual(non_compete_lineage.risk_trajectory, [55, 72, 80])
+        self.assertEqual(
+            [point.clause_id for point in non_compete_lineage.points],
+            ["C-001", "C-002", "C-001"],
+        )
+        self.assertEqual(
+            [flag.type for flag in non_compete_lineage.flags],
+            ["EXTENDED_NON_COMPETE", "EXTENDED_NON_COMPETE"],
+        )
+        notices = by_title["Notices"]
+        self.assertEqual(notices.risk_trajectory, [35, 35, None])
+        self.assertEqual(notices.points[-1].delta_type, DeltaType.REMOVED)
+        self.assertEqual(by_title["Audit"].risk_trajectory, [None, None, 75])
+
+        with self.assertRaises(ValueError):
+            build_revision_chain(versions[:1])
+
+    def test_tfidf_scorer_compares_full_clause_text(self) -> None:
+        preamble = "Vendor shall provide the services described in each statement of work. " * 20
+        baseline_clauses = [
+            _analysis("C-001", "Services", preamble + "Fees are fixed.", ClauseCategory.NEUTRAL, 30),
+            _analysis(
+                "C-002",
+                "Services",
+                preamble + "Acceptance testing runs for thirty days after delivery.",
+                ClauseCategory.NEUTRAL,
+                30,
+            ),
+        ]
+        revised_clauses = [
+            _analysis(
+                "C-001",
+                "Services",
+                preamble + "Acceptance testing runs for ten days after delivery.",
+                ClauseCategory.NEUTRAL,
+                30,
+            )
+        ]
+
+        index = build_match_index(baseline_clauses, scorer=MatchScorer.TFIDF)
+        matches = match_clauses(baseline_clauses, revised_clauses, index=index)
+        self.assertEqual(matches[0].baseline.clause_id, "C-002")
+        self.assertGreater(matches[0].similarity, 0.9)
+        self.assertEqual(matches[1].baseline.clause_id, "C-001")
+        self.assertIsNone(matches[1].revised)
+
+        # The sequence scorer only sees the first 1200 characters, which are
+        # identical, so it cannot tell the two candidates apart.
+        prefix_scores = {
+            match.similarity
+            for match in (
+                match_clauses([clause], revised_clauses)[0] for clause in baseline_clauses
+            )
+        }
+        self.assertEqual(len(prefix_scores), 1)
+
+    def test_matcher_benchmark_reports_both_scorers(self) -> None:
+        rows = run_benchmark((60,))
+        self.assertEqual([row.scorer for row in rows], list(MatchScorer))
+        for row in rows:
+            self.assertGreater(row.accuracy, 0.85)
+
 
 if __name__ == "__main__":
     unittest.main()
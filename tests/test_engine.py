@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from realitycheck_cli.analysis.llm_client import LLMClient
+from realitycheck_cli.analysis.llm_transport import LLMReply, LLMTransport
+from realitycheck_cli.engine import Analyzer, shared_analyzer
+from realitycheck_cli.ingest.pdf_parser import PageTextCache
+from realitycheck_cli.pipeline import (
+    analyze_contract_async,
+    analyze_contract_file,
+    compare_contract_files,
+    compare_contracts_async,
+    compare_many_contract_files,
+    compare_revision_chain,
+    triage_contract_files,
+)
+
+from tests import make_settings
+
+_ROOT = Path(__file__).resolve().parents[1]
+_SAMPLE_PDF = _ROOT / "contract.pdf"
+_REVISED_PDF = _ROOT / "revised.pdf"
+_PAYLOAD = json.dumps({"explanation": "from llm"})
+
+
+class _CountingModel:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> LLMReply:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return LLMReply(_PAYLOAD, prompt_tokens=10, output_tokens=5)
+
+
+@unittest.skipUnless(_SAMPLE_PDF.exists(), "sample contract PDF not available")
+class AnalyzerTests(unittest.TestCase):
+    def test_llm_client_is_built_once_and_usage_stays_per_contract(self) -> None:
+        model = _CountingModel()
+        analyzer = Analyzer(make_settings(), use_llm=True, llm_transport=LLMTransport(model))
+        with patch("realitycheck_cli.engine.LLMClient", wraps=LLMClient) as factory, analyzer:
+            first = analyzer.analyze(_SAMPLE_PDF)
+            second = analyzer.analyze(_SAMPLE_PDF)
+        self.assertEqual(factory.call_count, 1)
+        assert first.llm_usage is not None and second.llm_usage is not None
+        self.assertEqual(first.llm_usage.requests, len(first.clauses))
+        self.assertEqual(second.llm_usage.requests, len(second.clauses))
+        self.assertEqual(model.calls, len(first.clauses) + len(second.clauses))
+
+    def test_previous_result_is_reused_only_under_the_same_llm_mode(self) -> None:
+        heuristic = Analyzer(make_settings())
+        plain = heuristic.analyze(_SAMPLE_PDF)
+        self.assertIs(plain.use_llm, False)
+        self.assertTrue(heuristic.can_reuse(plain))
+
+        model = _CountingModel()
+        with Analyzer(make_settings(), use_llm=True, llm_transport=LLMTransport(model)) as llm:
+            self.assertFalse(llm.can_reuse(plain))
+            enriched = llm.analyze(_SAMPLE_PDF, previous_result=plain)
+            self.assertEqual(model.calls, len(enriched.clauses))
+            llm.analyze(_SAMPLE_PDF, previous_result=enriched)
+            self.assertEqual(model.calls, len(enriched.clauses))
+        self.assertEqual(heuristic.analyze(_SAMPLE_PDF, previous_result=enriched), plain)
+
+    def test_every_reason_a_previous_result_is_discarded_is_reported(self) -> None:
+        analyzer = Analyzer(make_settings())
+        plain = analyzer.analyze(_SAMPLE_PDF)
+        self.assertEqual(analyzer.reuse_mismatches(plain), [])
+        stale = plain.model_copy(
+            update={"rules_version": "old@1", "category_model_version": "m1", "use_llm": True}
+        )
+        self.assertEqual(
+            analyzer.reuse_mismatches(stale),
+            [
+                f"rules old@1, not {analyzer.rules.version}",
+                "category model m1, not none",
+                "LLM enrichment on, not off",
+            ],
+        )
+        self.assertFalse(analyzer.can_reuse(stale))
+
+    def test_in_memory_sources_give_the_same_analysis(self) -> None:
+        analyzer = Analyzer(make_settings(), page_cache=PageTextCache())
+        data = _SAMPLE_PDF.read_bytes()
+        from_path = analyzer.analyze(_SAMPLE_PDF)
+        self.assertEqual(from_path.content_hash, hashlib.sha256(data).hexdigest())
+        for source in (data, io.BytesIO(data)):
+            from_memory = analyzer.analyze(source, contract_id="contract")
+            self.assertEqual(
+                from_memory.model_copy(update={"source_path": from_path.source_path}),
+                from_path,
+            )
+        self.assertGreater(analyzer.page_cache.hits, 0)
+        with self.assertRaises(ValueError):
+            analyzer.analyze(data)
+
+    def test_evicted_shared_analyzers_stay_usable_by_their_holders(self) -> None:
+        first = shared_analyzer(make_settings(high_risk_threshold=91))
+        with patch.object(first, "close", wraps=first.close) as close:
+            for threshold in range(92, 100):
+                shared_analyzer(make_settings(high_risk_threshold=threshold))
+            self.assertIsNot(shared_analyzer(make_settings(high_risk_threshold=91)), first)
+            self.assertEqual(first.analyze(_SAMPLE_PDF).contract_id, "contract")
+        close.assert_not_called()
+
+    def test_spilled_pages_give_the_same_analysis(self) -> None:
+        spilling = make_settings(spill_pages=True, memory_budget_mb=1)
+        self.assertEqual(
+            Analyzer(spilling).analyze(_SAMPLE_PDF), Analyzer(make_settings()).analyze(_SAMPLE_PDF)
+        )
+
+    @unittest.skipUnless(_REVISED_PDF.exists(), "revised contract PDF not available")
+    def test_threads_share_one_analyzer(self) -> None:
+        analyzer = Analyzer(make_settings(), page_cache=PageTextCache())
+        sources = [_SAMPLE_PDF, _REVISED_PDF] * 3
+        expected = [analyze_contract_file(source, make_settings()) for source in sources]
+        self.assertEqual(analyzer.analyze_many(sources, max_workers=4), expected)
+        self.assertIs(shared_analyzer(make_settings()), shared_analyzer(make_settings()))
+
+
+@unittest.skipUnless(
+    _SAMPLE_PDF.exists() and _REVISED_PDF.exists(), "sample contract PDFs not available"
+)
+class AsyncAnalyzerTests(unittest.TestCase):
+    def test_async_results_match_the_blocking_pipeline(self) -> None:
+        async def run() -> tuple[object, object]:
+            return await asyncio.gather(
+                analyze_contract_async(_SAMPLE_PDF, make_settings()),
+                compare_contracts_async(_SAMPLE_PDF, _REVISED_PDF, make_settings()),
+            )
+
+        analysis, comparison = asyncio.run(run())
+        self.assertEqual(analysis, analyze_contract_file(_SAMPLE_PDF, make_settings()))
+        self.assertEqual(
+            comparison, compare_contract_files(_SAMPLE_PDF, _REVISED_PDF, make_settings())
+        )
+
+    def test_llm_calls_overlap_without_blocking_the_loop(self) -> None:
+        model = _CountingModel(delay=0.02)
+        analyzer = Analyzer(make_settings(), use_llm=True, llm_transport=LLMTransport(model))
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        async def run() -> list[object]:
+            beat = asyncio.create_task(ticker())
+            try:
+                return await asyncio.gather(
+                    analyzer.analyze_async(_SAMPLE_PDF), analyzer.analyze_async(_REVISED_PDF)
+                )
+            finally:
+                beat.cancel()
+
+        with analyzer:
+            first, second = asyncio.run(run())
+        self.assertGreater(model.peak, 1)
+        self.assertGreater(ticks, 5)
+        assert first.llm_usage is not None and second.llm_usage is not None
+        self.assertEqual(first.llm_usage.requests, len(first.clauses))
+        self.assertEqual(second.llm_usage.requests, len(second.clauses))
+        self.assertTrue(all(clause.explanation == "from llm" for clause in first.clauses))
+
+    def test_llm_calls_run_on_their_own_pool(self) -> None:
+        threads: set[str] = set()
+
+        def model(prompt: str) -> LLMReply:
+            threads.add(threading.current_thread().name)
+            return LLMReply(_PAYLOAD, prompt_tokens=10, output_tokens=5)
+
+        analyzer = Analyzer(make_settings(), use_llm=True, llm_transport=LLMTransport(model))
+        with analyzer, ThreadPoolExecutor(1, thread_name_prefix="cpu") as executor:
+            result = asyncio.run(analyzer.analyze_async(_SAMPLE_PDF, executor=executor))
+        self.assertTrue(all(clause.explanation == "from llm" for clause in result.clauses))
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("llm") for name in threads))
+
+    def test_cancellation_stops_pending_llm_calls(self) -> None:
+        model = _CountingModel(delay=0.05)
+        analyzer = Analyzer(make_settings(), use_llm=True, llm_transport=LLMTransport(model))
+
+        async def run() -> None:
+            task = asyncio.create_task(analyzer.analyze_async(_SAMPLE_PDF, llm_concurrency=1))
+            while model.calls == 0:
+                await asyncio.sleep(0.005)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with analyzer:
+            asyncio.run(run())
+        calls = model.calls
+        time.sleep(0.2)
+        self.assertEqual(model.calls, calls)
+        self.assertLess(calls, 3)
+
+
+@unittest.skipUnless(
+    _SAMPLE_PDF.exists() and _REVISED_PDF.exists(), "sample contract PDFs not available"
+)
+class SameNameRevisionTests(unittest.TestCase):
+    def test_revisions_saved_under_one_name_keep_distinct_ids(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            versions = []
+            for folder, source in (("v1", _SAMPLE_PDF), ("v2", _REVISED_PDF), ("v3", _SAMPLE_PDF)):
+                path = Path(tmp) / folder / "contract.pdf"
+                path.parent.mkdir()
+                shutil.copyfile(source, path)
+                versions.append(path)
+            ids = ["v1/contract", "v2/contract", "v3/contract"]
+
+            baseline, revised, multi = compare_many_contract_files(
+                versions[0], versions[1:], make_settings(), max_workers=1
+            )
+            _, _, pair = compare_contract_files(versions[0], versions[1], make_settings())
+            _, chain = compare_revision_chain(versions, make_settings(), max_workers=1)
+            triaged, _, _ = triage_contract_files(
+                versions, make_settings(), max_workers=1, deep=False
+            )
+
+        self.assertEqual([baseline.contract_id, *(r.contract_id for r in revised)], ids)
+        self.assertEqual(sorted(multi.flag_matrix), ids[1:])
+        self.assertEqual(
+            [comparison.revised_contract_id for comparison in multi.comparisons], ids[1:]
+        )
+        self.assertEqual((pair.baseline_contract_id, pair.revised_contract_id), tuple(ids[:2]))
+        self.assertEqual(chain.contract_ids, ids)
+        self.assertEqual(sorted(result.contract_id for result in triaged), ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
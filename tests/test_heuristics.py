@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import unittest
 
-from realitycheck_cli.analysis.heuristics import detect_missing_protections, detect_signals
-from realitycheck_cli.analysis.schemas import Clause, SignalType
+from realitycheck_cli.analysis.heuristics import (
+    detect_benefits_party,
+    detect_missing_protections,
+    detect_signals,
+    scan_markers,
+)
+from realitycheck_cli.analysis.phrase_matcher import PhraseMatcher
+from realitycheck_cli.analysis.schemas import BenefitsParty, Clause, SignalType
 
 
 class HeuristicsTests(unittest.TestCase):
@@ -66,6 +72,48 @@ class HeuristicsTests(unittest.TestCase):
         missing = detect_missing_protections(clauses)
         self.assertNotIn("termination_notice", missing)
 
+    def test_phrase_matcher_reports_overlapping_hits_with_original_offsets(self) -> None:
+        matcher = PhraseMatcher(
+            word_phrases=("unlimited liability", "liability shall not be limited", "he"),
+            substring_phrases=("mutual",),
+        )
+        text = "The  UNLIMITED\nliability shall not   be limited; mutually agreed, then he left."
+        scan = matcher.scan(text)
+
+        self.assertEqual(
+            [(hit.phrase, text[hit.start : hit.end]) for hit in scan.hits],
+            [
+                ("unlimited liability", "UNLIMITED\nliability"),
+                ("liability shall not be limited", "liability shall not   be limited"),
+                ("mutual", "mutual"),
+                ("he", "he"),
+            ],
+        )
+        self.assertEqual(scan.count("he"), 1)
+        self.assertIs(matcher.scan(text), scan)
+
+    def test_phrase_scan_cache_is_bounded_by_text_size(self) -> None:
+        matcher = PhraseMatcher(word_phrases=("sole discretion",), cache_chars=100)
+        short = "At its sole discretion."
+        kept = matcher.scan(short)
+        huge = "x" * 101
+        self.assertIsNot(matcher.scan(huge), matcher.scan(huge))
+        self.assertIs(matcher.scan(short), kept)
+        for idx in range(10):
+            matcher.scan(f"{idx:02d}" + "y" * 20)
+        self.assertIsNot(matcher.scan(short), kept)
+
+    def test_signals_and_benefits_read_from_one_scan(self) -> None:
+        text = "Contractor   may suspend work unilaterally and accepts unlimited liability."
+        signals = detect_signals(text)
+        self.assertEqual(
+            [signal.label for signal in signals],
+            ["unilateral rights", "unlimited liability"],
+        )
+        self.assertIn("unilaterally", signals[0].evidence)
+        self.assertEqual(detect_benefits_party(text), BenefitsParty.VENDOR)
+        self.assertTrue(scan_markers(text).has("contractor may"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from google.api_core import exceptions as google_exceptions
+
+from realitycheck_cli.analysis.classifier import analyze_clauses
+from realitycheck_cli.analysis.llm_client import LLMClient, encode_clause_prompt
+from realitycheck_cli.analysis.llm_transport import (
+    CircuitBreaker,
+    LatencyTracker,
+    LLMReply,
+    LLMTransport,
+    LLMUnavailableError,
+    RetryPolicy,
+)
+from realitycheck_cli.analysis.schemas import Clause, LLMUsage
+
+from tests import make_settings
+
+_PAYLOAD = json.dumps({"explanation": "from llm"})
+
+
+class _FakeModel:
+    def __init__(self, script: list[object]) -> None:
+        # Each entry is an exception to raise, a delay in seconds, or None for
+        # an immediate answer; calls past the end of the script answer at once.
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> LLMReply:
+        with self._lock:
+            step = self.script[self.calls] if self.calls < len(self.script) else None
+            self.calls += 1
+        if isinstance(step, BaseException):
+            raise step
+        if isinstance(step, float):
+            time.sleep(step)
+        return LLMReply(text=_PAYLOAD)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _transport(model: _FakeModel, **kwargs: object) -> tuple[LLMTransport, list[float]]:
+    sleeps: list[float] = []
+    kwargs.setdefault("retry", RetryPolicy(max_retries=2, jitter=0.0))
+    transport = LLMTransport(model, sleep=sleeps.append, **kwargs)
+    return transport, sleeps
+
+
+class LLMTransportTests(unittest.TestCase):
+    def test_retries_transient_failures_with_exponential_backoff(self) -> None:
+        model = _FakeModel(
+            [google_exceptions.ServiceUnavailable("busy"), TimeoutError("slow")]
+        )
+        transport, sleeps = _transport(model)
+        self.assertEqual(transport.request("prompt").text, _PAYLOAD)
+        self.assertEqual(sleeps, [0.5, 1.0])
+        self.assertEqual((transport.stats.attempts, transport.stats.retries), (3, 2))
+
+    def test_non_retryable_errors_are_raised_immediately(self) -> None:
+        model = _FakeModel([google_exceptions.InvalidArgument("bad prompt")])
+        transport, sleeps = _transport(model)
+        with self.assertRaises(google_exceptions.InvalidArgument):
+            transport.request("prompt")
+        self.assertEqual((model.calls, sleeps), (1, []))
+
+    def test_circuit_breaker_opens_and_recovers_after_reset(self) -> None:
+        clock = _Clock()
+        model = _FakeModel([google_exceptions.ServiceUnavailable("down")] * 3)
+        transport, _ = _transport(
+            model, breaker=CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+        )
+        with self.assertRaises(LLMUnavailableError):
+            transport.request("prompt")
+        self.assertEqual(transport.breaker.state, "open")
+
+        with self.assertRaises(LLMUnavailableError):
+            transport.request("prompt")
+        self.assertEqual((model.calls, transport.stats.rejected), (3, 1))
+
+        clock.now = 31.0
+        self.assertEqual(transport.breaker.state, "half-open")
+        self.assertEqual(transport.request("prompt").text, _PAYLOAD)
+        self.assertEqual(transport.breaker.state, "closed")
+
+    def test_non_retryable_trial_does_not_wedge_the_breaker(self) -> None:
+        clock = _Clock()
+        model = _FakeModel(
+            [google_exceptions.ServiceUnavailable("down")] * 3 + [ValueError("empty")]
+        )
+        transport, _ = _transport(
+            model, breaker=CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+        )
+        with self.assertRaises(LLMUnavailableError):
+            transport.request("prompt")
+        clock.now = 31.0
+        with self.assertRaises(ValueError):
+            transport.request("prompt")
+        self.assertEqual(transport.request("prompt").text, _PAYLOAD)
+        self.assertEqual(transport.breaker.state, "closed")
+
+    def test_hedged_request_returns_the_faster_duplicate(self) -> None:
+        latency = LatencyTracker(min_samples=4)
+        for _ in range(4):
+            latency.record(0.02)
+        model = _FakeModel([2.0])
+        transport, _ = _transport(model, hedge=True, latency=latency)
+        self.addCleanup(transport.close)
+
+        started = time.perf_counter()
+        self.assertEqual(transport.request("prompt").text, _PAYLOAD)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual((transport.stats.hedges, transport.stats.hedge_wins), (1, 1))
+
+    def test_hedge_pool_is_created_once_across_threads(self) -> None:
+        latency = LatencyTracker(min_samples=4)
+        for _ in range(4):
+            latency.record(0.5)
+        transport, _ = _transport(_FakeModel([]), hedge=True, latency=latency)
+        self.addCleanup(transport.close)
+
+        def slow_pool(**kwargs: object) -> ThreadPoolExecutor:
+            # Widens the window between the check and the assignment.
+            time.sleep(0.05)
+            return ThreadPoolExecutor(**kwargs)
+
+        with patch(
+            "realitycheck_cli.analysis.llm_transport.ThreadPoolExecutor", side_effect=slow_pool
+        ) as pools:
+            threads = [
+                threading.Thread(target=transport.request, args=("prompt",)) for _ in range(16)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(pools.call_count, 1)
+        self.assertEqual(transport.stats.requests, 16)
+
+    def test_no_hedge_until_latency_is_known(self) -> None:
+        model = _FakeModel([])
+        transport, _ = _transport(model, hedge=True, latency=LatencyTracker(min_samples=4))
+        transport.request("prompt")
+        self.assertEqual((model.calls, transport.stats.hedges), (1, 0))
+
+
+def _clauses(count: int) -> list[Clause]:
+    return [
+        Clause(
+            contract_id="draft",
+            clause_id=f"C-00{idx}",
+            title=f"Clause {idx}",
+            page=1,
+            text=f"Company may terminate clause {idx} at its sole discretion.",
+        )
+        for idx in range(1, count + 1)
+    ]
+
+
+class LLMFallbackTests(unittest.TestCase):
+    def test_degraded_service_falls_back_to_heuristics(self) -> None:
+        settings = make_settings(gemini_api_key="fake-key")
+        model = _FakeModel([google_exceptions.ServiceUnavailable("down")] * 10)
+        transport, _ = _transport(model, breaker=CircuitBreaker(failure_threshold=3))
+        clauses = _clauses(3)
+        with patch(
+            "realitycheck_cli.analysis.classifier.LLMClient",
+            side_effect=lambda settings, **kwargs: LLMClient(
+                settings, transport=transport, **kwargs
+            ),
+        ):
+            analyses, _ = analyze_clauses("draft", clauses, settings, use_llm=True)
+
+        self.assertEqual(len(analyses), 3)
+        self.assertTrue(all("LLM unavailable" in analysis.explanation for analysis in analyses))
+        self.assertEqual({analysis.source for analysis in analyses}, {"fallback"})
+        self.assertTrue(all(analysis.signals for analysis in analyses))
+        self.assertEqual(model.calls, 3)
+        self.assertEqual(transport.stats.rejected, 2)
+
+    def test_malformed_replies_are_retried_once_then_fall_back(self) -> None:
+        # Clause 2 answers badly twice; clause 3 recovers on its retry.
+        replies = {
+            "clause 2": ["", "not json"],
+            "clause 3": ['["not", "an object"]', _PAYLOAD],
+        }
+        calls: list[str] = []
+        lock = threading.Lock()
+
+        def model(prompt: str) -> LLMReply:
+            with lock:
+                key = next((key for key in replies if key in prompt), "")
+                calls.append(key)
+                queue = replies.get(key)
+                return LLMReply(queue.pop(0) if queue else _PAYLOAD)
+
+        transport = LLMTransport(model)
+        with patch(
+            "realitycheck_cli.analysis.classifier.LLMClient",
+            side_effect=lambda settings, **kwargs: LLMClient(
+                settings, transport=transport, **kwargs
+            ),
+        ):
+            analyses, _ = analyze_clauses(
+                "draft", _clauses(3), make_settings(gemini_api_key="fake-key"), use_llm=True
+            )
+
+        self.assertEqual([analysis.source for analysis in analyses], ["llm", "fallback", "llm"])
+        self.assertEqual(analyses[0].explanation, "from llm")
+        self.assertIn("not valid JSON", analyses[1].explanation)
+        self.assertTrue(analyses[1].signals)
+        self.assertEqual(sorted(calls), ["", "clause 2", "clause 2", "clause 3", "clause 3"])
+
+
+class LLMUsageTests(unittest.TestCase):
+    def test_prompt_is_compact_and_omits_identifiers(self) -> None:
+        clause = _clauses(1)[0]
+        snapshot = {
+            "category": "TERMINATION",
+            "risk_score": 69,
+            "explanation": "Pattern-based legal risk classification.",
+            "signals": [
+                {
+                    "type": "VAGUE_LANGUAGE",
+                    "label": "sole discretion",
+                    "severity": "HIGH",
+                    "evidence": clause.text,
+                }
+            ],
+        }
+        prompt = encode_clause_prompt(clause, snapshot)
+        self.assertIn('["VAGUE_LANGUAGE","sole discretion","HIGH"]', prompt)
+        self.assertEqual(prompt.count(clause.text), 1)
+        for redundant in ("C-001", "draft", "Pattern-based", "\n  "):
+            self.assertNotIn(redundant, prompt)
+
+    def test_usage_is_recorded_and_budget_stops_enrichment(self) -> None:
+        replies = iter(
+            [LLMReply(_PAYLOAD, prompt_tokens=90, output_tokens=10), LLMReply(_PAYLOAD)]
+        )
+        transport = LLMTransport(lambda prompt: next(replies))
+        usage = LLMUsage()
+        settings = make_settings(
+            gemini_api_key="fake-key", llm_input_cost_per_mtok=1.0, llm_output_cost_per_mtok=4.0
+        )
+        with patch(
+            "realitycheck_cli.analysis.classifier.LLMClient",
+            side_effect=lambda settings, **kwargs: LLMClient(
+                settings, transport=transport, **kwargs
+            ),
+        ):
+            analyses, _ = analyze_clauses(
+                "draft",
+                _clauses(3),
+                settings,
+                use_llm=True,
+                usage=usage,
+                llm_budget_tokens=101,
+            )
+
+        self.assertEqual(
+            [analysis.explanation for analysis in analyses[:2]], ["from llm"] * 2
+        )
+        self.assertIn("LLM enrichment skipped", analyses[2].explanation)
+        self.assertEqual((usage.requests, usage.estimated_requests), (2, 1))
+        self.assertEqual(usage.output_tokens, 10 + len(_PAYLOAD) // 4 + 1)
+        self.assertGreater(usage.prompt_tokens, 90)
+        self.assertEqual(usage.budget_skipped, 1)
+        self.assertIsNotNone(usage.estimated_cost_usd)
+
+        total = LLMUsage.combine([usage, None, LLMUsage(requests=1, prompt_tokens=5)])
+        self.assertEqual((total.requests, total.prompt_tokens), (3, usage.prompt_tokens + 5))
+        self.assertIsNone(LLMUsage.combine([None]))
+
+
+if __name__ == "__main__":
+    unittest.main()
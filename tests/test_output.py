@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from realitycheck_cli.analysis.schemas import (
+    BenefitsParty,
+    ClauseAnalysis,
+    ClauseCategory,
+    ContractAnalysisResult,
+    ContractRiskSummary,
+    RiskLevel,
+)
+from realitycheck_cli.output.json_writer import (
+    iter_analysis_records,
+    write_json_output,
+    write_ndjson_output,
+)
+
+
+def _result(clause_count: int) -> ContractAnalysisResult:
+    clauses = [
+        ClauseAnalysis(
+            contract_id="demo",
+            clause_id=f"C-{idx:03d}",
+            title="Payment",
+            page=1,
+            text="Invoices are due within 30 days.",
+            category=ClauseCategory.FINANCIAL_RISK,
+            category_confidence=0.57,
+            risk_level=RiskLevel.MEDIUM,
+            risk_score=58,
+            benefits_party=BenefitsParty.UNKNOWN,
+        )
+        for idx in range(1, clause_count + 1)
+    ]
+    return ContractAnalysisResult(
+        contract_id="demo",
+        source_path="demo.pdf",
+        clauses=clauses,
+        summary=ContractRiskSummary(
+            contract_id="demo",
+            overall_risk_score=40,
+            power_imbalance_score=50,
+            ambiguity_index=0,
+            protection_coverage_score=80,
+            leverage_index=55,
+            category_scores={"FINANCIAL_RISK": 58},
+            weighted_contributions={"FINANCIAL_RISK": 11.6},
+        ),
+        negotiation_email="Subject: Proposed revisions for demo",
+    )
+
+
+class JsonWriterTests(unittest.TestCase):
+    def test_streamed_json_matches_pydantic_serialization(self) -> None:
+        result = _result(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_json_output(
+                {"baseline": result, "empty": []}, Path(tmp) / "out" / "result.json"
+            )
+            text = path.read_text(encoding="utf-8")
+        payload = json.loads(text)
+        self.assertEqual(payload["baseline"], json.loads(result.model_dump_json()))
+        self.assertEqual(text, json.dumps(payload, indent=2) + "\n")
+
+    def test_ndjson_emits_one_record_per_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_ndjson_output(
+                iter_analysis_records(_result(2)), Path(tmp) / "result.ndjson"
+            )
+            records = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(
+            [record["record_type"] for record in records], ["contract", "clause", "clause"]
+        )
+        self.assertEqual(records[0]["summary"]["leverage_index"], 55)
+        self.assertEqual(records[2]["clause_id"], "C-002")
+
+    def test_failed_write_keeps_previous_artifact(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_json_output({"version": 1}, Path(tmp) / "result.json")
+            with patch(
+                "realitycheck_cli.output.json_writer.os.replace",
+                side_effect=OSError("disk full"),
+            ):
+                with self.assertRaises(OSError):
+                    write_json_output({"version": 2}, path)
+            self.assertEqual(json.loads(path.read_text())["version"], 1)
+            self.assertEqual(sorted(item.name for item in Path(tmp).iterdir()), ["result.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
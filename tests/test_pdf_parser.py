@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import mmap
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+from typing import Any
+import unittest
+from unittest.mock import patch
+
+import pdfplumber
+
+from realitycheck_cli.clauses.splitter import split_into_clauses
+from realitycheck_cli.ingest.pdf_parser import (
+    PageText,
+    SpilledPages,
+    page_content_key,
+    parse_pdf,
+    read_pdf,
+)
+from realitycheck_cli.ingest.structure import read_outline
+from realitycheck_cli.ingest.text_cleaner import clean_pages
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _minimal_pdf(
+    page_count: int,
+    lines_per_page: int = 12,
+    headings: dict[int, str] | None = None,
+    outline: bool = False,
+    font_extra: bytes = b"",
+    form_text: str | None = None,
+) -> bytes:
+    headings = headings or {}
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R%s >>" % (b" /Outlines 5 0 R" if outline else b""),
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica%s >>" % font_extra,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    ]
+    if outline:
+        objects.append(b"")
+    xobjects = b""
+    if form_text is not None:
+        form = f"BT /F1 10 Tf 50 20 Td ({form_text}) Tj ET".encode("latin-1")
+        objects.append(
+            b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Length %d >>\nstream\n%s\nendstream"
+            % (len(form), form)
+        )
+        xobjects = b" /XObject << /X1 %d 0 R >>" % len(objects)
+    kids: list[int] = []
+    for number in range(1, page_count + 1):
+        rows = [
+            f"BT /F1 10 Tf 50 {740 - line * 18} Td "
+            f"(Page {number} line {line}: the supplier shall indemnify the customer) Tj ET"
+            for line in range(lines_per_page)
+        ]
+        if number in headings:
+            rows.insert(0, f"BT /F2 10 Tf 50 770 Td ({headings[number]}) Tj ET")
+        if form_text is not None:
+            rows.append("/X1 Do")
+        stream = "\n".join(rows).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >>%s >> /Contents %d 0 R >>"
+            % (xobjects, len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        page_count,
+    )
+    if outline:
+        first_item = len(objects) + 1
+        items = sorted(headings.items())
+        for position, (number, title) in enumerate(items):
+            links = b""
+            if position > 0:
+                links += b" /Prev %d 0 R" % (first_item + position - 1)
+            if position < len(items) - 1:
+                links += b" /Next %d 0 R" % (first_item + position + 1)
+            objects.append(
+                b"<< /Title (%s) /Parent 5 0 R /Dest [%d 0 R /Fit]%s >>"
+                % (title.split(". ", 1)[-1].encode("latin-1"), kids[number - 1], links)
+            )
+        objects[4] = b"<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>" % (
+            first_item,
+            first_item + len(items) - 1,
+            len(items),
+        )
+
+    document = bytearray(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(document))
+        document += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(document)
+    document += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        document += b"%010d 00000 n \n" % offset
+    document += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return bytes(document)
+
+
+def _peak_rss_growth_kb(path: Path, **kwargs: object) -> int:
+    # Peak resident set size (VmHWM), measured in a fresh interpreter so
+    # neither earlier tests nor the allocator's retained arenas blur it.
+    # ru_maxrss would not do: Linux carries it over from the forking parent.
+    script = (
+        "import re\n"
+        "from pathlib import Path\n"
+        "from realitycheck_cli.ingest.pdf_parser import parse_pdf\n"
+        "def peak():\n"
+        "    status = Path('/proc/self/status').read_text()\n"
+        "    return int(re.search(r'VmHWM:\\s+(\\d+)', status).group(1))\n"
+        "before = peak()\n"
+        f"parse_pdf(Path({str(path)!r}), **{kwargs!r})\n"
+        "print(peak() - before)\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        cwd=_ROOT,
+        text=True,
+    )
+    return int(completed.stdout)
+
+
+class ParsePdfTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def _write(self, page_count: int, **kwargs: object) -> Path:
+        path = self.directory / f"pages_{page_count}_{len(kwargs)}.pdf"
+        path.write_bytes(_minimal_pdf(page_count, **kwargs))
+        return path
+
+    @unittest.skipUnless(Path("/proc/self/status").exists(), "needs Linux /proc")
+    def test_low_memory_peak_stays_flat_as_page_count_grows(self) -> None:
+        small, large = self._write(4, lines_per_page=40), self._write(16, lines_per_page=40)
+        low_small = _peak_rss_growth_kb(small, low_memory=True)
+        low_large = _peak_rss_growth_kb(large, low_memory=True)
+        default_large = _peak_rss_growth_kb(large)
+
+        # VmHWM is in KiB; allow a few MiB of allocator noise.
+        self.assertLess(low_large, low_small + 8 * 1024)
+        self.assertLess(low_large * 3, default_large)
+
+    def test_memory_budget_falls_back_with_identical_text(self) -> None:
+        path = self._write(4)
+        default = parse_pdf(path)
+        self.assertEqual(parse_pdf(path, memory_budget_mb=1), default)
+        self.assertEqual(parse_pdf(path, low_memory=True), default)
+        self.assertEqual(len(default), 4)
+        self.assertIn("Page 4 line 0", default[-1].text)
+
+    def test_spilled_pages_round_trip_through_cleaner(self) -> None:
+        path = self._write(3)
+        spilled = parse_pdf(path, low_memory=True, spill_to_disk=True)
+        self.assertIsInstance(spilled, SpilledPages)
+        self.assertEqual(list(spilled), parse_pdf(path))
+        self.assertEqual(spilled[1:], parse_pdf(path)[1:])
+        self.assertEqual(clean_pages(spilled), clean_pages(parse_pdf(path)))
+        spilled.close()
+
+    def test_spill_file_is_closed_when_extraction_fails(self) -> None:
+        path = self._write(3)
+        spill_files: list[Any] = []
+        open_temporary_file = tempfile.TemporaryFile
+
+        def temporary_file() -> Any:
+            spill_files.append(open_temporary_file())
+            return spill_files[-1]
+
+        with patch(
+            "realitycheck_cli.ingest.pdf_parser.tempfile.TemporaryFile", temporary_file
+        ), patch(
+            "realitycheck_cli.ingest.pdf_parser.detect_headings",
+            side_effect=RuntimeError("bad page"),
+        ):
+            with self.assertRaises(RuntimeError):
+                parse_pdf(path, spill_to_disk=True, detect_structure=True)
+        self.assertEqual(len(spill_files), 1)
+        self.assertTrue(spill_files[0].closed)
+
+    def test_font_headings_drive_clause_boundaries(self) -> None:
+        headings = {1: "1. Payment Terms", 2: "2. Limitation of Liability", 3: "3. Notices"}
+        path = self._write(3, lines_per_page=4, headings=headings)
+        self.assertTrue(all(not page.headings for page in parse_pdf(path)))
+        pages = clean_pages(parse_pdf(path, detect_structure=True))
+        self.assertEqual(pages[0].headings, ("1. Payment Terms",))
+
+        clauses = split_into_clauses("demo", pages)
+        self.assertEqual(
+            [clause.title for clause in clauses],
+            ["Payment Terms", "Limitation Of Liability", "Notices"],
+        )
+        self.assertIn("Page 2 line 3", clauses[1].text)
+
+    def test_outline_headings_take_precedence(self) -> None:
+        headings = {1: "1. Payment Terms", 3: "2. Notices"}
+        path = self._write(3, lines_per_page=4, headings=headings, outline=True)
+        with pdfplumber.open(path) as pdf:
+            self.assertEqual(read_outline(pdf), [(1, "Payment Terms"), (3, "Notices")])
+        pages = parse_pdf(path, detect_structure=True)
+        self.assertEqual(parse_pdf(path, low_memory=True, detect_structure=True), pages)
+        self.assertEqual(pages[2].headings, ("2. Notices",))
+        self.assertEqual(
+            [clause.title for clause in split_into_clauses("demo", pages)],
+            ["Payment Terms", "Notices"],
+        )
+
+    def test_page_key_covers_font_encodings_and_form_xobjects(self) -> None:
+        def first_page_key(data: bytes) -> str:
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                return page_content_key(pdf.pages[0])
+
+        base = first_page_key(_minimal_pdf(1))
+        self.assertEqual(first_page_key(_minimal_pdf(1)), base)
+        recoded = first_page_key(
+            _minimal_pdf(1, font_extra=b" /Encoding << /Differences [80 /Q] >>")
+        )
+        first_form = first_page_key(_minimal_pdf(1, form_text="Governed by Delaware law"))
+        second_form = first_page_key(_minimal_pdf(1, form_text="Governed by Ontario law"))
+        self.assertEqual(len({base, recoded, first_form, second_form}), 4)
+
+    def test_regex_splitter_is_used_without_structure(self) -> None:
+        pages = [
+            PageText(
+                page_number=1,
+                text="1. Payment\nInvoices are due monthly.\n2. Notices\nIn writing.",
+            )
+        ]
+        clauses = split_into_clauses("demo", pages)
+        self.assertEqual([clause.title for clause in clauses], ["Payment", "Notices"])
+
+    def test_in_memory_sources_parse_and_hash_like_the_file(self) -> None:
+        path = self._write(3)
+        data = path.read_bytes()
+        expected = read_pdf(path)
+        self.assertEqual(expected.content_hash, hashlib.sha256(data).hexdigest())
+
+        reads: list[int] = []
+
+        class _Upload(io.BytesIO):
+            def read(self, size: int | None = -1) -> bytes:
+                chunk = super().read(size)
+                reads.append(len(chunk))
+                return chunk
+
+        with path.open("rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            for source in (data, memoryview(data), _Upload(data), mapped):
+                parsed = read_pdf(source)
+                self.assertEqual(parsed.pages, expected.pages)
+                self.assertEqual(parsed.content_hash, expected.content_hash)
+        # The upload stream is drained once, front to back, and never re-read.
+        self.assertEqual(sum(reads), len(data))
+        with self.assertRaises(FileNotFoundError):
+            read_pdf(self.directory / "missing.pdf")
+
+
+if __name__ == "__main__":
+    unittest.main()
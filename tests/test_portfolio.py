@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from realitycheck_cli.analysis.schemas import (
+    BenefitsParty,
+    ClauseAnalysis,
+    ClauseCategory,
+    ClauseSignal,
+    ComparisonResult,
+    ContractAnalysisResult,
+    ContractRiskSummary,
+    MultiComparisonResult,
+    RevisionChainResult,
+    RiskLevel,
+    Severity,
+    SignalType,
+)
+from realitycheck_cli.output.json_writer import (
+    iter_analysis_records,
+    iter_comparison_records,
+    write_json_output,
+    write_ndjson_output,
+)
+from realitycheck_cli.portfolio.search import (
+    build_match_expression,
+    ensure_search_schema,
+    index_contract,
+    search_clauses,
+)
+from realitycheck_cli.portfolio.store import (
+    PortfolioQuery,
+    PortfolioStore,
+    load_portfolio_artifact,
+)
+
+
+def _result(
+    contract_id: str,
+    leverage: int,
+    missing: list[str],
+    category: ClauseCategory = ClauseCategory.LIABILITY,
+    text: str = "Contractor accepts unlimited liability for all damages.",
+) -> ContractAnalysisResult:
+    clause = ClauseAnalysis(
+        contract_id=contract_id,
+        clause_id="C-001",
+        title="Liability",
+        page=3,
+        text=text,
+        category=category,
+        category_confidence=0.8,
+        risk_level=RiskLevel.HIGH,
+        risk_score=76,
+        benefits_party=BenefitsParty.CLIENT,
+        signals=[
+            ClauseSignal(
+                type=SignalType.LIABILITY_EXPANSION,
+                label="unlimited liability",
+                severity=Severity.HIGH,
+                evidence="unlimited liability",
+            )
+        ],
+    )
+    summary = ContractRiskSummary(
+        contract_id=contract_id,
+        overall_risk_score=100 - leverage,
+        power_imbalance_score=50,
+        ambiguity_index=0,
+        protection_coverage_score=60,
+        leverage_index=leverage,
+        missing_protections=missing,
+    )
+    return ContractAnalysisResult(
+        contract_id=contract_id,
+        source_path=f"{contract_id}.pdf",
+        clauses=[clause],
+        summary=summary,
+        negotiation_email="",
+    )
+
+
+class PortfolioStoreTests(unittest.TestCase):
+    def test_filters_on_missing_protection_and_leverage(self) -> None:
+        with PortfolioStore(Path(":memory:")) as store:
+            store.ingest(
+                [
+                    _result("alpha", leverage=35, missing=["liability_cap"]),
+                    _result("beta", leverage=55, missing=["liability_cap"]),
+                    _result("gamma", leverage=30, missing=["payment_timeline"]),
+                ]
+            )
+            rows = store.query(
+                PortfolioQuery(missing_protections=("liability_cap",), max_leverage=39)
+            )
+            self.assertEqual([row.contract_id for row in rows], ["alpha"])
+            self.assertEqual(rows[0].missing_protections, ("liability_cap",))
+
+            by_signal = store.query(PortfolioQuery(signal_type="LIABILITY_EXPANSION"))
+            self.assertEqual(len(by_signal), 3)
+
+    def test_reingest_replaces_contract_rows(self) -> None:
+        with PortfolioStore(Path(":memory:")) as store:
+            store.ingest([_result("alpha", leverage=35, missing=["liability_cap"])])
+            store.ingest(
+                [_result("alpha", leverage=70, missing=[], category=ClauseCategory.PRIVACY)]
+            )
+            self.assertEqual(
+                store.query(PortfolioQuery(missing_protections=("liability_cap",))), []
+            )
+            self.assertEqual(
+                store.query(PortfolioQuery(category="LIABILITY")), []
+            )
+            rows = store.query(PortfolioQuery(category="PRIVACY"))
+            self.assertEqual(rows[0].leverage_index, 70)
+
+
+class ClauseSearchTests(unittest.TestCase):
+    def test_proximity_search_returns_ranked_hits(self) -> None:
+        with PortfolioStore(Path(":memory:")) as store:
+            store.ingest(
+                [
+                    _result(
+                        "alpha",
+                        leverage=35,
+                        missing=[],
+                        category=ClauseCategory.TERMINATION,
+                        text="Client may, in its sole discretion, terminate this agreement.",
+                    ),
+                    _result(
+                        "beta",
+                        leverage=55,
+                        missing=[],
+                        text="Fees are set at the sole discretion of the provider.",
+                    ),
+                ]
+            )
+            hits = store.search(
+                build_match_expression("sole discretion", near="termination", distance=5)
+            )
+            self.assertEqual(
+                [(hit.contract_id, hit.clause_id, hit.page) for hit in hits],
+                [("alpha", "C-001", 3)],
+            )
+
+            phrase_hits = store.search(build_match_expression("sole discretion"))
+            self.assertEqual({hit.contract_id for hit in phrase_hits}, {"alpha", "beta"})
+
+    def test_reindexing_unchanged_contract_is_skipped(self) -> None:
+        conn = sqlite3.connect(":memory:")
+        self.addCleanup(conn.close)
+        ensure_search_schema(conn)
+        result = _result("alpha", leverage=35, missing=[])
+        self.assertTrue(index_contract(conn, result))
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        self.assertFalse(index_contract(conn, result))
+        conn.set_trace_callback(None)
+        self.assertEqual([sql.split()[0] for sql in statements], ["SELECT"])
+        hits = search_clauses(conn, build_match_expression("unlimited liability"))
+        self.assertEqual(len(hits), 1)
+
+        revised = _result("alpha", leverage=35, missing=[], text="Liability is capped at fees.")
+        self.assertTrue(index_contract(conn, revised))
+        hits = search_clauses(conn, build_match_expression("capped"))
+        self.assertEqual([hit.snippet for hit in hits], ["Liability is [capped] at fees."])
+
+
+class ArtifactLoadingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def test_compare_many_artifact_loads_baseline_and_every_revision(self) -> None:
+        baseline, *revised = (
+            _result(contract_id, leverage=40, missing=[]) for contract_id in ("v1", "v2", "v3")
+        )
+        path = write_json_output(
+            {
+                "baseline": baseline,
+                "revised": revised,
+                "comparison": MultiComparisonResult(baseline_contract_id="v1"),
+            },
+            self.directory / "v1_vs_2_revisions.comparison.json",
+        )
+        self.assertEqual(load_portfolio_artifact(path), [baseline, *revised])
+
+    def test_compare_chain_artifact_loads_every_version(self) -> None:
+        versions = [_result(contract_id, leverage=40, missing=[]) for contract_id in ("v1", "v2")]
+        path = write_json_output(
+            {"versions": versions, "chain": RevisionChainResult(contract_ids=["v1", "v2"])},
+            self.directory / "v1_chain_2_versions.comparison.json",
+        )
+        self.assertEqual(load_portfolio_artifact(path), versions)
+
+    def test_triage_artifact_loads_its_full_analyses(self) -> None:
+        queued = _result("risky", leverage=20, missing=["liability_cap"])
+        path = write_json_output(
+            {"triage": [], "analyses": [queued], "failures": []},
+            self.directory / "triage_2_contracts.json",
+        )
+        self.assertEqual(load_portfolio_artifact(path), [queued])
+
+    def test_ndjson_artifact_loads_from_its_contract_and_clause_records(self) -> None:
+        baseline = _result("v1", leverage=40, missing=["liability_cap"])
+        revised = _result("v2", leverage=45, missing=[], category=ClauseCategory.TERMINATION)
+        comparison = ComparisonResult(
+            baseline_contract_id="v1",
+            revised_contract_id="v2",
+            baseline_overall_risk=60,
+            revised_overall_risk=55,
+            overall_risk_delta=-5,
+            baseline_leverage_index=40,
+            revised_leverage_index=45,
+            leverage_delta=5,
+        )
+        path = write_ndjson_output(
+            iter_comparison_records(baseline, revised, comparison),
+            self.directory / "v1_vs_v2.comparison.ndjson",
+        )
+        self.assertEqual(load_portfolio_artifact(path), [baseline, revised])
+
+        single = write_ndjson_output(
+            iter_analysis_records(baseline.model_copy(update={"clauses": []})),
+            self.directory / "empty.analysis.ndjson",
+        )
+        self.assertEqual(len(load_portfolio_artifact(single)), 1)
+
+    def test_unknown_artifact_shape_is_a_clear_error(self) -> None:
+        path = self.directory / "other.json"
+        path.write_text(json.dumps({"baseline": 1, "revised": [2]}), encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "is not an analysis or comparison artifact"):
+            load_portfolio_artifact(path)
+        path.write_text('{"record_type": "triage"}\n{"record_type": "failure"}\n', encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "holds no contract records"):
+            load_portfolio_artifact(path)
+        path.write_text("{}\nnot json\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "neither a JSON nor an NDJSON artifact"):
+            load_portfolio_artifact(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from realitycheck_cli.analysis import rules as rules_module
+from realitycheck_cli.analysis.classifier import analyze_clauses
+from realitycheck_cli.analysis.heuristics import (
+    detect_category,
+    detect_missing_protections,
+    detect_signals,
+)
+from realitycheck_cli.analysis.rules import DEFAULT_RULES, load_rule_pack
+from realitycheck_cli.analysis.schemas import Clause, ClauseCategory, SignalType
+from realitycheck_cli.config.settings import Settings
+
+_TOML_PACK = """
+name = "uk-employment"
+version = "2"
+
+[[categories]]
+category = "NON_COMPETE"
+patterns = ['\\brestrictive covenants?\\b']
+base_risk = 70
+
+[[signals]]
+type = "ONE_SIDED_RIGHT"
+label = "garden leave"
+severity = "MEDIUM"
+phrases = ["garden leave"]
+
+[[protections]]
+name = "notice_in_lieu"
+pattern = 'pay(ment)?\\s+in\\s+lieu\\s+of\\s+notice'
+"""
+
+
+def _clause(text: str) -> Clause:
+    return Clause(contract_id="draft", clause_id="C-001", title="Covenants", page=1, text=text)
+
+
+class RulePackTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def _write(self, name: str, content: str) -> Path:
+        path = self.directory / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_toml_pack_extends_builtin_rules(self) -> None:
+        rules = load_rule_pack(self._write("pack.toml", _TOML_PACK))
+        text = "The employee accepts restrictive covenants and garden leave at sole discretion."
+
+        self.assertTrue(rules.version.startswith("uk-employment@2+"))
+        self.assertEqual(
+            len(dict(rules.category_patterns)[ClauseCategory.NON_COMPETE]),
+            len(dict(DEFAULT_RULES.category_patterns)[ClauseCategory.NON_COMPETE]) + 1,
+        )
+        self.assertEqual(detect_category(text, rules)[0], ClauseCategory.NON_COMPETE)
+        self.assertEqual(detect_category(text)[0], ClauseCategory.NEUTRAL)
+        labels = [signal.label for signal in detect_signals(text, rules)]
+        self.assertEqual(labels, ["sole discretion", "garden leave"])
+        self.assertIn("notice_in_lieu", detect_missing_protections([_clause(text)], rules))
+        self.assertNotIn("notice_in_lieu", detect_missing_protections([_clause(text)]))
+
+        analyses, _ = analyze_clauses(
+            "draft",
+            [_clause(text)],
+            Settings(
+                gemini_api_key=None,
+                gemini_model="gemini-3-flash-preview",
+                high_risk_threshold=70,
+                llm_timeout_seconds=7,
+            ),
+            rules=rules,
+        )
+        self.assertEqual(analyses[0].risk_score, 70 + 14 + 8)
+
+    def test_compiled_pack_is_reused_in_memory_by_content_hash(self) -> None:
+        path = self._write("pack.toml", _TOML_PACK)
+        first = load_rule_pack(path)
+
+        with patch.object(rules_module, "compile_rule_pack") as compile_pack:
+            cached = load_rule_pack(path)
+        compile_pack.assert_not_called()
+        self.assertIs(cached, first)
+
+        path.write_text(_TOML_PACK.replace('version = "2"', 'version = "3"'), encoding="utf-8")
+        updated = load_rule_pack(path)
+        self.assertTrue(updated.version.startswith("uk-employment@3+"))
+        self.assertEqual(list(self.directory.iterdir()), [path])
+
+    def test_json_pack_can_replace_defaults(self) -> None:
+        pack = {
+            "name": "minimal",
+            "version": "1",
+            "extends_defaults": False,
+            "signals": [
+                {
+                    "type": "VAGUE_LANGUAGE",
+                    "label": "best efforts",
+                    "severity": "LOW",
+                    "pattern": r"best\s+efforts",
+                }
+            ],
+        }
+        rules = load_rule_pack(self._write("pack.json", json.dumps(pack)))
+        signals = detect_signals("Vendor uses best  efforts at its sole discretion.", rules)
+        self.assertEqual(
+            [(signal.type, signal.label) for signal in signals],
+            [(SignalType.VAGUE_LANGUAGE, "best efforts")],
+        )
+        self.assertEqual(detect_missing_protections([_clause("Anything.")], rules), [])
+        self.assertNotEqual(rules.version, DEFAULT_RULES.version)
+
+    def test_pack_phrases_match_regardless_of_case_and_spacing(self) -> None:
+        pack = {
+            "name": "spacing",
+            "version": "1",
+            "signals": [
+                {
+                    "type": "VAGUE_LANGUAGE",
+                    "label": "efforts standard",
+                    "severity": "LOW",
+                    "phrases": ["Best Efforts", "reasonable  efforts"],
+                }
+            ],
+            "liability_expansion_phrases": ["Uncapped\tLiability"],
+        }
+        rules = load_rule_pack(self._write("pack.json", json.dumps(pack)))
+        for text in ("Vendor uses best efforts.", "Vendor uses REASONABLE\nefforts."):
+            with self.subTest(text=text):
+                labels = [signal.label for signal in detect_signals(text, rules)]
+                self.assertIn("efforts standard", labels)
+        self.assertIn("uncapped liability", rules.liability_expansion_markers)
+        scan = rules.matcher.scan("Supplier bears uncapped liability.")
+        self.assertTrue(scan.has_any(rules.liability_expansion_markers))
+
+    def test_invalid_packs_are_rejected(self) -> None:
+        invalid = {
+            "bad_regex.json": {
+                "name": "x",
+                "version": "1",
+                "protections": [{"name": "p", "pattern": "("}],
+            },
+            "bad_category.json": {"name": "x", "version": "1", "categories": [{"category": "TAX"}]},
+            "no_matcher.json": {
+                "name": "x",
+                "version": "1",
+                "signals": [{"type": "VAGUE_LANGUAGE", "label": "x", "severity": "LOW"}],
+            },
+        }
+        for name, payload in invalid.items():
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                load_rule_pack(self._write(name, json.dumps(payload)))
+        with self.assertRaises(ValueError):
+            load_rule_pack(self._write("broken.toml", "name = "))
+
+
+if __name__ == "__main__":
+    unittest.main()
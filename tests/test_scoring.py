@@ -98,6 +98,16 @@ class ScoringTests(unittest.TestCase):
         score = compute_power_imbalance(clauses)
         self.assertGreaterEqual(score, 70)
 
+    def test_power_imbalance_markers_match_as_substrings(self) -> None:
+        def score(text: str) -> int:
+            return compute_power_imbalance(
+                [_clause("C-001", ClauseCategory.TERMINATION, 50, text)]
+            )
+
+        self.assertEqual(score("Decided at the sole discretionary choice of Client."), 54)
+        self.assertEqual(score("Both\nparties may terminate."), 50)
+        self.assertEqual(score("Renewal is mutually agreed."), 45)
+
     def test_ambiguity_index_scales_with_vague_language(self) -> None:
         clauses = [
             _clause(
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import unittest
+
+from realitycheck_cli.analysis.classifier import analyze_clauses
+from realitycheck_cli.analysis.heuristics import detect_missing_protections
+from realitycheck_cli.analysis.rules import ProtectionRuleSpec, RulePackSpec, compile_rule_pack
+from realitycheck_cli.analysis.schemas import Clause, TermKind
+from realitycheck_cli.analysis.terms import duration_in_months, extract_terms
+
+from tests import make_settings
+
+
+def _clause(text: str, clause_id: str = "C-001") -> Clause:
+    return Clause(contract_id="demo", clause_id=clause_id, title="Terms", page=1, text=text)
+
+
+class TermExtractionTests(unittest.TestCase):
+    def test_extracts_typed_periods_and_amounts(self) -> None:
+        text = (
+            "Either party may terminate upon thirty (30) days written notice, subject to "
+            "a 15-day cure period. Invoices are due net 45. Vendor shall notify Client of "
+            "any data breach within 72 hours. Vendor's liability shall not exceed "
+            "USD 2 million. The restricted period lasts two years."
+        )
+        terms = extract_terms(text)
+        self.assertEqual(
+            [(term.kind, term.value, term.unit) for term in terms],
+            [
+                (TermKind.TERMINATION_NOTICE, 30.0, "days"),
+                (TermKind.CURE_PERIOD, 15.0, "days"),
+                (TermKind.PAYMENT_TERM, 45.0, "days"),
+                (TermKind.BREACH_NOTICE_WINDOW, 72.0, "hours"),
+                (TermKind.LIABILITY_CAP, 2_000_000.0, "USD"),
+                (TermKind.DURATION, 2.0, "years"),
+            ],
+        )
+        for term in terms:
+            self.assertEqual(text[term.start : term.end], term.text)
+        self.assertEqual(duration_in_months(terms[-1]), 24)
+        self.assertEqual(duration_in_months(terms[3]), 0)
+
+    def test_terms_answer_builtin_protections_but_not_overridden_ones(self) -> None:
+        clauses = [_clause("Client shall have a 30 day cure period after notice.")]
+        terms = [extract_terms(clause.text) for clause in clauses]
+        self.assertNotIn("cure_period", detect_missing_protections(clauses, terms=terms))
+
+        rules = compile_rule_pack(
+            RulePackSpec(
+                name="strict",
+                version="1",
+                protections=[ProtectionRuleSpec(name="cure_period", pattern=r"cure period of")],
+            )
+        )
+        self.assertNotIn("cure_period", rules.term_protections)
+        self.assertIn("cure_period", detect_missing_protections(clauses, rules, terms))
+
+    def test_terms_never_report_a_protection_the_patterns_would_not(self) -> None:
+        texts = [
+            "The subscription payment covers a 12 month period.",
+            "Vendor may remedy any defect within 30 days.",
+            "Client shall cure within a 30 day cure window.",
+            "Vendor shall notify Customer within 10 days of any breach.",
+            "Payment is due within 30 days of invoice.",
+            "Vendor shall notify Client of any data breach within 72 hours.",
+            "Either party may terminate upon thirty (30) days written notice.",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                clauses = [_clause(text)]
+                self.assertEqual(
+                    detect_missing_protections(clauses, terms=[extract_terms(text)]),
+                    detect_missing_protections(clauses, terms=[[]]),
+                )
+        missing = detect_missing_protections([_clause(texts[0])])
+        self.assertIn("payment_timeline", missing)
+        self.assertIn("cure_period", detect_missing_protections([_clause(texts[1])]))
+        self.assertIn(
+            "breach_notification_window", detect_missing_protections([_clause(texts[3])])
+        )
+
+    def test_analysis_stores_terms_on_every_clause(self) -> None:
+        clauses = [
+            _clause("Payment is due within 30 days of invoice."),
+            _clause("Payment is due within 60 days of invoice.", clause_id="C-002"),
+        ]
+        first, missing = analyze_clauses("demo", clauses[:1], make_settings())
+        self.assertNotIn("payment_timeline", missing)
+        self.assertEqual([term.value for term in first[0].terms], [30.0])
+
+        # A reused analysis keeps its classification; the figures always come
+        # from the clause being analyzed.
+        stale = first[0].model_copy(update={"text": clauses[1].text})
+        reused, _ = analyze_clauses("demo", clauses[1:], make_settings(), previous_analyses=[stale])
+        self.assertEqual([term.value for term in reused[0].terms], [60.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+import tempfile
+import unittest
+
+from realitycheck_cli.analysis.schemas import FailureReason
+from realitycheck_cli.analysis.triage import select_triage_pages
+from realitycheck_cli.engine import Analyzer
+from realitycheck_cli.ingest.pdf_parser import PageText, read_pdf_quick
+from realitycheck_cli.pipeline import analyze_contract_file, triage_contract_files
+
+from tests import make_settings
+
+_ROOT = Path(__file__).resolve().parents[1]
+_SAMPLE_PDF = _ROOT / "contract.pdf"
+_REVISED_PDF = _ROOT / "revised.pdf"
+
+
+class TriagePageSelectionTests(unittest.TestCase):
+    def test_keeps_opening_pages_and_keyword_hits(self) -> None:
+        pages = [
+            PageText(page_number=1, text="Master Services Agreement between the parties."),
+            PageText(page_number=2, text="   "),
+            PageText(page_number=3, text="Schedule of office locations and contacts."),
+            PageText(page_number=4, text="Supplier shall indemnify and hold harmless Client."),
+            PageText(page_number=5, text="Either party may terminate for convenience."),
+        ]
+        selected = select_triage_pages(pages, first_pages=2)
+        self.assertEqual([page.page_number for page in selected], [1, 4, 5])
+        self.assertEqual(select_triage_pages(pages[2:3], first_pages=0), [])
+
+
+@unittest.skipUnless(_SAMPLE_PDF.exists(), "sample contract PDF not available")
+class AnalyzerTriageTests(unittest.TestCase):
+    def test_quick_read_matches_every_source_kind(self) -> None:
+        data = _SAMPLE_PDF.read_bytes()
+        from_path = read_pdf_quick(_SAMPLE_PDF)
+        self.assertEqual(from_path.content_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(read_pdf_quick(data).pages, from_path.pages)
+        with self.assertRaises(ValueError):
+            read_pdf_quick(b"%PDF-1.4 not really a pdf")
+
+    def test_triage_skips_pages_without_keywords(self) -> None:
+        analyzer = Analyzer(make_settings())
+        result = analyzer.triage(_SAMPLE_PDF, first_pages=1)
+        full = analyzer.analyze(_SAMPLE_PDF)
+        self.assertEqual(result.contract_id, "contract")
+        self.assertLess(len(result.pages_examined), result.page_count)
+        self.assertEqual(result.pages_examined[0], 1)
+        self.assertEqual(result.approximate_risk_score, full.summary.overall_risk_score)
+        self.assertGreater(result.confidence, 0.0)
+        self.assertLess(result.confidence, 1.0)
+        self.assertFalse(result.queued_for_full_analysis)
+        self.assertTrue(analyzer.triage(_SAMPLE_PDF, threshold=0).queued_for_full_analysis)
+        with self.assertRaises(ValueError):
+            analyzer.triage(_SAMPLE_PDF.read_bytes())
+
+
+@unittest.skipUnless(
+    _SAMPLE_PDF.exists() and _REVISED_PDF.exists(), "sample contract PDFs not available"
+)
+class TriageBatchTests(unittest.TestCase):
+    def test_ranks_queues_and_fully_analyzes_risky_contracts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = Path(tmp) / "broken.pdf"
+            broken.write_bytes(b"not a pdf")
+            results, full_results, failures = triage_contract_files(
+                [_REVISED_PDF, broken, _SAMPLE_PDF],
+                make_settings(),
+                threshold=30,
+                max_workers=1,
+            )
+        self.assertEqual([result.contract_id for result in results], ["contract", "revised"])
+        self.assertEqual(
+            [result.queued_for_full_analysis for result in results], [True, False]
+        )
+        self.assertEqual(full_results, [analyze_contract_file(_SAMPLE_PDF, make_settings())])
+        self.assertEqual([failure.contract_id for failure in failures], ["broken"])
+        self.assertEqual(failures[0].reason, FailureReason.ERROR)
+
+        results, full_results, _ = triage_contract_files(
+            [_SAMPLE_PDF, _REVISED_PDF], make_settings(), threshold=30, max_workers=2, deep=False
+        )
+        self.assertEqual(results[0].contract_id, "contract")
+        self.assertEqual(full_results, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
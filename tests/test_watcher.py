@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from realitycheck_cli.ingest.pdf_parser import PageExtraction, PageTextCache, parse_pdf
+from realitycheck_cli.ingest.structure import PageStyles
+from realitycheck_cli.ingest.watcher import DirectoryWatcher
+
+_SAMPLE_PDF = Path(__file__).resolve().parents[1] / "contract.pdf"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _save(path: Path, content: bytes, mtime_ns: int) -> None:
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class DirectoryWatcherTests(unittest.TestCase):
+    def test_debounces_saves_and_skips_unchanged_content(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            clock = _Clock()
+            watcher = DirectoryWatcher(directory, debounce_seconds=2.0, clock=clock)
+            draft = directory / "draft.pdf"
+            (directory / "notes.txt").write_text("ignored", encoding="utf-8")
+
+            _save(draft, b"v1", 1_000)
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 1.0
+            _save(draft, b"v1 edited", 2_000)
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 2.5
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 3.0
+            self.assertEqual(watcher.poll(), [draft])
+            self.assertEqual(watcher.poll(), [])
+
+            _save(draft, b"v1 edited", 3_000)
+            clock.now = 4.0
+            watcher.poll()
+            clock.now = 6.0
+            self.assertEqual(watcher.poll(), [])
+            self.assertEqual(watcher.skipped_unchanged, 1)
+
+            _save(draft, b"v2", 4_000)
+            clock.now = 7.0
+            watcher.poll()
+            clock.now = 9.0
+            self.assertEqual(watcher.poll(), [draft])
+
+            watcher.forget(draft)
+            _save(draft, b"v2", 5_000)
+            clock.now = 10.0
+            watcher.poll()
+            clock.now = 12.0
+            self.assertEqual(watcher.poll(), [draft])
+
+    def test_rejects_non_directory(self) -> None:
+        with self.assertRaises(ValueError):
+            DirectoryWatcher(_SAMPLE_PDF)
+
+
+@unittest.skipUnless(_SAMPLE_PDF.exists(), "sample contract PDF not available")
+class PageTextCacheTests(unittest.TestCase):
+    def test_cached_parse_matches_uncached_parse(self) -> None:
+        cache = PageTextCache()
+        first = parse_pdf(_SAMPLE_PDF, page_cache=cache)
+        self.assertEqual(cache.hits, 0)
+        second = parse_pdf(_SAMPLE_PDF, page_cache=cache)
+        self.assertEqual(cache.hits, cache.misses)
+        self.assertEqual(first, second)
+        self.assertEqual(first, parse_pdf(_SAMPLE_PDF))
+
+    def test_evicts_least_recently_used_pages(self) -> None:
+        def extraction(text: str) -> PageExtraction:
+            return PageExtraction(text=text, styles=PageStyles((), (), 0, 0))
+
+        cache = PageTextCache(max_pages=2)
+        cache.put("a", extraction("A"))
+        cache.put("b", extraction("B"))
+        self.assertEqual(cache.get("a"), extraction("A"))
+        cache.put("c", extraction("C"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), extraction("A"))
+
+
+if __name__ == "__main__":
+    unittest.main()